@@ -0,0 +1,65 @@
+"""Measure how fast Sopel sets values in a SQLite database.
+
+Usage::
+
+    python contrib/benchmarks/db_upsert.py [VALUES [ROUNDS]]
+
+Set ``VALUES`` plugin values (1,000 by default), then update each of them
+``ROUNDS`` times (2 by default), and report the number of operations per
+second: once with a single ``INSERT ... ON CONFLICT`` statement per value
+(the "native" upsert), and once by selecting the row first, then updating or
+inserting it (the "portable" upsert, used when the database doesn't support
+the native one).
+"""
+# Licensed under the Eiffel Forum License 2.
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+
+from sopel import config
+from sopel.db import SopelDB
+
+
+TMP_CONFIG = """
+[core]
+owner = Benchmark
+db_filename = {db_filename}
+"""
+
+
+def make_db(tmpdir, label):
+    filename = os.path.join(tmpdir, label + '.cfg')
+    with open(filename, 'w', encoding='utf-8') as fd:
+        fd.write(TMP_CONFIG.format(
+            db_filename=os.path.join(tmpdir, label + '.sqlite')))
+    return SopelDB(config.Config(filename))
+
+
+def measure(db, values, rounds):
+    """Return the number of values set per second."""
+    start = time.perf_counter()
+    for _ in range(rounds + 1):
+        for index in range(values):
+            db.set_plugin_value('benchmark', 'key%05d' % index, index)
+    return values * (rounds + 1) / (time.perf_counter() - start)
+
+
+def main(argv):
+    values = int(argv[1]) if len(argv) > 1 else 1000
+    rounds = int(argv[2]) if len(argv) > 2 else 2
+
+    print('%d values, set then updated %d times' % (values, rounds))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for label, native_upsert in [('native', True), ('portable', False)]:
+            db = make_db(tmpdir, label)
+            db.native_upsert = native_upsert and db.native_upsert
+            ops = measure(db, values, rounds)
+            print('%-10s %10.1f ops/s' % (label, ops))
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,79 @@
+"""Measure the memory used by Sopel's identifiers for a large bot.
+
+Usage::
+
+    python contrib/benchmarks/identifiers.py [USERS [CHANNELS]]
+
+Simulate what a bot keeps in memory for ``USERS`` users (60,000 by default)
+spread across ``CHANNELS`` channels (300 by default): each user is in 5
+channels, and each time a user is seen in a channel, a new identifier is made
+from the raw name received from the server, like the bot does when it parses
+a line.
+
+Identifiers are made twice: once by calling the ``Identifier`` class (one
+object per line), and once with ``Identifier.interned`` (one object per name,
+as the bot's ``make_identifier`` does).
+"""
+# Licensed under the Eiffel Forum License 2.
+from __future__ import annotations
+
+import random
+import sys
+import timeit
+import tracemalloc
+
+from sopel.tools.identifiers import Identifier
+
+
+def simulate(make_identifier, users, channels, seed=42):
+    """Keep track of users and channels, like the bot does."""
+    rng = random.Random(seed)
+    nicks = ['User%05d' % index for index in range(users)]
+    chans = ['#Channel%03d' % index for index in range(channels)]
+    # name received from the server -> identifier, per channel
+    privileges = {make_identifier(chan): {} for chan in chans}
+    all_users = {}
+
+    for nick in nicks:
+        for chan in rng.sample(chans, 5):
+            # a new str for each line, like the parser produces
+            name = ''.join(nick)
+            identifier = make_identifier(name)
+            all_users.setdefault(identifier, identifier)
+            privileges[make_identifier(chan)][identifier] = 0
+
+    return privileges, all_users
+
+
+def measure(make_identifier, users, channels):
+    """Return the memory used, in bytes, and the time spent, in seconds."""
+    tracemalloc.start()
+    state = simulate(make_identifier, users, channels)
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del state
+
+    spent = min(timeit.repeat(
+        lambda: simulate(make_identifier, users, channels),
+        number=1,
+        repeat=3,
+    ))
+    return used, spent
+
+
+def main(argv):
+    users = int(argv[1]) if len(argv) > 1 else 60000
+    channels = int(argv[2]) if len(argv) > 2 else 300
+
+    print('%d users in %d channels' % (users, channels))
+    for label, make_identifier in [
+        ('one per line', Identifier),
+        ('interned', Identifier.interned),
+    ]:
+        used, spent = measure(make_identifier, users, channels)
+        print('%-15s %8.1f MiB %8.3f s' % (
+            label, used / 1024 / 1024, spent))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
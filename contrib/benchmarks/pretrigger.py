@@ -0,0 +1,130 @@
+"""Measure the per-line parsing cost of Sopel's PreTrigger on a netsplit.
+
+Usage::
+
+    python contrib/benchmarks/pretrigger.py [LOGFILE]
+
+Without a ``LOGFILE``, a netsplit is simulated: hundreds of users quit with
+``*.net *.split``, then join their channels again with ``extended-join`` and
+server-time tags, get their modes back from the server, and NAMES replies
+are sent for every channel, with some PING and PRIVMSG lines in-between.
+
+A log file must contain one raw IRC line per line, as received by the bot
+(e.g. extracted from Sopel's raw log).
+"""
+# Licensed under the Eiffel Forum License 2.
+from __future__ import annotations
+
+import random
+import sys
+import timeit
+
+from sopel.tools import Identifier
+from sopel.trigger import PreTrigger
+
+
+SERVER_TIME = '@time=2023-05-04T12:34:56.789Z;account=%s'
+URL_SCHEMES = ('http', 'https', 'ftp')
+
+
+def simulate_netsplit(users=500, channels=20, seed=42):
+    """Generate the raw lines received by a bot during a netsplit."""
+    rng = random.Random(seed)
+    nicks = ['user%03d' % index for index in range(users)]
+    chans = ['#channel%02d' % index for index in range(channels)]
+    lines = []
+
+    # split
+    for nick in nicks:
+        lines.append(':%s!~%s@host-%s.example.com QUIT :*.net *.split' % (
+            nick, nick, nick))
+        if rng.random() < 0.05:
+            lines.append('PING :irc.example.com')
+
+    # merge: users join back their channels, and get their modes back
+    for nick in nicks:
+        for channel in rng.sample(chans, 3):
+            lines.append(
+                (SERVER_TIME + ' :%s!~%s@host-%s.example.com JOIN %s %s '
+                 ':Real Name of %s') % (
+                    nick, nick, nick, nick, channel, nick, nick))
+            if rng.random() < 0.1:
+                lines.append(':irc.example.com MODE %s +o %s' % (
+                    channel, nick))
+        if rng.random() < 0.05:
+            lines.append(
+                ':%s!~%s@host-%s.example.com PRIVMSG %s :back! see '
+                'https://example.com/status' % (
+                    nick, nick, nick, rng.choice(chans)))
+
+    # names replies
+    for channel in chans:
+        for start in range(0, users, 50):
+            lines.append(':irc.example.com 353 Sopel = %s :%s' % (
+                channel, ' '.join(nicks[start:start + 50])))
+        lines.append(':irc.example.com 366 Sopel %s :End of /NAMES list.' % (
+            channel))
+
+    return lines
+
+
+def bench(lines, access, number=5):
+    """Return the best time per line, in microseconds."""
+    own_nick = Identifier('Sopel')
+
+    def parse():
+        for line in lines:
+            access(PreTrigger(own_nick, line, url_schemes=URL_SCHEMES))
+
+    best = min(timeit.repeat(parse, number=1, repeat=number))
+    return best / len(lines) * 1e6
+
+
+def parse_only(pretrigger):
+    # what the bot needs for a line that no rule looks at
+    return pretrigger.event
+
+
+def dispatch(pretrigger):
+    # what the bot and its core plugins use for most lines
+    return (
+        pretrigger.event,
+        pretrigger.args,
+        pretrigger.nick,
+        pretrigger.sender,
+        pretrigger.tags,
+    )
+
+
+def everything(pretrigger):
+    return (
+        pretrigger.event,
+        pretrigger.args,
+        pretrigger.nick,
+        pretrigger.sender,
+        pretrigger.tags,
+        pretrigger.time,
+        pretrigger.ctcp,
+        pretrigger.urls,
+        pretrigger.plain,
+    )
+
+
+def main(argv):
+    if len(argv) > 1:
+        with open(argv[1], encoding='utf-8') as logfile:
+            lines = [line.rstrip('\r\n') for line in logfile if line.strip()]
+    else:
+        lines = simulate_netsplit()
+
+    print('%d lines' % len(lines))
+    for label, access in [
+        ('parse only', parse_only),
+        ('dispatch attributes', dispatch),
+        ('all attributes', everything),
+    ]:
+        print('%-20s %6.2f us/line' % (label, bench(lines, access)))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,86 @@
+"""Measure the memory used to track users and channels on a large network.
+
+Usage::
+
+    python contrib/benchmarks/target.py [USERS [CHANNELS]]
+
+Simulate what a bot in ``CHANNELS`` channels (500 by default) keeps in memory
+for ``USERS`` users (60,000 by default), each of them being in 5 of these
+channels, then measure how long it takes to handle every user changing their
+nick, then quitting.
+"""
+# Licensed under the Eiffel Forum License 2.
+from __future__ import annotations
+
+import random
+import sys
+import time
+import tracemalloc
+
+from sopel.tools import SopelIdentifierMemory, target
+from sopel.tools.identifiers import Identifier
+
+
+make_identifier = getattr(Identifier, 'interned', Identifier)
+
+
+def populate(users, channels, seed=42):
+    """Build the bot's ``channels`` and ``users``, like coretasks does."""
+    rng = random.Random(seed)
+    memberships = target.Memberships()
+    bot_channels = SopelIdentifierMemory(identifier_factory=make_identifier)
+    bot_users = SopelIdentifierMemory(identifier_factory=make_identifier)
+
+    for index in range(channels):
+        name = make_identifier('#channel%03d' % index)
+        bot_channels[name] = target.Channel(
+            name,
+            identifier_factory=make_identifier,
+            memberships=memberships,
+        )
+
+    names = list(bot_channels)
+    for index in range(users):
+        nick = make_identifier('User%05d' % index)
+        user = bot_users[nick] = target.User(nick, 'user', 'example.com')
+        for name in rng.sample(names, 5):
+            bot_channels[name].add_user(user, rng.choice((0, 0, 0, 1, 4)))
+
+    return bot_channels, bot_users
+
+
+def rename_all(bot_channels, bot_users):
+    for old in list(bot_users):
+        new = make_identifier('New' + old)
+        user = bot_users[old]
+        for channel in list(user.channels.values()):
+            channel.rename_user(old, new)
+        bot_users[new] = bot_users.pop(old)
+
+
+def quit_all(bot_channels, bot_users):
+    for nick in list(bot_users):
+        user = bot_users.pop(nick)
+        for channel in list(user.channels.values()):
+            channel.clear_user(nick)
+
+
+def main(argv):
+    users = int(argv[1]) if len(argv) > 1 else 60000
+    channels = int(argv[2]) if len(argv) > 2 else 500
+    print('%d users in %d channels' % (users, channels))
+
+    tracemalloc.start()
+    state = populate(users, channels)
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print('%-10s %8.1f MiB' % ('memory', used / 1024 / 1024))
+
+    for label, func in [('nick', rename_all), ('quit', quit_all)]:
+        start = time.perf_counter()
+        func(*state)
+        print('%-10s %8.3f s' % (label, time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -8,7 +8,9 @@
 from __future__ import annotations
 
 from ast import literal_eval
+import asyncio
 from datetime import datetime
+import functools
 import inspect
 import itertools
 import logging
@@ -18,9 +20,12 @@ import time
 from types import MappingProxyType
 from typing import (
     Any,
+    Callable,
     Dict,
+    FrozenSet,
     Iterable,
     Mapping,
+    NamedTuple,
     Optional,
     Tuple,
     TYPE_CHECKING,
@@ -28,21 +33,33 @@ from typing import (
 )
 
 from sopel import db, irc, logger, plugin, plugins, tools
-from sopel.irc import modes
+from sopel.irc import flood, modes
 from sopel.lifecycle import deprecated
 from sopel.plugins import jobs as plugin_jobs, rules as plugin_rules
-from sopel.tools import jobs as tools_jobs
+from sopel.tools import (
+    jobs as tools_jobs,
+    target,
+    workers as tools_workers,
+)
 from sopel.trigger import Trigger
 
 if TYPE_CHECKING:
     from sopel.trigger import PreTrigger
 
 
-__all__ = ['Sopel', 'SopelWrapper']
+__all__ = ['Sopel', 'SopelWrapper', 'AsyncSopelWrapper']
 
 LOGGER = logging.getLogger(__name__)
 
 
+class _ChannelRestrictions(NamedTuple):
+    """Plugins and rules disabled in a channel."""
+    plugins: FrozenSet[str]
+    """Names of the disabled plugins (``*`` for all of them)."""
+    rules: FrozenSet[Tuple[str, str]]
+    """Disabled rules, as ``(plugin name, rule label)``."""
+
+
 class Sopel(irc.AbstractBot):
     def __init__(self, config, daemon=False):
         super().__init__(config)
@@ -51,7 +68,15 @@ class Sopel(irc.AbstractBot):
         self._running_triggers_lock = threading.Lock()
         self._plugins: Dict[str, Any] = {}
         self._rules_manager = plugin_rules.Manager()
-        self._scheduler = plugin_jobs.Scheduler(self)
+        self._scheduler = plugin_jobs.Scheduler(
+            self, max_workers=self.settings.core.job_workers)
+        self._dispatch_pool = tools_workers.WorkerPool(
+            max_workers=self.settings.core.dispatch_workers,
+            max_queue=self.settings.core.dispatch_queue_size,
+            policy=self.settings.core.dispatch_backpressure,
+            max_per_group=self.settings.core.dispatch_plugin_workers,
+            name='Dispatch',
+        )
 
         self._url_callbacks = tools.SopelMemory()
         """Tracking of manually registered URL callbacks.
@@ -62,6 +87,23 @@ class Sopel(irc.AbstractBot):
         Remove in Sopel 9, along with the above related methods.
         """
 
+        self._reply_collectors: Dict[
+            str, Callable[[Sopel, PreTrigger], None]] = {}
+        """Collectors of reply lines, by event.
+
+        Should be manipulated only by use of :meth:`register_reply_collector`
+        and :meth:`unregister_reply_collector` methods.
+        """
+
+        self._channel_restrictions: Tuple[
+            int,
+            Mapping[tools.Identifier, _ChannelRestrictions],
+        ] = (-1, MappingProxyType({}))
+        """Plugins and rules disabled per channel, with the config revision.
+
+        Use :meth:`_get_channel_restrictions` to get an up-to-date version.
+        """
+
         self._times = {}
         """
         A dictionary mapping lowercased nicks to dictionaries which map
@@ -102,6 +144,22 @@ class Sopel(irc.AbstractBot):
         mutual channel.
         """
 
+        self.memberships = target.Memberships()
+        """The users of each channel Sopel is in.
+
+        This table is shared by the :class:`~sopel.tools.target.Channel`
+        objects of :attr:`channels`, and stores which users are in which
+        channel with their privileges.
+
+        .. versionadded:: 8.0
+        """
+
+        self.join_scheduler = flood.JoinScheduler(self)
+        """Join channels by batches, paced by the ``throttle_*`` settings.
+
+        .. versionadded:: 8.0
+        """
+
         self.db = db.SopelDB(config, identifier_factory=self.make_identifier)
         """The bot's database, as a :class:`sopel.db.SopelDB` instance."""
 
@@ -593,12 +651,19 @@ class Sopel(irc.AbstractBot):
 
     # message dispatch
 
-    def call_rule(
+    def _can_call_rule(
         self,
         rule: plugin_rules.AbstractRule,
-        sopel: 'SopelWrapper',
         trigger: Trigger,
-    ) -> None:
+    ) -> Tuple[bool, Optional[str]]:
+        """Tell if a triggered rule can be called.
+
+        :param rule: the triggered rule
+        :param trigger: the trigger for the rule
+        :return: a 2-value tuple: ``True`` if the rule can be called,
+                 ``False`` otherwise; and the rate limit message to send to
+                 the trigger's nick, if any
+        """
         nick = trigger.nick
         context = trigger.sender
         is_channel = context and not context.is_nick()
@@ -606,43 +671,95 @@ class Sopel(irc.AbstractBot):
         # rate limiting
         if not trigger.admin and not rule.is_unblockable():
             if rule.is_user_rate_limited(nick):
-                message = rule.get_user_rate_message(nick)
-                if message:
-                    sopel.notice(message, destination=nick)
-                return
+                return False, rule.get_user_rate_message(nick)
 
             if is_channel and rule.is_channel_rate_limited(context):
-                message = rule.get_channel_rate_message(nick, context)
-                if message:
-                    sopel.notice(message, destination=nick)
-                return
+                return False, rule.get_channel_rate_message(nick, context)
 
             if rule.is_global_rate_limited():
-                message = rule.get_global_rate_message(nick)
-                if message:
-                    sopel.notice(message, destination=nick)
-                return
+                return False, rule.get_global_rate_message(nick)
 
         # channel config
-        if is_channel and context in self.config:
-            channel_config = self.config[context]
+        restrictions = (
+            self._get_channel_restrictions().get(context)
+            if is_channel else None)
+        if restrictions is not None:
             plugin_name = rule.get_plugin_name()
 
             # disable listed plugins completely on provided channel
-            if 'disable_plugins' in channel_config:
-                disabled_plugins = channel_config.disable_plugins.split(',')
-
-                if '*' in disabled_plugins:
-                    return
-                elif plugin_name in disabled_plugins:
-                    return
+            if '*' in restrictions.plugins:
+                return False, None
+            elif plugin_name in restrictions.plugins:
+                return False, None
 
             # disable chosen methods from plugins
-            if 'disable_commands' in channel_config:
-                disabled_commands = literal_eval(channel_config.disable_commands)
-                disabled_commands = disabled_commands.get(plugin_name, [])
-                if rule.get_rule_label() in disabled_commands:
-                    return
+            if (plugin_name, rule.get_rule_label()) in restrictions.rules:
+                return False, None
+
+        return True, None
+
+    def _get_channel_restrictions(
+        self,
+    ) -> Mapping[tools.Identifier, _ChannelRestrictions]:
+        """Get the plugins and rules disabled per channel.
+
+        :return: a read-only map of channel names to their restrictions
+
+        The ``disable_plugins`` and ``disable_commands`` options of every
+        channel section are parsed once, then the result is kept until the
+        configuration changes (see :attr:`.config.Config.revision`).
+        """
+        revision, restrictions = self._channel_restrictions
+        if revision == self.settings.revision:
+            return restrictions
+
+        revision = self.settings.revision
+        parser = self.settings.parser
+        channels = {}
+
+        for section in parser.sections():
+            plugins: FrozenSet[str] = frozenset()
+            rules: FrozenSet[Tuple[str, str]] = frozenset()
+
+            value = parser.get(section, 'disable_plugins', fallback=None)
+            value = (value or '').strip()
+            if value and value.lower() not in ('none', 'false'):
+                plugins = frozenset(value.split(','))
+
+            value = parser.get(section, 'disable_commands', fallback=None)
+            value = (value or '').strip()
+            if value and value.lower() not in ('none', 'false'):
+                try:
+                    disabled_commands = literal_eval(value)
+                    rules = frozenset(
+                        (plugin_name, label)
+                        for plugin_name, labels in disabled_commands.items()
+                        for label in labels
+                    )
+                except (ValueError, SyntaxError, AttributeError, TypeError):
+                    LOGGER.warning(
+                        'Invalid value for %s.disable_commands: %r',
+                        section, value)
+
+            if plugins or rules:
+                channel = self.make_identifier(section)
+                channels[channel] = _ChannelRestrictions(plugins, rules)
+
+        restrictions = MappingProxyType(channels)
+        self._channel_restrictions = (revision, restrictions)
+        return restrictions
+
+    def call_rule(
+        self,
+        rule: plugin_rules.AbstractRule,
+        sopel: 'SopelWrapper',
+        trigger: Trigger,
+    ) -> None:
+        allowed, message = self._can_call_rule(rule, trigger)
+        if message:
+            sopel.notice(message, destination=trigger.nick)
+        if not allowed:
+            return
 
         try:
             rule.execute(sopel, trigger)
@@ -651,6 +768,36 @@ class Sopel(irc.AbstractBot):
         except Exception as error:
             self.error(trigger, exception=error)
 
+    async def call_rule_async(
+        self,
+        rule: plugin_rules.AbstractRule,
+        sopel: 'AsyncSopelWrapper',
+        trigger: Trigger,
+    ) -> None:
+        """Await an asynchronous rule, applying rate limits and restrictions.
+
+        :param rule: the asynchronous rule to execute
+        :param sopel: a wrapper with awaitable methods to send messages
+        :param trigger: the trigger for the rule
+
+        This is the asynchronous version of :meth:`call_rule`, used by
+        :meth:`dispatch` for rules with a coroutine function as handler.
+
+        .. versionadded:: 8.0
+        """
+        allowed, message = self._can_call_rule(rule, trigger)
+        if message:
+            await sopel.notice(message, destination=trigger.nick)
+        if not allowed:
+            return
+
+        try:
+            await rule.execute_async(sopel, trigger)
+        except KeyboardInterrupt:
+            raise
+        except Exception as error:
+            await sopel.run_sync(self.error, trigger, exception=error)
+
     def call(
         self,
         func: Any,
@@ -777,18 +924,42 @@ class Sopel(irc.AbstractBot):
 
         The ``pretrigger`` (a parsed message) is used to find matching rules;
         it will retrieve them by order of priority, and execute them. It runs
-        triggered rules in separate threads, unless they are marked otherwise.
+        triggered rules in the bot's pool of worker threads, unless they are
+        marked otherwise. Asynchronous rules (defined with ``async def``) run
+        as tasks on the backend's event loop instead.
+
+        The pool is bounded by :attr:`~.config.core_section.CoreSection.dispatch_workers`,
+        and what happens when its queue is full depends on
+        :attr:`~.config.core_section.CoreSection.dispatch_backpressure`.
 
         However, it won't run triggered blockable rules at all when they can't
         be executed for blocked nickname or hostname.
 
+        Lines of an event no rule listens to (such as ``PING``, or most
+        numeric replies) are ignored right away. Before that, a line is given
+        to the :meth:`reply collector<register_reply_collector>` of its
+        event, if any.
+
         .. seealso::
 
             The pattern matching is done by the
             :class:`Rules Manager<sopel.plugins.rules.Manager>`.
 
         """
-        # list of commands running in separate threads for this dispatch
+        collector = self._reply_collectors.get(pretrigger.event)
+        if collector is not None:
+            try:
+                collector(self, pretrigger)
+            except Exception:
+                LOGGER.exception(
+                    'Error in %s reply collector %r.',
+                    pretrigger.event, collector)
+
+        # fast path: no rule listens to this event
+        if not self._rules_manager.has_event_rules(pretrigger.event):
+            return
+
+        # list of commands submitted to the worker pool for this dispatch
         running_triggers = []
         # nickname/hostname blocking
         nick_blocked, host_blocked = self._is_pretrigger_blocked(pretrigger)
@@ -813,18 +984,27 @@ class Sopel(irc.AbstractBot):
                 list_of_blocked_rules.add(str(rule))
                 continue
 
+            if rule.is_async():
+                # run as a task on the backend's event loop
+                wrapper = AsyncSopelWrapper(
+                    self, trigger, output_prefix=rule.get_output_prefix())
+                self.backend.run_coroutine(
+                    self.call_rule_async(rule, wrapper, trigger))
+                continue
+
             wrapper = SopelWrapper(
                 self, trigger, output_prefix=rule.get_output_prefix())
 
             if rule.is_threaded():
-                # run in a separate thread
-                targs = (rule, wrapper, trigger)
-                t = threading.Thread(target=self.call_rule, args=targs)
+                # run in a worker thread
                 plugin_name = rule.get_plugin_name()
-                rule_label = rule.get_rule_label()
-                t.name = '%s-%s-%s' % (t.name, plugin_name, rule_label)
-                t.start()
-                running_triggers.append(t)
+                task = self._dispatch_pool.submit(
+                    self.call_rule, rule, wrapper, trigger,
+                    group=plugin_name,
+                    name='%s-%s' % (plugin_name, rule.get_rule_label()),
+                )
+                if task is not None:
+                    running_triggers.append(task)
             else:
                 # direct call
                 self.call_rule(rule, wrapper, trigger)
@@ -848,12 +1028,21 @@ class Sopel(irc.AbstractBot):
 
     @property
     def running_triggers(self) -> list:
-        """Current active threads for triggers.
+        """Current active tasks for triggers.
 
-        :return: the running thread(s) currently processing trigger(s)
+        :return: the pending or running task(s) processing trigger(s)
         :rtype: :term:`iterable`
 
+        Each task is a :class:`~concurrent.futures.Future` that can also be
+        joined like a thread, with its ``join()`` method.
+
         This is for testing and debugging purposes only.
+
+        .. versionchanged:: 8.0
+
+            Triggers are executed by a pool of worker threads: this returns
+            tasks from the pool instead of threads.
+
         """
         with self._running_triggers_lock:
             return [t for t in self._running_triggers if t.is_alive()]
@@ -861,12 +1050,12 @@ class Sopel(irc.AbstractBot):
     def _update_running_triggers(self, running_triggers: list) -> None:
         """Update list of running triggers.
 
-        :param list running_triggers: newly started threads
+        :param list running_triggers: newly submitted tasks
 
         We want to keep track of running triggers, mostly for testing and
         debugging purposes. For instance, it'll help make sure, in tests, that
         a bot plugin has finished processing a trigger, by manually joining
-        all running threads.
+        all running tasks.
 
         This is kept private, as it's purely internal machinery and isn't
         meant to be manipulated by outside code.
@@ -937,7 +1126,7 @@ class Sopel(irc.AbstractBot):
                 message, trigger.nick, str(datetime.utcnow()), trigger.group(0)
             )
 
-        LOGGER.exception(message)
+        LOGGER.exception(message, exc_info=exception or True)
 
         if trigger and self.settings.core.reply_errors and trigger.sender is not None:
             self.say(message, trigger.sender)
@@ -988,6 +1177,10 @@ class Sopel(irc.AbstractBot):
 
         self._scheduler.clear_jobs()
 
+        # Stop the dispatch worker pool
+        LOGGER.info("Stopping the dispatch worker pool.")
+        self._dispatch_pool.shutdown(wait=True, timeout=15)
+
         # Shutdown plugins
         LOGGER.info(
             "Calling shutdown for %d plugins.", len(self.shutdown_methods))
@@ -1005,6 +1198,47 @@ class Sopel(irc.AbstractBot):
         # Avoid calling shutdown methods if we already have.
         self.shutdown_methods = []
 
+        # Write the database values still pending
+        if self.db.write_queue is not None:
+            LOGGER.info(
+                "Writing %d pending database values.",
+                len(self.db.write_queue))
+            self.db.write_queue.stop(timeout=15)
+
+    # Reply collectors management
+
+    def register_reply_collector(
+        self,
+        event: str,
+        collector: Callable[[Sopel, PreTrigger], None],
+    ) -> None:
+        """Register a ``collector`` for lines of the ``event``.
+
+        :param event: the event (such as a numeric reply) to collect
+        :param collector: callable object to call with the bot and each
+                          parsed line of the ``event``
+
+        A collector is called right away from the thread that reads lines from
+        the server, before rules are matched, and without creating a
+        :class:`~sopel.trigger.Trigger`. It is meant for replies that come by
+        hundreds (such as ``NAMES`` or ``WHO`` lists): it should only keep the
+        line aside, for a rule on the end of the list to handle them at once.
+
+        There is one collector per event; registering another one replaces it.
+
+        .. versionadded:: 8.0
+        """
+        self._reply_collectors[event] = collector
+
+    def unregister_reply_collector(self, event: str) -> None:
+        """Unregister the collector for lines of the ``event``.
+
+        :param event: the event to stop collecting
+
+        .. versionadded:: 8.0
+        """
+        self._reply_collectors.pop(event, None)
+
     # URL callbacks management
 
     @deprecated(
@@ -1185,7 +1419,15 @@ class SopelWrapper:
     def __setattr__(self, attr, value):
         return setattr(self._bot, attr, value)
 
-    def say(self, message, destination=None, max_messages=1, truncation='', trailing=''):
+    def say(
+        self,
+        message,
+        destination=None,
+        max_messages=1,
+        truncation='',
+        trailing='',
+        priority=flood.PRIORITY_NORMAL,
+    ):
         """Override ``Sopel.say`` to use trigger source by default.
 
         :param str message: message to say
@@ -1198,6 +1440,8 @@ class SopelWrapper:
                                truncated (optional)
         :param str trailing: string that should always appear at the end of
                              ``message`` (optional)
+        :param int priority: priority of the message when it has to wait for
+                             the flood protection (optional)
 
         The ``destination`` will default to the channel in which the
         trigger happened (or nickname, if received in a private message).
@@ -1210,7 +1454,14 @@ class SopelWrapper:
         """
         if destination is None:
             destination = self._trigger.sender
-        self._bot.say(self._out_pfx + message, destination, max_messages, truncation, trailing)
+        self._bot.say(
+            self._out_pfx + message,
+            destination,
+            max_messages,
+            truncation,
+            trailing,
+            priority,
+        )
 
     def action(self, message, destination=None):
         """Override ``Sopel.action`` to use trigger source by default.
@@ -1230,12 +1481,19 @@ class SopelWrapper:
             destination = self._trigger.sender
         self._bot.action(message, destination)
 
-    def notice(self, message, destination=None):
+    def notice(
+        self,
+        message,
+        destination=None,
+        priority=flood.PRIORITY_NORMAL,
+    ):
         """Override ``Sopel.notice`` to use trigger source by default.
 
         :param str message: notice message
         :param str destination: channel or nickname; defaults to
             :attr:`trigger.sender <sopel.trigger.Trigger.sender>`
+        :param int priority: priority of the notice when it has to wait for
+                             the flood protection (optional)
 
         The ``destination`` will default to the channel in which the
         trigger happened (or nickname, if received in a private message).
@@ -1246,9 +1504,16 @@ class SopelWrapper:
         """
         if destination is None:
             destination = self._trigger.sender
-        self._bot.notice(self._out_pfx + message, destination)
+        self._bot.notice(self._out_pfx + message, destination, priority)
 
-    def reply(self, message, destination=None, reply_to=None, notice=False):
+    def reply(
+        self,
+        message,
+        destination=None,
+        reply_to=None,
+        notice=False,
+        priority=flood.PRIORITY_HIGH,
+    ):
         """Override ``Sopel.reply`` to ``reply_to`` sender by default.
 
         :param str message: reply message
@@ -1257,6 +1522,9 @@ class SopelWrapper:
         :param str reply_to: person to reply to; defaults to
             :attr:`trigger.nick <sopel.trigger.Trigger.nick>`
         :param bool notice: reply as an IRC notice or with a simple message
+        :param int priority: priority of the reply when it has to wait for
+                             the flood protection; defaults to
+                             :data:`~sopel.irc.flood.PRIORITY_HIGH`
 
         The ``destination`` will default to the channel in which the
         trigger happened (or nickname, if received in a private message).
@@ -1271,7 +1539,7 @@ class SopelWrapper:
             destination = self._trigger.sender
         if reply_to is None:
             reply_to = self._trigger.nick
-        self._bot.reply(message, destination, reply_to, notice)
+        self._bot.reply(message, destination, reply_to, notice, priority)
 
     def kick(self, nick, channel=None, message=None):
         """Override ``Sopel.kick`` to kick in a channel
@@ -1296,3 +1564,119 @@ class SopelWrapper:
         if nick is None:
             raise RuntimeError('Error: KICK requires a nick.')
         self._bot.kick(nick, channel, message)
+
+
+class AsyncSopelWrapper(SopelWrapper):
+    """Wrapper around a Sopel instance and a Trigger for asynchronous rules.
+
+    :param sopel: Sopel instance
+    :type sopel: :class:`~sopel.bot.Sopel`
+    :param trigger: IRC Trigger line
+    :type trigger: :class:`~sopel.trigger.Trigger`
+    :param str output_prefix: prefix for messages sent through this wrapper
+                              (e.g. plugin tag)
+
+    This wrapper is used as the ``bot`` argument of rules defined with
+    ``async def``. It works like :class:`SopelWrapper`, except that its
+    :meth:`say`, :meth:`action`, :meth:`notice`, and :meth:`reply` methods
+    are coroutines that must be awaited::
+
+        @plugin.command('hello')
+        async def hello(bot, trigger):
+            await bot.reply('Hello!')
+
+    They never block the backend's event loop: the flood protection waits
+    outside of it.
+
+    .. versionadded:: 8.0
+    """
+    async def run_sync(self, func, *args, **kwargs):
+        """Run a blocking ``func`` outside of the event loop.
+
+        :param callable func: the function to call with ``args`` and
+                              ``kwargs``
+        :return: the return value of ``func``
+
+        The function is called in a worker thread of the running loop's
+        default executor, so a plugin can use blocking code (such as
+        :mod:`sopel.db` queries) without blocking other asynchronous rules::
+
+            @plugin.command('seen')
+            async def seen(bot, trigger):
+                nick = trigger.group(3)
+                time = await bot.run_sync(bot.db.get_nick_value, nick, 'seen')
+                await bot.say('%s was last seen at %s' % (nick, time))
+
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(func, *args, **kwargs))
+
+    async def say(
+        self,
+        message,
+        destination=None,
+        max_messages=1,
+        truncation='',
+        trailing='',
+        priority=flood.PRIORITY_NORMAL,
+    ):
+        """Override ``SopelWrapper.say`` to be awaited.
+
+        .. seealso::
+
+            :meth:`SopelWrapper.say` for the arguments of this method.
+
+        """
+        await self.run_sync(
+            super().say,
+            message,
+            destination,
+            max_messages,
+            truncation,
+            trailing,
+            priority,
+        )
+
+    async def action(self, message, destination=None):
+        """Override ``SopelWrapper.action`` to be awaited.
+
+        .. seealso::
+
+            :meth:`SopelWrapper.action` for the arguments of this method.
+
+        """
+        await self.run_sync(super().action, message, destination)
+
+    async def notice(
+        self,
+        message,
+        destination=None,
+        priority=flood.PRIORITY_NORMAL,
+    ):
+        """Override ``SopelWrapper.notice`` to be awaited.
+
+        .. seealso::
+
+            :meth:`SopelWrapper.notice` for the arguments of this method.
+
+        """
+        await self.run_sync(super().notice, message, destination, priority)
+
+    async def reply(
+        self,
+        message,
+        destination=None,
+        reply_to=None,
+        notice=False,
+        priority=flood.PRIORITY_HIGH,
+    ):
+        """Override ``SopelWrapper.reply`` to be awaited.
+
+        .. seealso::
+
+            :meth:`SopelWrapper.reply` for the arguments of this method.
+
+        """
+        await self.run_sync(
+            super().reply, message, destination, reply_to, notice, priority)
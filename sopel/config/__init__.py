@@ -94,6 +94,33 @@ class ConfigurationNotFound(ConfigurationError):
         return 'Unable to find the configuration file %s' % self.filename
 
 
+class _ConfigParser(configparser.RawConfigParser):
+    """Configuration parser that counts the changes to its content."""
+    def __init__(self, *args, **kwargs):
+        self.revision = 0
+        super().__init__(*args, **kwargs)
+
+    def _read(self, fp, fpname):
+        self.revision += 1
+        return super()._read(fp, fpname)
+
+    def add_section(self, section):
+        self.revision += 1
+        return super().add_section(section)
+
+    def remove_section(self, section):
+        self.revision += 1
+        return super().remove_section(section)
+
+    def set(self, section, option, value=None):
+        self.revision += 1
+        return super().set(section, option, value)
+
+    def remove_option(self, section, option):
+        self.revision += 1
+        return super().remove_option(section, option)
+
+
 class Config:
     """The bot's configuration.
 
@@ -124,7 +151,7 @@ class Config:
         The config's ``basename`` is useful as a component :ref:`of log file
         names <logging-basename>`, for example.
         """
-        self.parser = configparser.RawConfigParser(allow_no_value=True)
+        self.parser = _ConfigParser(allow_no_value=True)
         """The configuration parser object that does the heavy lifting.
 
         .. seealso::
@@ -139,6 +166,20 @@ class Config:
         self.get = self.parser.get
         """Shortcut to :meth:`parser.get <configparser.ConfigParser.get>`."""
 
+    @property
+    def revision(self):
+        """A number that changes every time the configuration changes.
+
+        The number changes when a setting is set or removed, when a section
+        is added or removed, and when the configuration is read or
+        :meth:`saved <save>`. Code that caches values computed from the
+        configuration can compare it to the revision of its cache to know
+        when to compute them again.
+
+        .. versionadded:: 8.0
+        """
+        return self.parser.revision
+
     @property
     def homedir(self):
         """The config file's home directory.
@@ -197,6 +238,7 @@ class Config:
         self.parser.write(cfgfile)
         cfgfile.flush()
         cfgfile.close()
+        self.parser.revision += 1
 
     def add_section(self, name):
         """Add a new, empty section to the config file.
@@ -288,6 +288,55 @@ class CoreSection(StaticSection):
     .. versionadded:: 7.0
     """
 
+    db_async_writes = BooleanAttribute('db_async_writes', default=False)
+    """Whether to write database values in the background.
+
+    :default: ``False``
+
+    When enabled, plugins that set or delete a value in the database don't
+    wait for it to be written: changes are queued, and a background thread
+    writes them in batches. Reading a value that has a pending change returns
+    that change.
+
+    Changes that are still pending are written when the bot shuts down; they
+    can be lost if the bot is killed instead.
+
+    .. versionadded:: 8.0
+    """
+
+    db_cache_size = ValidatedAttribute('db_cache_size', int, default=0)
+    """How many values Sopel can keep in its database cache.
+
+    :default: ``0`` (no cache)
+
+    When set to a positive number, Sopel caches the nick IDs and the nick,
+    channel, and plugin values it reads from its database, so reading them
+    again doesn't query the database. The least recently used entries are
+    evicted first when the cache is full.
+
+    Entries are invalidated when Sopel itself modifies the database; changes
+    made by other programs are seen only when their entries expire (see
+    :attr:`db_cache_ttl`).
+
+    .. versionadded:: 8.0
+    """
+
+    db_cache_ttl = ValidatedAttribute('db_cache_ttl', float, default=300)
+    """How long (in seconds) a value can stay in the database cache.
+
+    :default: ``300``
+
+    This is equivalent to the default value:
+
+    .. code-block:: ini
+
+        db_cache_ttl = 300
+
+    Ignored when the cache is disabled (see :attr:`db_cache_size`).
+
+    .. versionadded:: 8.0
+    """
+
     db_driver = ValidatedAttribute('db_driver')
     """The driver to use for connecting to the database.
 
@@ -313,6 +362,19 @@ class CoreSection(StaticSection):
     Ignored when using SQLite.
     """
 
+    db_max_overflow = ValidatedAttribute('db_max_overflow', int)
+    """How many connections can be opened beyond :attr:`db_pool_size`.
+
+    :default: SQLAlchemy's default (``10``)
+
+    Extra connections are opened when every connection of the pool is in use,
+    and closed once they are released.
+
+    Ignored when using SQLite.
+
+    .. versionadded:: 8.0
+    """
+
     db_name = ValidatedAttribute('db_name')
     """The name of Sopel's database.
 
@@ -325,12 +387,128 @@ class CoreSection(StaticSection):
     Ignored when using SQLite.
     """
 
+    db_pool_recycle = ValidatedAttribute('db_pool_recycle', int, default=3600)
+    """How long (in seconds) a database connection can be reused.
+
+    :default: ``3600``
+
+    Connections older than this are closed and replaced when they are taken
+    from the pool, which prevents errors with database servers that close
+    idle connections after a while (such as MySQL). A negative value disables
+    this.
+
+    This is equivalent to the default value:
+
+    .. code-block:: ini
+
+        db_pool_recycle = 3600
+
+    .. versionadded:: 8.0
+    """
+
+    db_pool_size = ValidatedAttribute('db_pool_size', int)
+    """How many connections to the database Sopel keeps open.
+
+    :default: SQLAlchemy's default (``5``)
+
+    Threaded plugin callables each take a connection from this pool when they
+    use the database; if more plugins need one at the same time, up to
+    :attr:`db_max_overflow` extra connections are opened.
+
+    Ignored when using SQLite.
+
+    .. versionadded:: 8.0
+    """
+
     db_port = ValidatedAttribute('db_port')
     """The port for Sopel's database.
 
     Ignored when using SQLite.
     """
 
+    db_sqlite_busy_timeout = ValidatedAttribute(
+        'db_sqlite_busy_timeout', int, default=5000)
+    """How long (in milliseconds) to wait for a locked SQLite database.
+
+    :default: ``5000``
+
+    When another connection holds a lock on the database, SQLite retries for
+    up to this duration before giving up with a "database is locked" error.
+
+    This is equivalent to the default value:
+
+    .. code-block:: ini
+
+        db_sqlite_busy_timeout = 5000
+
+    Used only for SQLite.
+
+    .. versionadded:: 8.0
+    """
+
+    db_sqlite_journal_mode = ChoiceAttribute(
+        'db_sqlite_journal_mode',
+        choices=['wal', 'delete', 'truncate', 'persist', 'memory', 'off'],
+        default='wal')
+    """The journal mode of the SQLite database.
+
+    :default: ``wal``
+
+    In ``wal`` (write-ahead log) mode, readers don't block writers and a
+    writer doesn't block readers, and committing a transaction doesn't need
+    to rewrite the database file. The other modes use a rollback journal.
+
+    This is equivalent to the default value:
+
+    .. code-block:: ini
+
+        db_sqlite_journal_mode = wal
+
+    Used only for SQLite. Refer to `SQLite's documentation`__ for more
+    information about journal modes.
+
+    .. __: https://www.sqlite.org/pragma.html#pragma_journal_mode
+
+    .. versionadded:: 8.0
+    """
+
+    db_sqlite_mmap_size = ValidatedAttribute(
+        'db_sqlite_mmap_size', int, default=0)
+    """How many bytes of the SQLite database can be memory-mapped.
+
+    :default: ``0`` (no memory-mapped I/O)
+
+    Memory-mapped I/O can speed up reads of large databases.
+
+    Used only for SQLite.
+
+    .. versionadded:: 8.0
+    """
+
+    db_sqlite_synchronous = ChoiceAttribute(
+        'db_sqlite_synchronous',
+        choices=['off', 'normal', 'full', 'extra'],
+        default='normal')
+    """How often SQLite waits for data to be written to disk.
+
+    :default: ``normal``
+
+    With the ``wal`` :attr:`db_sqlite_journal_mode`, ``normal`` is safe from
+    corruption and only syncs at checkpoints, but a transaction committed
+    right before a power loss may be rolled back. Use ``full`` to sync on
+    every commit.
+
+    This is equivalent to the default value:
+
+    .. code-block:: ini
+
+        db_sqlite_synchronous = normal
+
+    Used only for SQLite.
+
+    .. versionadded:: 8.0
+    """
+
     db_type = ChoiceAttribute('db_type', choices=[
         'sqlite', 'mysql', 'postgres', 'mssql', 'oracle', 'firebird', 'sybase'], default='sqlite')
     """The type of database Sopel should connect to.
@@ -442,6 +620,104 @@ class CoreSection(StaticSection):
 
     """
 
+    dispatch_backpressure = ChoiceAttribute(
+        'dispatch_backpressure',
+        choices=['queue', 'drop', 'block'],
+        default='queue')
+    """What to do with a triggered rule when the dispatch queue is full.
+
+    :default: ``queue``
+
+    Threaded rules wait in a queue for a worker thread. When that queue holds
+    :attr:`dispatch_queue_size` rules or more, Sopel either:
+
+    * ``queue``: keeps queueing rules anyway, and logs a warning
+    * ``drop``: doesn't run the rule at all, and logs a warning
+    * ``block``: stops processing messages from the server until there is
+      room in the queue
+
+    This is equivalent to the default value:
+
+    .. code-block:: ini
+
+        dispatch_backpressure = queue
+
+    .. seealso::
+
+        :attr:`dispatch_workers` controls the number of worker threads.
+
+    .. versionadded:: 8.0
+    """
+
+    dispatch_plugin_workers = ValidatedAttribute(
+        'dispatch_plugin_workers', int, default=0)
+    """How many rules of the same plugin can run at the same time.
+
+    :default: ``0``
+
+    When a plugin already has this many threaded rules running, its other
+    triggered rules wait in the queue, so a slow plugin can't take all the
+    worker threads for itself.
+
+    If not set, or set to 0, there is no limit per plugin. In this example,
+    each plugin can use at most 2 worker threads at a time:
+
+    .. code-block:: ini
+
+        dispatch_plugin_workers = 2
+
+    .. seealso::
+
+        :attr:`dispatch_workers` controls the number of worker threads.
+
+    .. versionadded:: 8.0
+    """
+
+    dispatch_queue_size = ValidatedAttribute(
+        'dispatch_queue_size', int, default=256)
+    """How many triggered rules can wait for a worker thread.
+
+    :default: ``256``
+
+    If set to 0, the queue has no limit. This is equivalent to the default
+    value:
+
+    .. code-block:: ini
+
+        dispatch_queue_size = 256
+
+    .. seealso::
+
+        :attr:`dispatch_backpressure` controls what happens when the queue is
+        full.
+
+    .. versionadded:: 8.0
+    """
+
+    dispatch_workers = ValidatedAttribute('dispatch_workers', int, default=16)
+    """How many worker threads can run threaded rules at the same time.
+
+    :default: ``16``
+
+    Sopel executes threaded rules in a pool of worker threads, started on
+    demand up to this number, and reused from one message to the next. Rules
+    triggered while every worker is busy wait in a queue.
+
+    This is equivalent to the default value:
+
+    .. code-block:: ini
+
+        dispatch_workers = 16
+
+    .. seealso::
+
+        :attr:`dispatch_queue_size`, :attr:`dispatch_backpressure`, and
+        :attr:`dispatch_plugin_workers` control the queue of rules waiting
+        for a worker thread.
+
+    .. versionadded:: 8.0
+    """
+
     enable = ListAttribute('enable')
     """A list of the only plugins you want to enable.
 
@@ -713,6 +989,25 @@ class CoreSection(StaticSection):
 
     """
 
+    job_workers = ValidatedAttribute('job_workers', int, default=4)
+    """How many worker threads can run threaded jobs at the same time.
+
+    :default: ``4``
+
+    Sopel executes the threaded jobs of plugins (see
+    :func:`sopel.plugin.interval`) in a pool of worker threads, started on
+    demand up to this number. Jobs ready while every worker is busy wait for
+    a free one.
+
+    This is equivalent to the default value:
+
+    .. code-block:: ini
+
+        job_workers = 4
+
+    .. versionadded:: 8.0
+    """
+
     log_raw = BooleanAttribute('log_raw', default=False)
     """Whether a log of raw lines as sent and received should be kept.
 
@@ -1075,6 +1370,69 @@ class CoreSection(StaticSection):
     silently from the triggering IRC user's perspective.
     """
 
+    send_burst_lines = ValidatedAttribute('send_burst_lines', int, default=10)
+    """How many lines can be sent to the server at once.
+
+    :default: ``10``
+
+    Up to this number of lines, of any kind, can be sent at once before the
+    send rate limits apply. This is equivalent to the default value:
+
+    .. code-block:: ini
+
+        send_burst_lines = 10
+
+    .. seealso::
+
+        The :ref:`Flood Prevention` chapter to learn what each flood-related
+        setting does.
+
+    .. versionadded:: 8.0
+    """
+
+    send_rate_bytes = ValidatedAttribute(
+        'send_rate_bytes', float, default=1024)
+    """How many bytes per second can be sent to the server.
+
+    :default: ``1024``
+
+    This limit applies to every line sent to the server, whatever its
+    command, and to every recipient at once. If set to 0, there is no limit.
+    This is equivalent to the default value:
+
+    .. code-block:: ini
+
+        send_rate_bytes = 1024
+
+    .. seealso::
+
+        The :ref:`Flood Prevention` chapter to learn what each flood-related
+        setting does.
+
+    .. versionadded:: 8.0
+    """
+
+    send_rate_lines = ValidatedAttribute('send_rate_lines', float, default=2)
+    """How many lines per second can be sent to the server.
+
+    :default: ``2``
+
+    This limit applies to every line sent to the server, whatever its
+    command, and to every recipient at once. If set to 0, there is no limit.
+    This is equivalent to the default value:
+
+    .. code-block:: ini
+
+        send_rate_lines = 2
+
+    .. seealso::
+
+        The :ref:`Flood Prevention` chapter to learn what each flood-related
+        setting does.
+
+    .. versionadded:: 8.0
+    """
+
     server_auth_method = ChoiceAttribute('server_auth_method',
                                          choices=['sasl', 'server'])
     """The server authentication method.
@@ -1114,12 +1472,15 @@ class CoreSection(StaticSection):
 
     :default: ``0``
 
-    Sopel will only join this many channels at a time, sleeping for a second
-    between each batch to avoid getting kicked for joining too quickly. This is
-    unnecessary on most networks.
+    Sopel will only join this many channels at a time, waiting for
+    :attr:`throttle_wait` seconds between each batch to avoid getting kicked
+    for joining too quickly. This is unnecessary on most networks.
 
     If not set, or set to 0, Sopel won't slow down the initial join.
 
+    Whatever this setting, Sopel joins several channels with each ``JOIN``
+    command, as allowed by the server.
+
     In this example, Sopel will try to join 4 channels at a time:
 
     .. code-block:: ini
@@ -1131,6 +1492,13 @@ class CoreSection(StaticSection):
         :attr:`throttle_wait` controls Sopel's waiting time between joining
         batches of channels.
 
+    .. versionchanged:: 8.0
+
+        Batches of channels are joined without blocking the bot, and with as
+        few ``JOIN`` commands as possible. ``WHO`` requests are sent once
+        every channel has been joined, and spread over time within the
+        :attr:`who_refresh_budget`.
+
     """
 
     throttle_wait = ValidatedAttribute('throttle_wait', int, default=1)
@@ -1315,3 +1683,35 @@ class CoreSection(StaticSection):
         verify_ssl = true
 
     """
+
+    who_refresh_budget = ValidatedAttribute(
+        'who_refresh_budget', int, default=600)
+    """How many ``WHO`` reply lines Sopel can request per minute.
+
+    :default: ``600``
+
+    Sopel periodically sends ``WHO`` requests to keep its channels' user
+    information up-to-date (unless the server supports ``away-notify``),
+    starting with the channels it refreshed the longest ago, and no more
+    than once every 2 minutes per channel.
+
+    The reply to a ``WHO`` request contains one line per user in the channel,
+    so a large channel uses more of this budget than a small one:
+
+    .. code-block:: ini
+
+        who_refresh_budget = 600
+
+    In this example, Sopel can refresh 2 channels of 300 users, or 30
+    channels of 20 users, each minute.
+
+    The ``WHO`` requests sent when Sopel joins channels use the same budget,
+    so joining many channels doesn't send them all at once.
+
+    If set to 0, Sopel never refreshes its channels (``WHO`` requests are
+    still sent when it joins a channel, one at a time, or
+    :attr:`throttle_join` at a time).
+
+    .. versionadded:: 8.0
+
+    """
@@ -28,11 +28,9 @@ import copy
 import datetime
 import functools
 import logging
-import re
-import time
 
 from sopel import config, plugin
-from sopel.irc import isupport, utils
+from sopel.irc import flood, isupport, utils
 from sopel.tools import events, jobs, SopelMemory, target
 
 
@@ -61,29 +59,42 @@ batched_caps = {}
 def setup(bot):
     """Set up the coretasks plugin.
 
-    The setup phase is used to activate the throttle feature to prevent a flood
-    of JOIN commands when there are too many channels to join.
+    The setup phase is used to schedule the ``MODE`` and ``WHO`` requests
+    sent after joining channels, to prevent a flood of them when there are
+    too many channels to join.
     """
     bot.memory['retry_join'] = SopelMemory()
     bot.memory['join_events_queue'] = collections.deque()
+    bot.memory['who_refresh'] = flood.WhoRefreshQueue(
+        bot.settings.core.who_refresh_budget)
+    bot.memory['names_replies'] = {}
+    bot.memory['who_replies'] = {}
+    bot.register_reply_collector(events.RPL_NAMREPLY, handle_names)
+    bot.register_reply_collector(events.RPL_WHOREPLY, recv_who)
+    bot.register_reply_collector(events.RPL_WHOSPCRPL, recv_whox)
 
     # Manage JOIN flood protection
+    wait_interval = 1
     if bot.settings.core.throttle_join:
         wait_interval = max(bot.settings.core.throttle_wait, 1)
-        job = jobs.Job(
-            [wait_interval],
-            plugin='coretasks',
-            label='throttle_join',
-            handler=_join_event_processing,
-            threaded=True,
-            doc=None,
-        )
-        bot.scheduler.register(job)
+    job = jobs.Job(
+        [wait_interval],
+        plugin='coretasks',
+        label='throttle_join',
+        handler=_join_event_processing,
+        threaded=True,
+        doc=None,
+    )
+    bot.scheduler.register(job)
 
 
 def shutdown(bot):
     """Clean up coretasks-related values in the bot's memory."""
+    bot.unregister_reply_collector(events.RPL_NAMREPLY)
+    bot.unregister_reply_collector(events.RPL_WHOREPLY)
+    bot.unregister_reply_collector(events.RPL_WHOSPCRPL)
     bot.memory['retry_join'] = SopelMemory()
+    bot.join_scheduler.clear()
     try:
         bot.memory['join_events_queue'].clear()
     except KeyError:
@@ -93,20 +104,44 @@ def shutdown(bot):
 def _join_event_processing(bot):
     """Process a batch of JOIN event from the ``join_events_queue`` queue.
 
-    Every time this function is executed, it processes at most
-    ``throttle_join`` JOIN events. For each JOIN, it sends a WHO request to
-    know more about the channel. This will prevent an excess of flood when
-    there are too many channels to join at once.
+    For each JOIN, it sends a MODE and a WHO request to know more about the
+    channel. This will prevent an excess of flood when there are too many
+    channels to join at once.
+
+    WHO requests are deferred until every channel has been joined, so
+    ``JOIN`` commands don't have to wait for them. Then they are spread over
+    time: every time this function is executed, it sends as many WHO requests
+    as the budget of reply lines allows (see ``core.who_refresh_budget``,
+    shared with the periodic refresh), and at most ``throttle_join`` of them.
+    Without a budget nor ``throttle_join``, it sends one WHO request at a
+    time.
     """
-    batch_size = max(bot.settings.core.throttle_join, 1)
-    for _ in range(batch_size):
-        try:
-            channel = bot.memory['join_events_queue'].popleft()
-        except IndexError:
+    if bot.join_scheduler.pending:
+        return
+
+    queue = bot.memory['join_events_queue']
+    who_refresh = bot.memory['who_refresh']
+    batch_size = bot.settings.core.throttle_join
+    if not batch_size and not who_refresh.budget:
+        batch_size = 1
+
+    now = datetime.datetime.utcnow()
+    sent = 0
+    while queue and not (batch_size and sent >= batch_size):
+        channel = bot.channels.get(queue[0])
+        if channel is None:
+            # the bot left the channel in the meantime
+            queue.popleft()
+            continue
+        if not who_refresh.consume(channel, now):
             break
-        LOGGER.debug("Sending MODE and WHO after channel JOIN: %s", channel)
-        bot.write(["MODE", channel])
-        _send_who(bot, channel)
+
+        queue.popleft()
+        LOGGER.debug(
+            "Sending MODE and WHO after channel JOIN: %s", channel.name)
+        bot.write(["MODE", channel.name])
+        _send_who(bot, channel.name)
+        sent += 1
 
 
 def auth_after_register(bot):
@@ -380,33 +415,14 @@ def join_channels(bot, trigger):
     channels = bot.config.core.channels
     if not channels:
         LOGGER.info("No initial channels to JOIN.")
+        return
 
-    elif bot.config.core.throttle_join:
-        throttle_rate = int(bot.config.core.throttle_join)
-        throttle_wait = max(bot.config.core.throttle_wait, 1)
-        channels_joined = 0
-
-        LOGGER.info(
-            "Joining %d channels (with JOIN throttle ON); "
-            "this may take a moment.",
-            len(channels))
-
-        for channel in channels:
-            channels_joined += 1
-            if not channels_joined % throttle_rate:
-                LOGGER.debug(
-                    "Waiting %ds before next JOIN batch.",
-                    throttle_wait)
-                time.sleep(throttle_wait)
-            bot.join(channel)
-    else:
-        LOGGER.info(
-            "Joining %d channels (with JOIN throttle OFF); "
-            "this may take a moment.",
-            len(channels))
-
-        for channel in bot.config.core.channels:
-            bot.join(channel)
+    LOGGER.info(
+        "Joining %d channels (with JOIN throttle %s); "
+        "this may take a moment.",
+        len(channels),
+        'ON' if bot.config.core.throttle_join else 'OFF')
+    bot.join_scheduler.submit(channels)
 
 
 @plugin.event(events.RPL_MYINFO)
@@ -477,56 +493,71 @@ def retry_join(bot, trigger):
         LOGGER.info(
             "Rejoining channel %r failed, will retry in 6s.",
             str(channel))
-        time.sleep(6)
+        delay = 6
     else:
         bot.memory['retry_join'][channel] = 0
+        delay = 0
 
     attempt = bot.memory['retry_join'][channel] + 1
     LOGGER.info(
         "Trying to rejoin channel %r (attempt %d/10)",
         str(channel), attempt)
-    bot.join(channel)
+    bot.join_scheduler.submit([channel], delay=delay)
 
 
-@plugin.rule('(.*)')
-@plugin.event(events.RPL_NAMREPLY)
-@plugin.thread(False)
-@plugin.unblockable
-@plugin.priority('medium')
-def handle_names(bot, trigger):
-    """Handle NAMES responses.
+DEFAULT_PREFIX_PRIVILEGES = {
+    "+": plugin.VOICE,
+    "%": plugin.HALFOP,
+    "@": plugin.OP,
+    "&": plugin.ADMIN,
+    "~": plugin.OWNER,
+    "!": plugin.OPER,
+}
+"""Privileges of each nick prefix, when the server doesn't advertise any."""
 
-    This function keeps track of users' privileges when Sopel joins channels.
-    """
-    # TODO specific to one channel type. See issue 281.
-    channels = re.search(r'(#\S*)', trigger.raw)
-    if not channels:
-        return
-    channel = bot.make_identifier(channels.group(1))
+
+def _get_prefix_privileges(bot):
+    """Get the privilege of each nick prefix supported by the server."""
+    try:
+        prefixes = bot.isupport.PREFIX
+    except AttributeError:
+        return DEFAULT_PREFIX_PRIVILEGES
+
+    return {
+        prefix: MODE_PREFIX_PRIVILEGES.get(mode, 0)
+        for mode, prefix in prefixes.items()
+    }
+
+
+def _get_channel(bot, channel):
+    """Get a channel by name, creating it if the bot doesn't know it yet."""
+    channel = bot.make_identifier(channel)
     if channel not in bot.channels:
         bot.channels[channel] = target.Channel(
             channel,
             identifier_factory=bot.make_identifier,
+            memberships=bot.memberships,
         )
+    return bot.channels[channel]
 
-    # This could probably be made flexible in the future, but I don't think
-    # it'd be worth it.
-    # If this ever needs to be updated, remember to change the mode handling in
-    # the WHO-handler functions below, too.
-    mapping = {
-        "+": plugin.VOICE,
-        "%": plugin.HALFOP,
-        "@": plugin.OP,
-        "&": plugin.ADMIN,
-        "~": plugin.OWNER,
-        "!": plugin.OPER,
-    }
+
+def handle_names(bot, trigger):
+    """Handle NAMES responses.
+
+    Names are kept aside until the end of the NAMES list (see
+    :func:`handle_end_of_names`). This is a reply collector, called with
+    each line before any rule dispatch (see
+    :meth:`~sopel.bot.Sopel.register_reply_collector`).
+    """
+    if len(trigger.args) < 3:
+        return
 
     uhnames = 'UHNAMES' in bot.isupport
     userhost_in_names = 'userhost-in-names' in bot.enabled_capabilities
+    names = bot.memory['names_replies'].setdefault(
+        bot.make_identifier(trigger.args[-2]), [])
 
-    names = trigger.split()
-    for name in names:
+    for name in trigger.args[-1].split():
         username = hostname = None
 
         if uhnames or userhost_in_names:
@@ -542,21 +573,46 @@ def handle_names(bot, trigger):
                     'IRC server/bouncer is not spec compliant.',
                     'UHNAMES' if uhnames else 'userhost-in-names')
 
+        names.append((name, username, hostname))
+
+
+@plugin.event(events.RPL_ENDOFNAMES)
+@plugin.thread(False)
+@plugin.unblockable
+@plugin.priority('medium')
+def handle_end_of_names(bot, trigger):
+    """Track users' privileges from a complete NAMES list.
+
+    This function keeps track of users' privileges when Sopel joins channels,
+    with every name received for the channel at once. The names of other
+    channels, whose NAMES lists are still coming, are left aside.
+    """
+    if len(trigger.args) < 2:
+        return
+
+    channel_name = bot.make_identifier(trigger.args[-2])
+    names = bot.memory['names_replies'].pop(channel_name, [])
+    mapping = _get_prefix_privileges(bot)
+    prefixes = ''.join(mapping)
+
+    channel = _get_channel(bot, channel_name)
+    for name, username, hostname in names:
+        nick = name.lstrip(prefixes)
         priv = 0
-        for prefix, value in mapping.items():
-            if prefix in name:
-                priv = priv | value
+        for prefix in name[:len(name) - len(nick)]:
+            priv = priv | mapping[prefix]
 
-        nick = bot.make_identifier(name.lstrip(''.join(mapping.keys())))
+        nick = bot.make_identifier(nick)
         user = bot.users.get(nick)
         if user is None:
-            # The username/hostname will be included in a NAMES reply only if
-            # userhost-in-names is available. We can use them if present.
-            # Fortunately, the user should already exist in bot.users by the
-            # time this code runs, so this is 99.9% ass-covering.
+            # The username/hostname will be included in a NAMES reply
+            # only if userhost-in-names is available. We can use them if
+            # present. Fortunately, the user should already exist in
+            # bot.users by the time this code runs, so this is 99.9%
+            # ass-covering.
             user = target.User(nick, username, hostname)
             bot.users[nick] = user
-        bot.channels[channel].add_user(user, privs=priv)
+        channel.add_user(user, privs=priv)
 
 
 @plugin.rule('(.*)')
@@ -723,10 +779,15 @@ def track_nicks(bot, trigger):
         bot._nick = new
         return
 
-    for channel in bot.channels.values():
-        channel.rename_user(old, new)
-    if old in bot.users:
+    user = bot.users.get(old)
+    if user is not None:
+        # only the user's channels need to know
+        for channel in list(user.channels.values()):
+            channel.rename_user(old, new)
         bot.users[new] = bot.users.pop(old)
+    else:
+        for channel in bot.channels.values():
+            channel.rename_user(old, new)
 
     LOGGER.info("User named %r is now known as %r.", str(old), str(new))
 
@@ -795,35 +856,27 @@ def _send_who(bot, channel):
         bot.write(['WHO', channel])
 
     channel_id = bot.make_identifier(channel)
-    bot.channels[channel_id].last_who = datetime.datetime.utcnow()
+    last_who = bot.channels[channel_id].last_who = datetime.datetime.utcnow()
+    if 'who_refresh' in bot.memory:
+        bot.memory['who_refresh'].push(channel_id, last_who)
 
 
-@plugin.interval(30)
+@plugin.interval(10)
 def _periodic_send_who(bot):
-    """Periodically send a WHO request to keep user information up-to-date."""
+    """Periodically send WHO requests to keep user information up-to-date.
+
+    Channels are refreshed stalest first, at most once every 2 minutes, and
+    within the budget of reply lines set by ``core.who_refresh_budget``.
+    """
     if 'away-notify' in bot.enabled_capabilities:
-        # WHO not needed to update 'away' status
+        # WHO not needed to update 'away' status; accounts are kept up-to-date
+        # by account-notify and extended-join, or not available in WHO replies
         return
 
-    # Loops through the channels to find the one that has the longest time since the last WHO
-    # request, and issues a WHO request only if the last request for the channel was more than
-    # 120 seconds ago.
-    who_trigger_time = datetime.datetime.utcnow() - datetime.timedelta(seconds=120)
-    selected_channel = None
-    for channel_name, channel in bot.channels.items():
-        if channel.last_who is None:
-            # WHO was never sent yet to this channel: stop here
-            selected_channel = channel_name
-            break
-        if channel.last_who < who_trigger_time:
-            # this channel's last who request is the most outdated one at the moment
-            selected_channel = channel_name
-            who_trigger_time = channel.last_who
-
-    if selected_channel is not None:
-        # selected_channel's last who is either none or the oldest valid
-        LOGGER.debug("Sending WHO for channel: %s", selected_channel)
-        _send_who(bot, selected_channel)
+    now = datetime.datetime.utcnow()
+    for channel in bot.memory['who_refresh'].pop_due(bot.channels, now):
+        LOGGER.debug("Sending WHO for channel: %s", channel)
+        _send_who(bot, channel)
 
 
 @plugin.event('JOIN')
@@ -833,8 +886,9 @@ def _periodic_send_who(bot):
 def track_join(bot, trigger):
     """Track users joining channels.
 
-    When a user joins a channel, the bot will send (or queue) a ``WHO`` command
-    to know more about said user (privileges, modes, etc.).
+    When the bot joins a channel, it queues a ``MODE`` and a ``WHO`` command
+    to know more about the channel and its users (privileges, modes, etc.);
+    see :func:`_join_event_processing`.
     """
     channel = trigger.sender
 
@@ -843,19 +897,15 @@ def track_join(bot, trigger):
         bot.channels[channel] = target.Channel(
             channel,
             identifier_factory=bot.make_identifier,
+            memberships=bot.memberships,
         )
 
     # did *we* just join?
     if trigger.nick == bot.nick:
         LOGGER.info("Channel joined: %s", channel)
         bot.channels[channel].join_time = trigger.time
-        if bot.settings.core.throttle_join:
-            LOGGER.debug("JOIN event added to queue for channel: %s", channel)
-            bot.memory['join_events_queue'].append(channel)
-        else:
-            LOGGER.debug("Send MODE and direct WHO for channel: %s", channel)
-            bot.write(["MODE", channel])
-            _send_who(bot, channel)
+        LOGGER.debug("JOIN event added to queue for channel: %s", channel)
+        bot.memory['join_events_queue'].append(channel)
     else:
         LOGGER.info(
             "Channel %r joined by user: %s",
@@ -880,9 +930,14 @@ def track_join(bot, trigger):
 @plugin.priority('medium')
 def track_quit(bot, trigger):
     """Track when users quit channels."""
-    for channel in bot.channels.values():
-        channel.clear_user(trigger.nick)
-    bot.users.pop(trigger.nick, None)
+    user = bot.users.pop(trigger.nick, None)
+    if user is not None:
+        # only the user's channels need to know
+        for channel in list(user.channels.values()):
+            channel.clear_user(trigger.nick)
+    else:
+        for channel in bot.channels.values():
+            channel.clear_user(trigger.nick)
 
     LOGGER.info("User quit: %s", trigger.nick)
 
@@ -1383,12 +1438,11 @@ def account_notify(bot, trigger):
     LOGGER.info("Update account for nick %r: %s", str(trigger.nick), account)
 
 
-@plugin.event(events.RPL_WHOSPCRPL)
-@plugin.thread(False)
-@plugin.unblockable
-@plugin.priority('medium')
 def recv_whox(bot, trigger):
-    """Track ``WHO`` responses when ``WHOX`` is enabled."""
+    """Track ``WHO`` responses when ``WHOX`` is enabled.
+
+    This is a reply collector, like :func:`recv_who`.
+    """
     if len(trigger.args) < 2 or trigger.args[1] != CORE_QUERYTYPE:
         # Ignored, some plugin probably called WHO
         LOGGER.debug("Ignoring WHO reply for channel '%s'; not queried by coretasks", trigger.args[1])
@@ -1398,19 +1452,76 @@ def recv_whox(bot, trigger):
             "While populating `bot.accounts` a WHO response was malformed.")
         return
     _, _, channel, user, host, nick, status, account = trigger.args
-    away = 'G' in status
-    modes = ''.join([c for c in status if c in '~&@%+!'])
-    _record_who(bot, channel, user, host, nick, account, away, modes)
+    _keep_who_reply(bot, channel, user, host, nick, status, account)
+
+
+def recv_who(bot, trigger):
+    """Track ``WHO`` responses when ``WHOX`` is not enabled.
+
+    Replies for a channel are kept aside until the end of its WHO list (see
+    :func:`recv_end_of_who`). This is a reply collector, called with each
+    line before any rule dispatch (see
+    :meth:`~sopel.bot.Sopel.register_reply_collector`).
+    """
+    channel, user, host, _, nick, status = trigger.args[1:7]
+    _keep_who_reply(bot, channel, user, host, nick, status, None)
+
+
+def _keep_who_reply(bot, channel, user, host, nick, status, account):
+    channel_id = bot.make_identifier(channel)
+    if channel_id.is_nick():
+        # not for a channel (such as "*" in replies to a WHO for a nick):
+        # there is no channel list to wait for, only a user to record
+        _record_user(bot, user, host, nick, account, 'G' in status)
+        return
+
+    bot.memory['who_replies'].setdefault(channel_id, []).append(
+        (user, host, nick, status, account))
+
+
+@plugin.event(events.RPL_ENDOFWHO)
+@plugin.thread(False)
+@plugin.unblockable
+@plugin.priority('medium')
+def recv_end_of_who(bot, trigger):
+    """Track users from complete ``WHO`` responses.
 
+    Replies are kept aside by :func:`recv_who` and :func:`recv_whox` until the
+    end of the ``WHO`` list, then every user of the channel it is for is
+    recorded at once. Replies for other channels, whose lists are still
+    coming, are left aside.
+    """
+    if len(trigger.args) < 2:
+        return
 
-def _record_who(bot, channel, user, host, nick, account=None, away=None, modes=None):
+    channel_name = bot.make_identifier(trigger.args[1])
+    users = bot.memory['who_replies'].pop(channel_name, None)
+    if users is None:
+        # not a WHO list for a channel; its replies are already recorded
+        return
+    mapping = _get_prefix_privileges(bot)
+
+    channel = _get_channel(bot, channel_name)
+    for user, host, nick, status, account in users:
+        priv = 0
+        for char in status:
+            priv = priv | mapping.get(char, 0)
+        _record_who(
+            bot, channel, user, host, nick, account, 'G' in status, priv)
+
+
+def _record_who(bot, channel, user, host, nick, account, away, priv):
+    usr = _record_user(bot, user, host, nick, account, away)
+    channel.add_user(usr, privs=priv)
+
+
+def _record_user(bot, user, host, nick, account, away):
     nick = bot.make_identifier(nick)
-    channel = bot.make_identifier(channel)
-    if nick not in bot.users:
+    usr = bot.users.get(nick)
+    if usr is None:
         usr = target.User(nick, user, host)
         bot.users[nick] = usr
     else:
-        usr = bot.users[nick]
         # check for & fill in sparse User added by handle_names()
         if usr.host is None and host:
             usr.host = host
@@ -1420,39 +1531,8 @@ def _record_who(bot, channel, user, host, nick, account=None, away=None, modes=N
         usr.account = None
     else:
         usr.account = account
-    if away is not None:
-        usr.away = away
-    priv = 0
-    if modes:
-        mapping = {
-            "+": plugin.VOICE,
-            "%": plugin.HALFOP,
-            "@": plugin.OP,
-            "&": plugin.ADMIN,
-            "~": plugin.OWNER,
-            "!": plugin.OPER,
-        }
-        for c in modes:
-            priv = priv | mapping[c]
-    if channel not in bot.channels:
-        bot.channels[channel] = target.Channel(
-            channel,
-            identifier_factory=bot.make_identifier,
-        )
-
-    bot.channels[channel].add_user(usr, privs=priv)
-
-
-@plugin.event(events.RPL_WHOREPLY)
-@plugin.thread(False)
-@plugin.unblockable
-@plugin.priority('medium')
-def recv_who(bot, trigger):
-    """Track ``WHO`` responses when ``WHOX`` is not enabled."""
-    channel, user, host, _, nick, status = trigger.args[1:7]
-    away = 'G' in status
-    modes = ''.join([c for c in status if c in '~&@%+!'])
-    _record_who(bot, channel, user, host, nick, away=away, modes=modes)
+    usr.away = away
+    return usr
 
 
 @plugin.event('AWAY')
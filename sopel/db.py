@@ -15,14 +15,26 @@ convenience methods, such as :meth:`~SopelDB.get_nick_value` or
 """
 from __future__ import annotations
 
+from collections import defaultdict, OrderedDict
 import errno
+import itertools
 import json
 import logging
 import os.path
+import threading
+import time
 import traceback
 import typing
 
-from sqlalchemy import Column, create_engine, ForeignKey, Integer, String
+from sqlalchemy import (
+    Column,
+    create_engine,
+    event,
+    ForeignKey,
+    Integer,
+    String,
+)
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from sqlalchemy.engine.url import make_url, URL
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
@@ -99,6 +111,235 @@ class PluginValues(BASE):
     value = Column(String(255))
 
 
+# models of the key-value stores, and the column of their owner
+# keep the number of bound parameters of a query under SQLite's limit
+_IN_CLAUSE_SIZE = 500
+_VALUE_MODELS = {
+    'nick': (NickValues, 'nick_id'),
+    'channel': (ChannelValues, 'channel'),
+    'plugin': (PluginValues, 'plugin'),
+}
+
+
+class DBCache:
+    """LRU cache of values read from the database, with expiration.
+
+    :param max_size: maximum number of entries to keep
+    :param ttl: how long (in seconds) an entry can be kept
+
+    Entries are looked up with :meth:`get`, which tells whether the ``key``
+    was found, since ``None`` is a valid value (for a key without value in
+    the database). When the cache is full, the least recently used entries
+    are evicted first.
+
+    A value read from the database can become stale if the database is
+    modified before it is stored: to prevent that, the :attr:`version` must
+    be read before the database is queried, and given to :meth:`set`, which
+    ignores the value if anything was invalidated since then.
+
+    .. versionadded:: 8.0
+    """
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.version = 0
+        """Incremented each time an entry is invalidated."""
+        self.hits = 0
+        """How many lookups found a value."""
+        self.misses = 0
+        """How many lookups didn't find a value (or found an expired one)."""
+        self._entries: OrderedDict[tuple, tuple[float, typing.Any]] = (
+            OrderedDict())
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Ratio of lookups that found a value, from ``0`` to ``1``."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, key: tuple) -> tuple[bool, typing.Any]:
+        """Look up ``key`` in the cache.
+
+        :param key: the key to look up
+        :return: a 2-value tuple: whether ``key`` was found, and its value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key: tuple, value: typing.Any, version: int) -> None:
+        """Store the ``value`` of ``key``, read at ``version``.
+
+        :param key: the key to store
+        :param value: its value
+        :param version: the :attr:`version` read before the ``value``
+
+        The ``value`` is ignored if any entry was invalidated since
+        ``version``.
+        """
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: tuple) -> None:
+        """Remove ``key`` from the cache."""
+        with self._lock:
+            self.version += 1
+            self._entries.pop(key, None)
+
+    def invalidate_if(
+        self,
+        predicate: typing.Callable[[tuple, typing.Any], bool],
+    ) -> None:
+        """Remove the entries for which ``predicate(key, value)`` is true."""
+        with self._lock:
+            self.version += 1
+            for key in [
+                key
+                for key, (_, value) in self._entries.items()
+                if predicate(key, value)
+            ]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+
+class DBWriteQueue:
+    """Background writer of database values.
+
+    :param db: the database to write into
+    :param max_batch: maximum number of values written in one transaction
+
+    Values are :meth:`put` into the queue, and written by a background
+    thread, in batches of up to ``max_batch`` values per transaction. Until
+    it is written, a value can be read with :meth:`get`, so the process
+    always reads its own writes. A value put again before it is written
+    replaces the pending one.
+
+    Writing a batch that fails is logged, and its values are dropped.
+
+    .. versionadded:: 8.0
+    """
+    def __init__(self, db: SopelDB, max_batch: int = 500) -> None:
+        self.db = db
+        self.max_batch = max_batch
+        self.batches = 0
+        """How many batches were written."""
+        self.writes = 0
+        """How many values were written (or deleted)."""
+        self._pending: OrderedDict[
+            tuple, tuple[int, typing.Optional[str]]] = OrderedDict()
+        self._sequence = itertools.count()
+        self._writing = False
+        self._stopping = False
+        self._thread: typing.Optional[threading.Thread] = None
+        self._condition = threading.Condition()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def get(self, key: tuple) -> tuple[bool, typing.Optional[str]]:
+        """Look up the pending value of ``key``.
+
+        :param key: a ``(type, owner, key)`` tuple
+        :return: a 2-value tuple: whether a value is pending for ``key``,
+                 and its serialized value (``None`` if it is deleted)
+        """
+        with self._condition:
+            entry = self._pending.get(key)
+        if entry is None:
+            return False, None
+        return True, entry[1]
+
+    def put(self, key: tuple, value: typing.Optional[str]) -> None:
+        """Queue the serialized ``value`` of ``key``.
+
+        :param key: a ``(type, owner, key)`` tuple
+        :param value: the serialized value, or ``None`` to delete it
+        """
+        with self._condition:
+            self._pending[key] = (next(self._sequence), value)
+            self._pending.move_to_end(key)
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(
+                    target=self._run, name='SopelDB-writer', daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def flush(self, timeout: typing.Optional[float] = None) -> bool:
+        """Wait until every pending value is written.
+
+        :param timeout: how long to wait, in seconds (optional)
+        :return: ``True`` if every value is written, ``False`` on timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._writing, timeout)
+
+    def stop(self, timeout: typing.Optional[float] = None) -> None:
+        """Write every pending value, then stop the background thread.
+
+        :param timeout: how long to wait, in seconds (optional)
+        """
+        with self._condition:
+            thread = self._thread
+            self._stopping = True
+            self._condition.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._pending or self._stopping)
+                if not self._pending:
+                    self._thread = None
+                    self._condition.notify_all()
+                    return
+                batch = list(itertools.islice(
+                    self._pending.items(), self.max_batch))
+                self._writing = True
+
+            try:
+                self.db._write_batch(
+                    [(key, value) for key, (_, value) in batch])
+            except Exception:
+                LOGGER.exception(
+                    'Unable to write %d database values.', len(batch))
+            else:
+                self.batches += 1
+                self.writes += len(batch)
+
+            with self._condition:
+                for key, entry in batch:
+                    # keep values put again while this batch was written
+                    if self._pending.get(key) == entry:
+                        del self._pending[key]
+                self._writing = False
+                self._condition.notify_all()
+
+
 class SopelDB:
     """Database object class.
 
@@ -130,6 +371,17 @@ class SopelDB:
         :class:`~sopel.tools.identifiers.Identifier` when dealing with Nick or
         Channel names.
 
+    .. versionchanged:: 8.0
+
+        Values can be cached, see :attr:`cache`, and written in the
+        background, see :attr:`write_queue`.
+
+    .. versionchanged:: 8.0
+
+        SQLite databases are tuned on connect (see the ``db_sqlite_*`` core
+        settings), and the connection pool of other databases can be
+        configured.
+
     .. seealso::
 
         For any advanced usage of the ORM, refer to the
@@ -205,7 +457,14 @@ class SopelDB:
                            password=db_pass, host=db_host, port=db_port,
                            database=db_name, query=query)
 
-        self.engine = create_engine(self.url, pool_recycle=3600)
+        engine_options = {'pool_recycle': config.core.db_pool_recycle}
+        if self.type != 'sqlite':
+            if config.core.db_pool_size is not None:
+                engine_options['pool_size'] = config.core.db_pool_size
+            if config.core.db_max_overflow is not None:
+                engine_options['max_overflow'] = config.core.db_max_overflow
+
+        self.engine = create_engine(self.url, **engine_options)
         """SQLAlchemy Engine used to connect to Sopel's database.
 
         .. seealso::
@@ -230,6 +489,15 @@ class SopelDB:
         .. __: https://docs.sqlalchemy.org/en/14/changelog/migration_20.html
         """
 
+        if self.type == 'sqlite':
+            self._sqlite_pragmas = [
+                ('journal_mode', config.core.db_sqlite_journal_mode),
+                ('synchronous', config.core.db_sqlite_synchronous),
+                ('busy_timeout', config.core.db_sqlite_busy_timeout),
+                ('mmap_size', config.core.db_sqlite_mmap_size),
+            ]
+            event.listen(self.engine, 'connect', self._set_sqlite_pragmas)
+
         # Catch any errors connecting to database
         try:
             self.engine.connect()
@@ -240,9 +508,66 @@ class SopelDB:
         # Create our tables
         BASE.metadata.create_all(self.engine)
 
+        self.native_upsert = self._supports_native_upsert()
+        """Whether values are set with a single ``INSERT`` statement.
+
+        When the database supports it (SQLite 3.24+, PostgreSQL 9.5+, or
+        MySQL/MariaDB), setting a value is done with an "upsert": an
+        ``INSERT`` that updates the existing row on conflict. Otherwise, the
+        existing row is selected first, then updated or inserted.
+
+        .. versionadded:: 8.0
+        """
+
         self.ssession = scoped_session(
             sessionmaker(bind=self.engine, future=True))
 
+        self.cache: typing.Optional[DBCache] = None
+        """Cache of nick IDs and values, if enabled.
+
+        The cache is enabled by the core setting
+        :attr:`~sopel.config.core_section.CoreSection.db_cache_size`. Its
+        :attr:`~DBCache.hits`, :attr:`~DBCache.misses`, and
+        :attr:`~DBCache.hit_rate` tell how useful it is.
+
+        .. versionadded:: 8.0
+        """
+        if config.core.db_cache_size > 0:
+            self.cache = DBCache(
+                config.core.db_cache_size, config.core.db_cache_ttl)
+
+        self.write_queue: typing.Optional[DBWriteQueue] = None
+        """Background writer of values, if enabled.
+
+        The background writer is enabled by the core setting
+        :attr:`~sopel.config.core_section.CoreSection.db_async_writes`: the
+        ``set_*_value(s)`` and ``delete_*_value`` methods then return as soon
+        as the change is queued, and reading a value returns its pending
+        change if there is one.
+
+        Nick values are queued by nickname, without waiting for the database:
+        the background writer fetches (or creates) their nick ID. Until it is
+        written, a nick's pending value is read through that nickname only,
+        not through its aliases.
+
+        Other methods that modify the database (such as
+        :meth:`forget_nick_group` or :meth:`merge_nick_groups`) first wait
+        for the pending changes to be written.
+
+        .. versionadded:: 8.0
+        """
+        if config.core.db_async_writes:
+            self.write_queue = DBWriteQueue(self)
+
+    def _set_sqlite_pragmas(self, dbapi_connection, connection_record):
+        # values are validated by the core settings
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in self._sqlite_pragmas:
+                cursor.execute('PRAGMA %s = %s' % (name, value))
+        finally:
+            cursor.close()
+
     def connect(self):
         """Get a direct database connection.
 
@@ -334,6 +659,273 @@ class SopelDB:
         """
         return self.engine.execute(*args, **kwargs)
 
+    def _lookup(self, key: tuple) -> tuple[bool, typing.Any]:
+        if self.write_queue is not None:
+            found, value = self.write_queue.get(key)
+            if found:
+                return found, value
+        if self.cache is not None:
+            return self.cache.get(key)
+        return False, None
+
+    def _read_through(
+        self,
+        key: tuple,
+        fetch: typing.Callable[[], typing.Any],
+    ) -> typing.Any:
+        found, value = self._lookup(key)
+        if found:
+            return value
+
+        if self.cache is None:
+            return fetch()
+
+        version = self.cache.version
+        value = fetch()
+        self.cache.set(key, value, version)
+        return value
+
+    def _get_channel_owner(self, channel: str) -> str:
+        if self.write_queue is not None:
+            # the background writer migrates the channel's values
+            return self.make_identifier(channel).lower()
+        return self.get_channel_slug(channel)
+
+    def _flush_writes(self) -> None:
+        if self.write_queue is not None:
+            self.write_queue.flush()
+
+    def _invalidate(self, key: tuple) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(key)
+
+    def _invalidate_nick_id(self, nick_id: int) -> None:
+        if self.cache is not None:
+            self.cache.invalidate_if(lambda key, value: (
+                (key[0] == 'nick_id' and value == nick_id) or
+                (key[0] == 'nick' and key[1] == nick_id)
+            ))
+
+    def _read_values(
+        self,
+        kind: str,
+        owner: typing.Any,
+        keys: typing.List[str],
+        fetch: typing.Callable[[typing.List[str]], typing.Dict[str, str]],
+    ) -> typing.Dict[str, typing.Any]:
+        raw = {}
+        missing = []
+        for key in keys:
+            found, value = self._lookup((kind, owner, key))
+            if found:
+                raw[key] = value
+            else:
+                missing.append(key)
+
+        if missing:
+            version = self.cache.version if self.cache is not None else 0
+            fetched = fetch(missing)
+            for key in missing:
+                raw[key] = fetched.get(key)
+                if self.cache is not None:
+                    self.cache.set((kind, owner, key), raw[key], version)
+
+        return {key: _deserialize(raw[key]) for key in keys}
+
+    def _supports_native_upsert(self) -> bool:
+        dialect = self.engine.dialect
+        version = dialect.server_version_info or ()
+        if dialect.name == 'sqlite':
+            return version >= (3, 24)
+        if dialect.name == 'postgresql':
+            return version >= (9, 5)
+        return dialect.name in ('mysql', 'mariadb')
+
+    def _upsert(
+        self,
+        model,
+        owner_column: str,
+        owner: typing.Any,
+        values: typing.Mapping[str, str],
+    ):
+        rows = [
+            {owner_column: owner, 'key': key, 'value': value}
+            for key, value in values.items()
+        ]
+        dialect = self.engine.dialect.name
+        if dialect in ('mysql', 'mariadb'):
+            statement = mysql.insert(model).values(rows)
+            return statement.on_duplicate_key_update(
+                value=statement.inserted.value)
+
+        insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+        statement = insert(model).values(rows)
+        return statement.on_conflict_do_update(
+            index_elements=[getattr(model, owner_column), model.key],
+            set_={'value': statement.excluded.value},
+        )
+
+    def _fetch_values(
+        self,
+        model,
+        owner_column: str,
+        owner: typing.Any,
+        keys: typing.List[str],
+    ) -> typing.Dict[str, str]:
+        with self.session() as session:
+            rows = session.execute(
+                select(model.key, model.value)
+                .where(getattr(model, owner_column) == owner)
+                .where(model.key.in_(keys))
+            ).all()
+        return dict(rows)
+
+    def _store_values(
+        self,
+        kind: str,
+        owner: typing.Any,
+        values: typing.Mapping[str, typing.Any],
+    ) -> None:
+        pending = {
+            key: json.dumps(value, ensure_ascii=False)
+            for key, value in values.items()
+        }
+        if not pending:
+            return
+
+        if self.write_queue is not None:
+            for key, value in pending.items():
+                self.write_queue.put((kind, owner, key), value)
+            return
+
+        with self.session() as session:
+            self._write_values(session, kind, owner, pending)
+            session.commit()
+        for key in pending:
+            self._invalidate((kind, owner, key))
+
+    def _write_values(
+        self,
+        session,
+        kind: str,
+        owner: typing.Any,
+        values: typing.Mapping[str, str],
+    ) -> None:
+        model, owner_column = _VALUE_MODELS[kind]
+        if self.native_upsert:
+            session.execute(self._upsert(model, owner_column, owner, values))
+            return
+
+        pending = dict(values)
+        rows = session.execute(
+            select(model)
+            .where(getattr(model, owner_column) == owner)
+            .where(model.key.in_(list(pending)))
+        ).scalars().all()
+
+        # update existing values, then insert the others
+        for row in rows:
+            row.value = pending.pop(row.key)
+        session.add_all(
+            model(**{owner_column: owner, 'key': key, 'value': value})
+            for key, value in pending.items()
+        )
+
+    def _write_batch(
+        self,
+        batch: typing.List[tuple[tuple, typing.Optional[str]]],
+    ) -> None:
+        # nick values are queued by nickname: their nick IDs are fetched, or
+        # created, in the same transaction as the values
+        set_names = set()
+        deleted_names = set()
+        for (kind, owner, key), value in batch:
+            if kind == 'nick_name':
+                if value is None:
+                    deleted_names.add(owner)
+                else:
+                    set_names.add(owner)
+
+        # migrate channels from the old casemapping first
+        for kind, owner in set(
+            (kind, owner) for (kind, owner, _), _ in batch
+        ):
+            if kind == 'channel':
+                self.get_channel_slug(owner)
+
+        with self.session() as session:
+            nick_ids, changed = self._resolve_nick_ids(session, set_names)
+            # deleting the values of an unknown nick doesn't create it
+            found_ids, found_changed = self._resolve_nick_ids(
+                session, deleted_names - set_names, create=False)
+            nick_ids.update(found_ids)
+            changed.extend(found_changed)
+
+            # apply the changes in order: the last one of each key wins
+            values: typing.Dict[tuple, typing.Dict[str, str]] = (
+                defaultdict(dict))
+            deleted: typing.Dict[tuple, typing.Set[str]] = defaultdict(set)
+            written = []
+            for (kind, owner, key), value in batch:
+                if kind == 'nick_name':
+                    nick_id = nick_ids.get(owner.lower())
+                    if nick_id is None:
+                        continue
+                    kind, owner = 'nick', nick_id
+                written.append((kind, owner, key))
+                if value is None:
+                    values[kind, owner].pop(key, None)
+                    deleted[kind, owner].add(key)
+                else:
+                    deleted[kind, owner].discard(key)
+                    values[kind, owner][key] = value
+
+            for (kind, owner), keys in deleted.items():
+                if not keys:
+                    continue
+                model, owner_column = _VALUE_MODELS[kind]
+                session.execute(
+                    delete(model)
+                    .where(getattr(model, owner_column) == owner)
+                    .where(model.key.in_(list(keys)))
+                    .execution_options(synchronize_session=False)
+                )
+            for (kind, owner), owner_values in values.items():
+                if owner_values:
+                    self._write_values(session, kind, owner, owner_values)
+            session.commit()
+
+        for slug in changed:
+            self._invalidate(('nick_id', slug))
+        for key in written:
+            self._invalidate(key)
+
+    def _queue_nick_values(
+        self,
+        nick: str,
+        values: typing.Mapping[str, typing.Any],
+    ) -> None:
+        # the background writer fetches (or creates) the nick ID
+        name = self.make_identifier(nick)
+        for key, value in values.items():
+            self.write_queue.put(
+                ('nick_name', name, key),
+                json.dumps(value, ensure_ascii=False))
+
+    def _pending_nick_values(
+        self,
+        nick: str,
+        keys: typing.Iterable[str],
+    ) -> typing.Dict[str, typing.Optional[str]]:
+        pending = {}
+        if self.write_queue is not None:
+            name = self.make_identifier(nick)
+            for key in keys:
+                found, value = self.write_queue.get(('nick_name', name, key))
+                if found:
+                    pending[key] = value
+        return pending
+
     def get_uri(self) -> URL:
         """Return a direct URL for the database.
 
@@ -371,6 +963,19 @@ class SopelDB:
             :meth:`forget_nick_group`.
 
         """
+        slug = self.make_identifier(nick).lower()
+        key = ('nick_id', slug)
+        nick_id = self._read_through(key, lambda: self._find_nick_id(nick))
+
+        if nick_id is None:
+            if not create:
+                raise ValueError('No ID exists for the given nick')
+            nick_id = self._create_nick_id(nick)
+            self._invalidate(key)
+
+        return nick_id
+
+    def _find_nick_id(self, nick: str) -> typing.Optional[int]:
         slug = self.make_identifier(nick).lower()
         with self.session() as session:
             nickname = session.execute(
@@ -389,23 +994,94 @@ class SopelDB:
                     nickname.slug = slug
                     session.commit()
 
-            if nickname is None:  # "is /* still */ None", if Python had inline comments
-                if not create:
-                    raise ValueError('No ID exists for the given nick')
-                # Generate a new ID
-                nick_id = NickIDs()
-                session.add(nick_id)
-                session.commit()
+            if nickname is None:
+                return None
+            return nickname.nick_id
 
-                # Create a new Nickname
-                nickname = Nicknames(
-                    nick_id=nick_id.nick_id,
+    def _create_nick_id(self, nick: str) -> int:
+        slug = self.make_identifier(nick).lower()
+        with self.session() as session:
+            # Generate a new ID
+            nick_id = NickIDs()
+            session.add(nick_id)
+            session.commit()
+
+            # Create a new Nickname
+            nickname = Nicknames(
+                nick_id=nick_id.nick_id,
+                slug=slug,
+                canonical=nick,
+            )
+            session.add(nickname)
+            session.commit()
+            return nickname.nick_id
+
+    def _resolve_nick_ids(
+        self,
+        session,
+        nicks: typing.Iterable[str],
+        create: bool = True,
+    ) -> tuple[typing.Dict[str, int], typing.List[str]]:
+        # find (or create) the nick ID of each nick within the session's
+        # transaction; return the IDs by slug, and the slugs that changed
+        canonical: typing.Dict[str, str] = {}
+        for nick in nicks:
+            canonical.setdefault(self.make_identifier(nick).lower(), nick)
+
+        nick_ids: typing.Dict[str, int] = {}
+        missing = []
+        for slug in canonical:
+            found, nick_id = self._lookup(('nick_id', slug))
+            if found and nick_id is not None:
+                nick_ids[slug] = nick_id
+            else:
+                missing.append(slug)
+
+        for start in range(0, len(missing), _IN_CLAUSE_SIZE):
+            rows = session.execute(
+                select(Nicknames.slug, Nicknames.nick_id)
+                .where(Nicknames.slug.in_(
+                    missing[start:start + _IN_CLAUSE_SIZE]))
+            ).all()
+            nick_ids.update(rows)
+
+        # see if some need case-mapping migration
+        swapped = {
+            Identifier._lower_swapped(canonical[slug]): slug
+            for slug in missing
+            if slug not in nick_ids
+        }
+        changed = []
+        old_slugs = [old for old, slug in swapped.items() if old != slug]
+        for start in range(0, len(old_slugs), _IN_CLAUSE_SIZE):
+            rows = session.execute(
+                select(Nicknames)
+                .where(Nicknames.slug.in_(
+                    old_slugs[start:start + _IN_CLAUSE_SIZE]))
+            ).scalars().all()
+            for nickname in rows:
+                nickname.slug = swapped[nickname.slug]
+                nick_ids[nickname.slug] = nickname.nick_id
+                changed.append(nickname.slug)
+
+        created = [slug for slug in missing if slug not in nick_ids]
+        if created and create:
+            new_ids = [NickIDs() for _ in created]
+            session.add_all(new_ids)
+            session.flush()
+            for slug, new_id in zip(created, new_ids):
+                nick_ids[slug] = new_id.nick_id
+            session.add_all(
+                Nicknames(
+                    nick_id=nick_ids[slug],
                     slug=slug,
-                    canonical=nick,
+                    canonical=canonical[slug],
                 )
-                session.add(nickname)
-                session.commit()
-            return nickname.nick_id
+                for slug in created
+            )
+            changed.extend(created)
+
+        return nick_ids, changed
 
     def alias_nick(self, nick: str, alias: str) -> None:
         """Create an alias for a nick.
@@ -423,6 +1099,8 @@ class SopelDB:
             :meth:`unalias_nick`.
 
         """
+        # pending values of the alias must be written to its current group
+        self._flush_writes()
         slug = self.make_identifier(alias).lower()
         nick_id = self.get_nick_id(nick, create=True)
         with self.session() as session:
@@ -440,6 +1118,7 @@ class SopelDB:
             )
             session.add(nickname)
             session.commit()
+        self._invalidate(('nick_id', slug))
 
     def set_nick_value(self, nick: str, key: str, value: typing.Any) -> None:
         """Set or update a value in the key-value store for ``nick``.
@@ -453,6 +1132,11 @@ class SopelDB:
         It will be serialized to JSON before being stored and decoded
         transparently upon retrieval.
 
+        .. versionchanged:: 8.0
+
+            The value is set with a single statement when the database
+            supports it; see :attr:`native_upsert`.
+
         .. seealso::
 
             To retrieve a value set with this method, use
@@ -462,28 +1146,12 @@ class SopelDB:
             :meth:`delete_nick_value`.
 
         """
-        value = json.dumps(value, ensure_ascii=False)
-        nick_id = self.get_nick_id(nick, create=True)
-        with self.session() as session:
-            result = session.execute(
-                select(NickValues)
-                .where(NickValues.nick_id == nick_id)
-                .where(NickValues.key == key)
-            ).scalar_one_or_none()
+        if self.write_queue is not None:
+            self._queue_nick_values(nick, {key: value})
+            return
 
-            # NickValue exists, update
-            if result:
-                result.value = value
-                session.commit()
-            # DNE - Insert
-            else:
-                new_nickvalue = NickValues(
-                    nick_id=nick_id,
-                    key=key,
-                    value=value,
-                )
-                session.add(new_nickvalue)
-                session.commit()
+        nick_id = self.get_nick_id(nick, create=True)
+        self._store_values('nick', nick_id, {key: value})
 
     def delete_nick_value(self, nick: str, key: str) -> None:
         """Delete a value from the key-value store for ``nick``.
@@ -500,6 +1168,11 @@ class SopelDB:
             :meth:`get_nick_value`.
 
         """
+        if self.write_queue is not None:
+            self.write_queue.put(
+                ('nick_name', self.make_identifier(nick), key), None)
+            return
+
         try:
             nick_id = self.get_nick_id(nick)
         except ValueError:
@@ -516,6 +1189,7 @@ class SopelDB:
             if result:
                 session.delete(result)
                 session.commit()
+        self._invalidate(('nick', nick_id, key))
 
     def get_nick_value(
         self,
@@ -544,21 +1218,177 @@ class SopelDB:
             :meth:`delete_nick_value`.
 
         """
-        slug = self.make_identifier(nick).lower()
+        if self.cache is None and self.write_queue is None:
+            slug = self.make_identifier(nick).lower()
+            with self.session() as session:
+                result = session.execute(
+                    select(NickValues.value)
+                    .where(Nicknames.nick_id == NickValues.nick_id)
+                    .where(Nicknames.slug == slug)
+                    .where(NickValues.key == key)
+                ).scalar_one_or_none()
+        else:
+            pending = self._pending_nick_values(nick, [key])
+            if pending:
+                result = pending[key]
+            else:
+                try:
+                    nick_id = self.get_nick_id(nick)
+                except ValueError:
+                    result = None
+                else:
+                    result = self._read_through(
+                        ('nick', nick_id, key),
+                        lambda: self._fetch_nick_value(nick_id, key))
+
+        if result is None and default is not None:
+            result = default
+
+        return _deserialize(result)
+
+    def _fetch_nick_value(self, nick_id: int, key: str) -> typing.Optional[str]:
         with self.session() as session:
-            result = session.execute(
-                select(NickValues)
-                .where(Nicknames.nick_id == NickValues.nick_id)
-                .where(Nicknames.slug == slug)
+            return session.execute(
+                select(NickValues.value)
+                .where(NickValues.nick_id == nick_id)
                 .where(NickValues.key == key)
             ).scalar_one_or_none()
 
-            if result is not None:
-                result = result.value
-            elif default is not None:
-                result = default
+    def set_nick_values(
+        self,
+        nick: str,
+        values: typing.Mapping[str, typing.Any],
+    ) -> None:
+        """Set or update several values in the key-value store for ``nick``.
+
+        :param nick: the nickname with which to associate the ``values``
+        :param values: a mapping of keys to their values
+        :raise ~sqlalchemy.exc.SQLAlchemyError: if there is a database error
+
+        This works like :meth:`set_nick_value` for each item of ``values``,
+        but the nick ID is fetched once, and every value is written in a
+        single transaction.
+
+        .. versionadded:: 8.0
 
-            return _deserialize(result)
+        .. seealso::
+
+            To retrieve several values at once, use :meth:`get_nick_values`.
+
+        """
+        if self.write_queue is not None:
+            self._queue_nick_values(nick, values)
+            return
+
+        nick_id = self.get_nick_id(nick, create=True)
+        self._store_values('nick', nick_id, values)
+
+    def set_many_nick_values(
+        self,
+        nick_values: typing.Mapping[str, typing.Mapping[str, typing.Any]],
+    ) -> None:
+        """Set or update values in the key-value store for several nicks.
+
+        :param nick_values: a mapping of nicknames to a mapping of keys to
+                            their values
+        :raise ~sqlalchemy.exc.SQLAlchemyError: if there is a database error
+
+        This works like :meth:`set_nick_values` for each nick, but the nick
+        IDs are fetched (or created) and every value is written in a single
+        transaction. When several nicks of ``nick_values`` belong to the same
+        group, the values of the last one win.
+
+        .. versionadded:: 8.0
+
+        .. seealso::
+
+            To set values for one nick only, use :meth:`set_nick_values`.
+
+        """
+        if self.write_queue is not None:
+            for nick, values in nick_values.items():
+                self._queue_nick_values(nick, values)
+            return
+
+        pending = {
+            nick: {
+                key: json.dumps(value, ensure_ascii=False)
+                for key, value in values.items()
+            }
+            for nick, values in nick_values.items()
+            if values
+        }
+        if not pending:
+            return
+
+        with self.session() as session:
+            nick_ids, changed = self._resolve_nick_ids(session, pending)
+            by_nick_id: typing.Dict[int, typing.Dict[str, str]] = {}
+            for nick, values in pending.items():
+                nick_id = nick_ids[self.make_identifier(nick).lower()]
+                by_nick_id.setdefault(nick_id, {}).update(values)
+
+            for nick_id, values in by_nick_id.items():
+                self._write_values(session, 'nick', nick_id, values)
+            session.commit()
+
+        for slug in changed:
+            self._invalidate(('nick_id', slug))
+        for nick_id, values in by_nick_id.items():
+            for key in values:
+                self._invalidate(('nick', nick_id, key))
+
+    def get_nick_values(
+        self,
+        nick: str,
+        keys: typing.Iterable[str],
+    ) -> typing.Dict[str, typing.Any]:
+        """Get several values from the key-value store for ``nick``.
+
+        :param nick: the nickname whose values to access
+        :param keys: the names by which the desired values were saved
+        :return: a ``dict`` of each key to its value, or to ``None`` if it
+                 does not have a value set
+        :raise ~sqlalchemy.exc.SQLAlchemyError: if there is a database error
+
+        This works like :meth:`get_nick_value` for each of the ``keys``, but
+        all values are fetched with one query.
+
+        .. versionadded:: 8.0
+
+        .. seealso::
+
+            To set several values at once, use :meth:`set_nick_values`.
+
+        """
+        keys = list(keys)
+        if self.cache is None and self.write_queue is None:
+            slug = self.make_identifier(nick).lower()
+            with self.session() as session:
+                rows = session.execute(
+                    select(NickValues.key, NickValues.value)
+                    .where(Nicknames.nick_id == NickValues.nick_id)
+                    .where(Nicknames.slug == slug)
+                    .where(NickValues.key.in_(keys))
+                ).all()
+            raw = dict(rows)
+            return {key: _deserialize(raw.get(key)) for key in keys}
+
+        pending = self._pending_nick_values(nick, keys)
+        others = [key for key in keys if key not in pending]
+        try:
+            nick_id = self.get_nick_id(nick)
+        except ValueError:
+            values = dict.fromkeys(others)
+        else:
+            values = self._read_values(
+                'nick', nick_id, others,
+                lambda missing: self._fetch_values(
+                    NickValues, 'nick_id', nick_id, missing))
+
+        values.update(
+            (key, _deserialize(value)) for key, value in pending.items())
+        return {key: values[key] for key in keys}
 
     def unalias_nick(self, alias: str) -> None:
         """Remove an alias.
@@ -575,6 +1405,7 @@ class SopelDB:
             To *add* an alias for a nick, use :meth:`alias_nick`.
 
         """
+        self._flush_writes()
         slug = self.make_identifier(alias).lower()
         nick_id = self.get_nick_id(alias)
         with self.session() as session:
@@ -590,6 +1421,7 @@ class SopelDB:
                 .execution_options(synchronize_session="fetch")
             )
             session.commit()
+        self._invalidate(('nick_id', slug))
 
     def forget_nick_group(self, nick: str) -> None:
         """Remove a nickname, all of its aliases, and all of its stored values.
@@ -604,6 +1436,7 @@ class SopelDB:
             you want to do this.
 
         """
+        self._flush_writes()
         nick_id = self.get_nick_id(nick)
         with self.session() as session:
             session.execute(
@@ -617,6 +1450,7 @@ class SopelDB:
                 .execution_options(synchronize_session="fetch")
             )
             session.commit()
+        self._invalidate_nick_id(nick_id)
 
     @deprecated(
         version='8.0',
@@ -646,6 +1480,7 @@ class SopelDB:
         Plugins which define their own tables relying on the nick table will
         need to handle their own merging separately.
         """
+        self._flush_writes()
         first_id = self.get_nick_id(first_nick, create=True)
         second_id = self.get_nick_id(second_nick, create=True)
         with self.session() as session:
@@ -678,6 +1513,7 @@ class SopelDB:
                 .execution_options(synchronize_session="fetch")
             )
             session.commit()
+        self._invalidate_nick_id(second_id)
 
     # CHANNEL FUNCTIONS
 
@@ -723,6 +1559,11 @@ class SopelDB:
         It will be serialized to JSON before being stored and decoded
         transparently upon retrieval.
 
+        .. versionchanged:: 8.0
+
+            The value is set with a single statement when the database
+            supports it; see :attr:`native_upsert`.
+
         .. seealso::
 
             To retrieve a value set with this method, use
@@ -732,28 +1573,8 @@ class SopelDB:
             :meth:`delete_channel_value`.
 
         """
-        channel = self.get_channel_slug(channel)
-        value = json.dumps(value, ensure_ascii=False)
-        with self.session() as session:
-            result = session.execute(
-                select(ChannelValues)
-                .where(ChannelValues.channel == channel)
-                .where(ChannelValues.key == key)
-            ).scalar_one_or_none()
-
-            # ChannelValue exists, update
-            if result:
-                result.value = value
-                session.commit()
-            # DNE - Insert
-            else:
-                new_channelvalue = ChannelValues(
-                    channel=channel,
-                    key=key,
-                    value=value,
-                )
-                session.add(new_channelvalue)
-                session.commit()
+        channel = self._get_channel_owner(channel)
+        self._store_values('channel', channel, {key: value})
 
     def delete_channel_value(self, channel: str, key: str) -> None:
         """Delete a value from the key-value store for ``channel``.
@@ -770,7 +1591,11 @@ class SopelDB:
             :meth:`get_channel_value`.
 
         """
-        channel = self.get_channel_slug(channel)
+        channel = self._get_channel_owner(channel)
+        if self.write_queue is not None:
+            self.write_queue.put(('channel', channel, key), None)
+            return
+
         with self.session() as session:
             session.execute(
                 delete(ChannelValues)
@@ -780,6 +1605,7 @@ class SopelDB:
                 ).execution_options(synchronize_session="fetch")
             )
             session.commit()
+        self._invalidate(('channel', channel, key))
 
     def get_channel_value(
         self,
@@ -808,18 +1634,81 @@ class SopelDB:
             :meth:`delete_channel_value`.
 
         """
+        result = self._read_through(
+            ('channel', self.make_identifier(channel).lower(), key),
+            lambda: self._fetch_channel_value(channel, key))
+
+        if result is None and default is not None:
+            result = default
+
+        return _deserialize(result)
+
+    def _fetch_channel_value(
+        self,
+        channel: str,
+        key: str,
+    ) -> typing.Optional[str]:
         channel = self.get_channel_slug(channel)
         with self.session() as session:
-            result = session.execute(
-                select(ChannelValues)
+            return session.execute(
+                select(ChannelValues.value)
                 .where(ChannelValues.channel == channel)
                 .where(ChannelValues.key == key)
             ).scalar_one_or_none()
-            if result is not None:
-                result = result.value
-            elif default is not None:
-                result = default
-            return _deserialize(result)
+
+    def set_channel_values(
+        self,
+        channel: str,
+        values: typing.Mapping[str, typing.Any],
+    ) -> None:
+        """Set or update several values in the key-value store for ``channel``.
+
+        :param channel: the channel with which to associate the ``values``
+        :param values: a mapping of keys to their values
+        :raise ~sqlalchemy.exc.SQLAlchemyError: if there is a database error
+
+        This works like :meth:`set_channel_value` for each item of ``values``,
+        but every value is written in a single transaction.
+
+        .. versionadded:: 8.0
+
+        .. seealso::
+
+            To retrieve several values at once, use
+            :meth:`get_channel_values`.
+
+        """
+        channel = self._get_channel_owner(channel)
+        self._store_values('channel', channel, values)
+
+    def get_channel_values(
+        self,
+        channel: str,
+        keys: typing.Iterable[str],
+    ) -> typing.Dict[str, typing.Any]:
+        """Get several values from the key-value store for ``channel``.
+
+        :param channel: the channel whose values to access
+        :param keys: the names by which the desired values were saved
+        :return: a ``dict`` of each key to its value, or to ``None`` if it
+                 does not have a value set
+        :raise ~sqlalchemy.exc.SQLAlchemyError: if there is a database error
+
+        This works like :meth:`get_channel_value` for each of the ``keys``,
+        but all values are fetched with one query.
+
+        .. versionadded:: 8.0
+
+        .. seealso::
+
+            To set several values at once, use :meth:`set_channel_values`.
+
+        """
+        return self._read_values(
+            'channel', self.make_identifier(channel).lower(), list(keys),
+            lambda missing: self._fetch_values(
+                ChannelValues, 'channel', self.get_channel_slug(channel),
+                missing))
 
     def forget_channel(self, channel: str) -> None:
         """Remove all of a channel's stored values.
@@ -832,6 +1721,7 @@ class SopelDB:
             This is a Nuclear Option. Be *very* sure that you want to do it.
 
         """
+        self._flush_writes()
         channel = self.get_channel_slug(channel)
         with self.session() as session:
             session.execute(
@@ -839,6 +1729,9 @@ class SopelDB:
                 .where(ChannelValues.channel == channel)
             )
             session.commit()
+        if self.cache is not None:
+            self.cache.invalidate_if(
+                lambda key, value: key[:2] == ('channel', channel))
 
     # PLUGIN FUNCTIONS
 
@@ -859,6 +1752,11 @@ class SopelDB:
         It will be serialized to JSON before being stored and decoded
         transparently upon retrieval.
 
+        .. versionchanged:: 8.0
+
+            The value is set with a single statement when the database
+            supports it; see :attr:`native_upsert`.
+
         .. seealso::
 
             To retrieve a value set with this method, use
@@ -869,22 +1767,7 @@ class SopelDB:
 
         """
         plugin = plugin.lower()
-        value = json.dumps(value, ensure_ascii=False)
-        with self.session() as session:
-            result = session.execute(
-                select(PluginValues)
-                .where(PluginValues.plugin == plugin)
-                .where(PluginValues.key == key)
-            ).scalar_one_or_none()
-            # PluginValue exists, update
-            if result:
-                result.value = value
-                session.commit()
-            # DNE - Insert
-            else:
-                new_pluginvalue = PluginValues(plugin=plugin, key=key, value=value)
-                session.add(new_pluginvalue)
-                session.commit()
+        self._store_values('plugin', plugin, {key: value})
 
     def delete_plugin_value(self, plugin: str, key: str) -> None:
         """Delete a value from the key-value store for ``plugin``.
@@ -902,6 +1785,10 @@ class SopelDB:
 
         """
         plugin = plugin.lower()
+        if self.write_queue is not None:
+            self.write_queue.put(('plugin', plugin, key), None)
+            return
+
         with self.session() as session:
             result = session.execute(
                 select(PluginValues)
@@ -912,6 +1799,7 @@ class SopelDB:
             if result:
                 session.delete(result)
                 session.commit()
+        self._invalidate(('plugin', plugin, key))
 
     def get_plugin_value(
         self,
@@ -941,18 +1829,79 @@ class SopelDB:
 
         """
         plugin = plugin.lower()
+        result = self._read_through(
+            ('plugin', plugin, key),
+            lambda: self._fetch_plugin_value(plugin, key))
+
+        if result is None and default is not None:
+            result = default
+
+        return _deserialize(result)
+
+    def _fetch_plugin_value(
+        self,
+        plugin: str,
+        key: str,
+    ) -> typing.Optional[str]:
         with self.session() as session:
-            result = session.execute(
-                select(PluginValues)
+            return session.execute(
+                select(PluginValues.value)
                 .where(PluginValues.plugin == plugin)
                 .where(PluginValues.key == key)
             ).scalar_one_or_none()
 
-            if result is not None:
-                result = result.value
-            elif default is not None:
-                result = default
-            return _deserialize(result)
+    def set_plugin_values(
+        self,
+        plugin: str,
+        values: typing.Mapping[str, typing.Any],
+    ) -> None:
+        """Set or update several values in the key-value store for ``plugin``.
+
+        :param plugin: the plugin name with which to associate the ``values``
+        :param values: a mapping of keys to their values
+        :raise ~sqlalchemy.exc.SQLAlchemyError: if there is a database error
+
+        This works like :meth:`set_plugin_value` for each item of ``values``,
+        but every value is written in a single transaction.
+
+        .. versionadded:: 8.0
+
+        .. seealso::
+
+            To retrieve several values at once, use :meth:`get_plugin_values`.
+
+        """
+        plugin = plugin.lower()
+        self._store_values('plugin', plugin, values)
+
+    def get_plugin_values(
+        self,
+        plugin: str,
+        keys: typing.Iterable[str],
+    ) -> typing.Dict[str, typing.Any]:
+        """Get several values from the key-value store for ``plugin``.
+
+        :param plugin: the plugin name whose values to access
+        :param keys: the names by which the desired values were saved
+        :return: a ``dict`` of each key to its value, or to ``None`` if it
+                 does not have a value set
+        :raise ~sqlalchemy.exc.SQLAlchemyError: if there is a database error
+
+        This works like :meth:`get_plugin_value` for each of the ``keys``, but
+        all values are fetched with one query.
+
+        .. versionadded:: 8.0
+
+        .. seealso::
+
+            To set several values at once, use :meth:`set_plugin_values`.
+
+        """
+        plugin = plugin.lower()
+        return self._read_values(
+            'plugin', plugin, list(keys),
+            lambda missing: self._fetch_values(
+                PluginValues, 'plugin', plugin, missing))
 
     def forget_plugin(self, plugin: str) -> None:
         """Remove all of a plugin's stored values.
@@ -965,12 +1914,16 @@ class SopelDB:
             This is a Nuclear Option. Be *very* sure that you want to do it.
 
         """
+        self._flush_writes()
         plugin = plugin.lower()
         with self.session() as session:
             session.execute(
                 delete(PluginValues).where(PluginValues.plugin == plugin)
             )
             session.commit()
+        if self.cache is not None:
+            self.cache.invalidate_if(
+                lambda key, value: key[:2] == ('plugin', plugin))
 
     # NICK AND CHANNEL FUNCTIONS
 
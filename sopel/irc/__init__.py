@@ -29,7 +29,6 @@ from datetime import datetime
 import logging
 import os
 import threading
-import time
 from typing import (
     Any,
     Callable,
@@ -44,6 +43,7 @@ from typing import (
 
 from sopel import tools, trigger
 from sopel.tools import identifiers
+from . import flood
 from .backends import AsyncioBackend
 from .isupport import ISupport
 from .utils import CapReq, safe
@@ -54,7 +54,7 @@ if TYPE_CHECKING:
     from .utils import MyInfo
 
 
-__all__ = ['abstract_backends', 'backends', 'utils']
+__all__ = ['abstract_backends', 'backends', 'flood', 'utils']
 
 LOGGER = logging.getLogger(__name__)
 ERR_BACKEND_NOT_INITIALIZED = 'Backend not initialized; is the bot running?'
@@ -67,6 +67,9 @@ class AbstractBot(abc.ABC):
         self._user: str = settings.core.user
         self._name: str = settings.core.name
         self._isupport = ISupport()
+        self._identifier_context: Tuple[
+            Optional[ISupport], identifiers.Casemapping, tuple,
+        ] = (None, identifiers.rfc1459_lower, identifiers.DEFAULT_CHANTYPES)
         self._myinfo: Optional[MyInfo] = None
         self._nick: identifiers.Identifier = self.make_identifier(
             settings.core.nick)
@@ -87,6 +90,8 @@ class AbstractBot(abc.ABC):
         self.last_error_timestamp: Optional[datetime] = None
         self.error_count = 0
         self.stack: Dict[identifiers.Identifier, Dict[str, Any]] = {}
+        self.flood_scheduler = flood.FloodScheduler(self)
+        """Per-recipient flood protection of messages sent with :meth:`say`."""
         self.hasquit = False
         self.wantsrestart = False
         self.last_raw_line = ''  # last raw line received
@@ -144,16 +149,31 @@ class AbstractBot(abc.ABC):
     # Utility
 
     def make_identifier(self, name: str) -> identifiers.Identifier:
-        """Instantiate an Identifier using the bot's context."""
-        casemapping = {
-            'ascii': identifiers.ascii_lower,
-            'rfc1459': identifiers.rfc1459_lower,
-            'rfc1459-strict': identifiers.rfc1459_strict_lower,
-        }.get(self.isupport.get('CASEMAPPING'), identifiers.rfc1459_lower)
-        chantypes = (
-            self.isupport.get('CHANTYPES', identifiers.DEFAULT_CHANTYPES))
-
-        return identifiers.Identifier(
+        """Instantiate an Identifier using the bot's context.
+
+        .. versionchanged:: 8.0
+
+            Identifiers are interned: the same object is returned for the
+            same name, as long as it is used somewhere, and as long as the
+            server's ``CASEMAPPING`` and ``CHANTYPES`` don't change. See
+            :meth:`Identifier.interned
+            <sopel.tools.identifiers.Identifier.interned>`.
+
+        """
+        isupport, casemapping, chantypes = self._identifier_context
+        if isupport is not self.isupport:
+            # ISUPPORT changed: update the context shared by identifiers
+            isupport = self.isupport
+            casemapping = {
+                'ascii': identifiers.ascii_lower,
+                'rfc1459': identifiers.rfc1459_lower,
+                'rfc1459-strict': identifiers.rfc1459_strict_lower,
+            }.get(isupport.get('CASEMAPPING'), identifiers.rfc1459_lower)
+            chantypes = (
+                isupport.get('CHANTYPES', identifiers.DEFAULT_CHANTYPES))
+            self._identifier_context = (isupport, casemapping, chantypes)
+
+        return identifiers.Identifier.interned(
             name,
             casemapping=casemapping,
             chantypes=chantypes,
@@ -243,6 +263,10 @@ class AbstractBot(abc.ABC):
             ca_certs=self.settings.core.ca_certs,
             ssl_ciphers=self.settings.core.ssl_ciphers,
             ssl_minimum_version=self.settings.core.ssl_minimum_version,
+            # send rate limits
+            send_rate_lines=self.settings.core.send_rate_lines,
+            send_rate_bytes=self.settings.core.send_rate_bytes,
+            send_burst_lines=self.settings.core.send_burst_lines,
         )
 
     def run(self, host: str, port: int = 6667) -> None:
@@ -610,16 +634,29 @@ class AbstractBot(abc.ABC):
 
         self.backend.send_kick(channel, nick, reason=text)
 
-    def notice(self, text: str, dest: str) -> None:
+    def notice(
+        self,
+        text: str,
+        dest: str,
+        priority: int = flood.PRIORITY_NORMAL,
+    ) -> None:
         """Send an IRC NOTICE to a user or channel (``dest``).
 
         :param text: the text to send in the NOTICE
         :param dest: the destination of the NOTICE
+        :param priority: priority of the NOTICE when it has to wait for the
+                         flood protection (optional)
+
+        .. versionchanged:: 8.0
+
+            Notices go through the same flood protection as :meth:`say`, and
+            the ``priority`` parameter was added.
+
         """
         if self.backend is None:
             raise RuntimeError(ERR_BACKEND_NOT_INITIALIZED)
 
-        self.backend.send_notice(dest, text)
+        self.flood_scheduler.submit(dest, text, priority, 'NOTICE')
 
     def part(self, channel: str, msg: Optional[str] = None) -> None:
         """Leave a channel.
@@ -664,6 +701,7 @@ class AbstractBot(abc.ABC):
         dest: str,
         reply_to: str,
         notice: bool = False,
+        priority: int = flood.PRIORITY_HIGH,
     ) -> None:
         """Send a PRIVMSG to a user or channel, prepended with ``reply_to``.
 
@@ -672,17 +710,26 @@ class AbstractBot(abc.ABC):
         :param reply_to: the nickname that the reply will be prepended with
         :param notice: whether to send the reply as a ``NOTICE`` or not,
                        defaults to ``False``
+        :param priority: priority of the reply when it has to wait for the
+                         flood protection; defaults to
+                         :data:`~sopel.irc.flood.PRIORITY_HIGH`
 
         If ``notice`` is ``True``, send a ``NOTICE`` rather than a ``PRIVMSG``.
 
         The same loop detection and length restrictions apply as with
         :meth:`say`, though automatic message splitting is not available.
+
+        .. versionchanged:: 8.0
+
+            Replies jump ahead of other queued messages by default; the
+            ``priority`` parameter was added.
+
         """
         text = '%s: %s' % (reply_to, text)
         if notice:
-            self.notice(text, dest)
+            self.notice(text, dest, priority)
         else:
-            self.say(text, dest)
+            self.say(text, dest, priority=priority)
 
     def say(
         self,
@@ -691,6 +738,7 @@ class AbstractBot(abc.ABC):
         max_messages: int = 1,
         truncation: str = '',
         trailing: str = '',
+        priority: int = flood.PRIORITY_NORMAL,
     ) -> None:
         """Send a ``PRIVMSG`` to a user or channel.
 
@@ -703,6 +751,10 @@ class AbstractBot(abc.ABC):
                            ``max_messages`` is greater than 1 (optional)
         :param trailing: string to append after ``text`` and (if used)
                          ``truncation`` (optional)
+        :param priority: priority of the message when it has to wait for the
+                         flood protection; see
+                         :data:`~sopel.irc.flood.PRIORITY_HIGH` and
+                         :data:`~sopel.irc.flood.PRIORITY_LOW` (optional)
 
         By default, this will attempt to send the entire ``text`` in one
         message. If the text is too long for the server, it may be truncated.
@@ -755,6 +807,14 @@ class AbstractBot(abc.ABC):
 
             The ``truncation`` and ``trailing`` parameters.
 
+        .. versionchanged:: 8.0
+
+            Messages are sent by a :class:`~sopel.irc.flood.FloodScheduler`:
+            when the flood protection applies, this method doesn't wait
+            anymore, and the message is queued for its recipient instead.
+            Messages to other recipients are not delayed. The ``priority``
+            parameter was added.
+
         """
         if self.backend is None:
             raise RuntimeError(ERR_BACKEND_NOT_INITIALIZED)
@@ -782,80 +842,16 @@ class AbstractBot(abc.ABC):
             # its length is included when determining if truncation happened above
             text += trailing
 
-        flood_max_wait = self.settings.core.flood_max_wait
-        flood_burst_lines = self.settings.core.flood_burst_lines
-        flood_refill_rate = self.settings.core.flood_refill_rate
-        flood_empty_wait = self.settings.core.flood_empty_wait
-
-        flood_text_length = self.settings.core.flood_text_length
-        flood_penalty_ratio = self.settings.core.flood_penalty_ratio
-
-        with self.sending:
-            recipient_id = self.make_identifier(recipient)
-            recipient_stack = self.stack.setdefault(recipient_id, {
-                'messages': [],
-                'flood_left': flood_burst_lines,
-            })
-
-            if recipient_stack['messages']:
-                elapsed = time.time() - recipient_stack['messages'][-1][0]
-            else:
-                # Default to a high enough value that we won't care.
-                # Five minutes should be enough not to matter anywhere below.
-                elapsed = 300
-
-            # If flood bucket is empty, refill the appropriate number of lines
-            # based on how long it's been since our last message to recipient
-            if not recipient_stack['flood_left']:
-                recipient_stack['flood_left'] = min(
-                    flood_burst_lines,
-                    int(elapsed) * flood_refill_rate)
-
-            # If it's too soon to send another message, wait
-            if not recipient_stack['flood_left']:
-                penalty = 0
-
-                if flood_penalty_ratio > 0:
-                    penalty_ratio = flood_text_length * flood_penalty_ratio
-                    text_length_overflow = float(
-                        max(0, len(text) - flood_text_length))
-                    penalty = text_length_overflow / penalty_ratio
-
-                # Maximum wait time is 2 sec by default
-                initial_wait_time = flood_empty_wait + penalty
-                wait = min(initial_wait_time, flood_max_wait)
-                if elapsed < wait:
-                    sleep_time = wait - elapsed
-                    LOGGER.debug(
-                        'Flood protection wait time: %.3fs; '
-                        'elapsed time: %.3fs; '
-                        'initial wait time (limited to %.3fs): %.3fs '
-                        '(including %.3fs of penalty).',
-                        sleep_time,
-                        elapsed,
-                        flood_max_wait,
-                        initial_wait_time,
-                        penalty,
-                    )
-                    time.sleep(sleep_time)
-
-            # Loop detection
-            messages = [m[1] for m in recipient_stack['messages'][-8:]]
-
-            # If what we're about to send repeated at least 5 times in the last
-            # two minutes, replace it with '...'
-            if messages.count(text) >= 5 and elapsed < 120:
-                text = '...'
-                if messages.count('...') >= 3:
-                    # If we've already said '...' 3 times, discard message
-                    return
-
-            self.backend.send_privmsg(recipient, text)
-            recipient_stack['flood_left'] = max(0, recipient_stack['flood_left'] - 1)
-            recipient_stack['messages'].append((time.time(), safe(text)))
-            recipient_stack['messages'] = recipient_stack['messages'][-10:]
+        self.flood_scheduler.submit(recipient, text, priority)
 
         # Now that we've sent the first part, we need to send the rest if
         # requested. Doing so recursively seems simpler than iteratively.
         if max_messages > 1 and excess:
-            self.say(excess, recipient, max_messages - 1, truncation, trailing)
+            self.say(
+                excess,
+                recipient,
+                max_messages - 1,
+                truncation,
+                trailing,
+                priority,
+            )
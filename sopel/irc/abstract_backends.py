@@ -4,7 +4,10 @@
 from __future__ import annotations
 
 import abc
-from typing import Optional, TYPE_CHECKING
+import asyncio
+from concurrent import futures
+import time
+from typing import Any, Callable, Coroutine, Optional, TYPE_CHECKING
 
 from .utils import safe
 
@@ -62,6 +65,51 @@ class AbstractIRCBackend(abc.ABC):
         thread-safe way.
         """
 
+    def run_coroutine(self, coro: Coroutine) -> futures.Future:
+        """Run a coroutine for the bot, such as an asynchronous rule.
+
+        :param coro: the coroutine to run
+        :return: a future for the result of the coroutine
+
+        By default, the coroutine runs to completion in its own event loop
+        before this method returns. A backend running an event loop should
+        override this method to schedule the coroutine on its loop instead.
+
+        .. versionadded:: 8.0
+        """
+        future: futures.Future[Any] = futures.Future()
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(asyncio.run(coro))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+    def call_later(
+        self,
+        delay: float,
+        callback: Callable[..., Any],
+        *args: Any,
+    ) -> None:
+        """Call ``callback(*args)`` in ``delay`` seconds.
+
+        :param delay: number of seconds to wait before the call
+        :param callback: the function to call
+        :param args: the arguments of the call
+
+        By default, this waits in the current thread before the call, and
+        returns once ``callback`` is done. A backend running an event loop
+        should override this method to schedule the call on its loop
+        instead, and return immediately.
+
+        This is used by the bot to send messages delayed by its flood
+        protection.
+
+        .. versionadded:: 8.0
+        """
+        time.sleep(delay)
+        callback(*args)
+
     def decode_line(self, line: bytes) -> str:
         """Decode a raw IRC line from ``bytes`` to ``str``."""
         # We can't trust clients to pass valid Unicode.
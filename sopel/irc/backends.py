@@ -4,12 +4,26 @@
 from __future__ import annotations
 
 import asyncio
+import collections
+from concurrent import futures
 import logging
 import signal
 import ssl
 import threading
-from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
-
+import time
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+from . import flood
 from .abstract_backends import AbstractIRCBackend
 
 
@@ -29,6 +43,12 @@ RESTART_SIGNALS = [
     for name in ['SIGUSR2', 'SIGILL']
     if hasattr(signal, name)
 ]
+PRIORITY_COMMANDS = frozenset((b'PONG',))
+"""Commands sent ahead of the outbound queue, exempt from the send rate limits.
+
+A late ``PONG`` gets the bot disconnected. Other commands, including
+``QUIT``, are sent in order, so the lines queued before them are not lost.
+"""
 
 
 class AsyncioBackend(AbstractIRCBackend):
@@ -56,6 +76,24 @@ class AsyncioBackend(AbstractIRCBackend):
                     ``verify_ssl`` is ``False``
     :param ssl_ciphers: the OpenSSL cipher suites to use
     :param ssl_minimum_version: the lowest SSL/TLS version to accept
+    :param send_rate_lines: maximum number of lines sent per second; ``0``
+                            for no limit
+    :param send_rate_bytes: maximum number of bytes sent per second; ``0``
+                            for no limit
+    :param send_burst_lines: number of lines that can be sent at once before
+                             the rate limits apply
+
+    Lines sent with :meth:`irc_send` are put in an outbound queue, from any
+    thread, and written by the event loop: every line queued before the loop
+    gets to it is written at once, with a single flush of the connection.
+    See :meth:`get_send_queue_stats` for metrics about this queue.
+
+    Whatever their command, lines leave the queue no faster than the send
+    rate limits allow (see :class:`sopel.irc.flood.RateLimiter`); the other
+    lines wait in the queue, in order, without blocking the event loop.
+    Lines of a command in :data:`PRIORITY_COMMANDS` skip the queue: they are
+    written as soon as the event loop gets to them, and don't count toward
+    the rate limits.
     """
     def __init__(
         self,
@@ -72,6 +110,9 @@ class AsyncioBackend(AbstractIRCBackend):
         ca_certs: Optional[str] = None,
         ssl_ciphers: Optional[List[str]] = None,
         ssl_minimum_version: ssl.TLSVersion = ssl.TLSVersion.TLSv1_2,
+        send_rate_lines: float = 0,
+        send_rate_bytes: float = 0,
+        send_burst_lines: int = 1,
         **kwargs,
     ):
         super().__init__(bot)
@@ -101,6 +142,23 @@ class AsyncioBackend(AbstractIRCBackend):
         self._writer: Optional[asyncio.StreamWriter] = None
         self._reader: Optional[asyncio.StreamReader] = None
 
+        # outbound queue
+        self._send_queue: Deque[bytes] = collections.deque()
+        self._priority_queue: Deque[bytes] = collections.deque()
+        self._send_lock = threading.Lock()
+        self._flush_pending: bool = False
+        self._flush_task: Optional[asyncio.Task] = None
+        self._send_limiter = flood.RateLimiter(
+            send_rate_lines, send_rate_bytes, send_burst_lines)
+        self._send_stats: Dict[str, Any] = {
+            'peak': 0,
+            'flushes': 0,
+            'lines': 0,
+            'bytes': 0,
+            'throttled': 0,
+            'throttled_time': 0.0,
+        }
+
         # connection tasks
         self._read_task: Optional[asyncio.Task] = None
         self._ping_task: Optional[asyncio.TimerHandle] = None
@@ -169,10 +227,178 @@ class AsyncioBackend(AbstractIRCBackend):
         if self._loop is None:
             raise RuntimeError('EventLoop not initialized.')
 
-        if threading.current_thread() is threading.main_thread():
-            self._loop.create_task(self.send(data))
-        else:
-            asyncio.run_coroutine_threadsafe(self.send(data), self._loop)
+        command = data.split(b' ', 1)[0].upper()
+        with self._send_lock:
+            if command in PRIORITY_COMMANDS:
+                self._priority_queue.append(data)
+            else:
+                self._send_queue.append(data)
+            depth = len(self._send_queue) + len(self._priority_queue)
+            if depth > self._send_stats['peak']:
+                self._send_stats['peak'] = depth
+            if command in PRIORITY_COMMANDS:
+                # don't wait for the flush task and its rate limits
+                self._loop.call_soon_threadsafe(self._write_priority)
+                return
+            if self._flush_pending:
+                # the loop will get to it
+                return
+            self._flush_pending = True
+
+        self._loop.call_soon_threadsafe(self._start_flush)
+
+    def get_send_queue_stats(self) -> Dict[str, Any]:
+        """Get metrics about the outbound queue.
+
+        :return: a new dict of metrics
+
+        The metrics are:
+
+        * ``pending``: number of lines waiting to be written
+        * ``peak``: highest number of lines waiting at the same time
+        * ``flushes``: number of times lines were written and flushed
+        * ``lines``: number of lines written
+        * ``bytes``: number of bytes written
+        * ``throttled``: number of times the send rate limits delayed a line
+        * ``throttled_time``: total time spent waiting for the send rate
+          limits, in seconds
+
+        The average number of lines written per flush is ``lines / flushes``.
+        """
+        with self._send_lock:
+            stats = dict(self._send_stats)
+            stats['pending'] = (
+                len(self._send_queue) + len(self._priority_queue))
+        return stats
+
+    def _start_flush(self) -> None:
+        # called by the event loop, once per batch of queued lines
+        self._flush_task = asyncio.create_task(self._flush())
+
+    def _write_priority(self) -> None:
+        # called by the event loop: write priority lines right away, without
+        # consuming the rate limits; the next drain of the flush task (or the
+        # transport itself) takes care of the buffer
+        with self._send_lock:
+            lines = list(self._priority_queue)
+            self._priority_queue.clear()
+        if not lines:
+            return
+
+        if self._writer is None:
+            LOGGER.error(
+                'Writer not initialized; dropping %d line(s).', len(lines))
+            return
+
+        try:
+            self._writer.writelines(lines)
+        except Exception:
+            LOGGER.exception('Unable to send %d line(s).', len(lines))
+
+        with self._send_lock:
+            self._send_stats['flushes'] += 1
+            self._send_stats['lines'] += len(lines)
+            self._send_stats['bytes'] += sum(len(line) for line in lines)
+
+    def _pop_send_queue(self) -> Tuple[List[bytes], float]:
+        # pop the lines allowed by the rate limiter, and how long to wait
+        # before the next one can be sent
+        lines: List[bytes] = []
+        wait = 0.0
+        now = time.monotonic()
+        with self._send_lock:
+            while self._send_queue:
+                size = len(self._send_queue[0])
+                wait = self._send_limiter.get_wait_time(size, now)
+                if wait > 0:
+                    self._send_stats['throttled'] += 1
+                    self._send_stats['throttled_time'] += wait
+                    break
+                self._send_limiter.consume(size, now)
+                lines.append(self._send_queue.popleft())
+
+            if not lines and not wait:
+                self._flush_pending = False
+        return lines, wait
+
+    async def _flush(self) -> None:
+        # write queued lines until there is nothing left to write
+        lines, wait = self._pop_send_queue()
+        while lines or wait:
+            if not lines:
+                LOGGER.debug(
+                    'Send rate limit reached; waiting %.3fs.', wait)
+            elif self._writer is None:
+                LOGGER.error(
+                    'Writer not initialized; dropping %d line(s).',
+                    len(lines))
+            else:
+                try:
+                    self._writer.writelines(lines)
+                    await self._writer.drain()
+                except asyncio.CancelledError:
+                    LOGGER.debug('Writer was cancelled')
+                    # let the next irc_send start a new flush
+                    with self._send_lock:
+                        self._flush_pending = False
+                    raise
+                except Exception:
+                    LOGGER.exception(
+                        'Unable to send %d line(s).', len(lines))
+
+                with self._send_lock:
+                    self._send_stats['flushes'] += 1
+                    self._send_stats['lines'] += len(lines)
+                    self._send_stats['bytes'] += sum(
+                        len(line) for line in lines)
+
+            if wait:
+                try:
+                    await asyncio.sleep(wait)
+                except asyncio.CancelledError:
+                    with self._send_lock:
+                        self._flush_pending = False
+                    raise
+
+            lines, wait = self._pop_send_queue()
+
+    def run_coroutine(self, coro: Coroutine) -> futures.Future:
+        """Schedule a coroutine as a task of the backend's event loop.
+
+        :param coro: the coroutine to run
+        :return: a future for the result of the coroutine
+        :raise RuntimeError: when the backend isn't running
+
+        This method is thread-safe, and returns without waiting for the
+        coroutine to complete.
+        """
+        if self._loop is None:
+            coro.close()
+            raise RuntimeError('EventLoop not initialized.')
+
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def call_later(
+        self,
+        delay: float,
+        callback: Callable[..., Any],
+        *args: Any,
+    ) -> None:
+        """Schedule ``callback(*args)`` on the backend's event loop.
+
+        :param delay: number of seconds to wait before the call
+        :param callback: the function to call
+        :param args: the arguments of the call
+        :raise RuntimeError: when the backend isn't running
+
+        This method is thread-safe, and returns immediately: ``callback`` is
+        called by the event loop.
+        """
+        if self._loop is None:
+            raise RuntimeError('EventLoop not initialized.')
+
+        self._loop.call_soon_threadsafe(
+            self._loop.call_later, delay, callback, *args)
 
     # read/write
 
@@ -342,6 +568,14 @@ class AsyncioBackend(AbstractIRCBackend):
 
         # nothing to read anymore
         LOGGER.debug('Shutting down writer.')
+        with self._send_lock:
+            # ignore the rate limits: the connection is closing anyway
+            remaining = list(self._priority_queue) + list(self._send_queue)
+            self._priority_queue.clear()
+            self._send_queue.clear()
+        if remaining:
+            # best effort: it's probably too late for these lines
+            self._writer.writelines(remaining)
         self._writer.close()
         await self._writer.wait_closed()
         LOGGER.debug('All clear, exiting now.')
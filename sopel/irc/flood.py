@@ -0,0 +1,658 @@
+"""Flood protection for the messages sent by the bot.
+
+Each recipient (a channel or a nick) has its own token bucket and its own
+queue of messages: when a recipient's bucket is empty, its messages wait in
+the queue until their deadline, without blocking the thread that sent them,
+and without delaying messages sent to other recipients. This is the job of
+the :class:`FloodScheduler`.
+
+On top of that, every line sent to the server, whatever its command, goes
+through the backend's :class:`RateLimiter`, so the bot never sends more than
+the server accepts from a client.
+
+Joining many channels at once is the job of the :class:`JoinScheduler`: it
+sends as few ``JOIN`` lines as possible, one batch of channels at a time.
+Then, the :class:`WhoRefreshQueue` chooses which channels to refresh with a
+``WHO`` request, without exceeding a budget of reply lines.
+
+.. important::
+
+    This is an internal tool used by :class:`sopel.irc.AbstractBot` and
+    should not be used by plugin authors. Plugins should use
+    :meth:`~sopel.irc.AbstractBot.say`, :meth:`~sopel.irc.AbstractBot.notice`,
+    or :meth:`~sopel.irc.AbstractBot.reply`, and their ``priority`` parameter
+    instead.
+
+.. versionadded:: 8.0
+"""
+# Licensed under the Eiffel Forum License 2.
+from __future__ import annotations
+
+from datetime import datetime
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+from .utils import safe
+
+if TYPE_CHECKING:
+    from sopel.bot import Sopel
+    from sopel.irc import AbstractBot
+    from sopel.tools import identifiers, target
+
+
+LOGGER = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 0
+"""Priority of messages that must jump the queue, such as replies."""
+PRIORITY_NORMAL = 50
+"""Default priority of messages."""
+PRIORITY_LOW = 100
+"""Priority of bulk messages, such as announcements."""
+
+MAX_LINE_LENGTH = 510
+"""Maximum length of a line sent to the server, without its CRLF."""
+
+_Message = Tuple[int, int, str, str]
+_Join = Tuple[str, Optional[str]]
+
+
+class FloodScheduler:
+    """Schedule the ``PRIVMSG`` and ``NOTICE`` sent by a bot, one queue per
+    recipient.
+
+    :param bot: the bot sending messages
+
+    A message is sent immediately when its recipient's token bucket isn't
+    empty and no other message is waiting for that recipient. Otherwise, it
+    is queued until the recipient's next deadline, computed with the
+    ``flood_*`` settings of the ``[core]`` section, and it is sent later by
+    the backend (see
+    :meth:`~sopel.irc.abstract_backends.AbstractIRCBackend.call_later`).
+
+    Queued messages are sent by order of priority (the lowest first), then
+    in the order they were submitted. Replies are sent with a higher
+    priority than other messages by default (see
+    :meth:`~sopel.irc.AbstractBot.reply`).
+
+    The state of each recipient is kept in :attr:`AbstractBot.stack
+    <sopel.irc.AbstractBot.stack>`, so the bot's loop detection keeps
+    working as before.
+    """
+    def __init__(self, bot: AbstractBot) -> None:
+        self._bot = bot
+        self._lock = threading.RLock()
+        self._counter = itertools.count()
+        self._queues: Dict[identifiers.Identifier, List[_Message]] = {}
+        self._scheduled: Dict[identifiers.Identifier, float] = {}
+
+    def submit(
+        self,
+        recipient: str,
+        text: str,
+        priority: int = PRIORITY_NORMAL,
+        command: str = 'PRIVMSG',
+    ) -> None:
+        """Submit a message to send to ``recipient``.
+
+        :param recipient: the message recipient
+        :param text: the text to send
+        :param priority: the priority of the message; messages with a lower
+                         value are sent first
+        :param command: how to send the message: either ``PRIVMSG`` (the
+                        default) or ``NOTICE``
+
+        This method is thread-safe and never waits for the flood protection.
+        """
+        recipient_id = self._bot.make_identifier(recipient)
+        with self._lock:
+            queue = self._queues.setdefault(recipient_id, [])
+            heapq.heappush(
+                queue, (priority, next(self._counter), command, text))
+            if recipient_id not in self._scheduled:
+                self._process(recipient_id, recipient)
+
+    def get_queue_lengths(self) -> Dict[identifiers.Identifier, int]:
+        """Get the number of messages waiting for each recipient.
+
+        :return: a new dict of recipients to their number of queued messages
+
+        Recipients without any queued message are not included.
+        """
+        with self._lock:
+            return {
+                recipient: len(queue)
+                for recipient, queue in self._queues.items()
+                if queue
+            }
+
+    def get_deadlines(self) -> Dict[identifiers.Identifier, float]:
+        """Get when the next message of each waiting recipient will be sent.
+
+        :return: a new dict of recipients to a timestamp
+        """
+        with self._lock:
+            return dict(self._scheduled)
+
+    def clear(self) -> None:
+        """Discard every queued message."""
+        with self._lock:
+            self._queues.clear()
+
+    def _on_deadline(
+        self,
+        recipient_id: identifiers.Identifier,
+        recipient: str,
+    ) -> None:
+        with self._lock:
+            self._scheduled.pop(recipient_id, None)
+            self._process(recipient_id, recipient)
+
+    def _process(
+        self,
+        recipient_id: identifiers.Identifier,
+        recipient: str,
+    ) -> None:
+        # must be called with the lock acquired
+        queue = self._queues.get(recipient_id)
+        while queue:
+            priority, _, command, text = queue[0]
+            wait = self._get_wait_time(recipient_id, text)
+            if wait > 0:
+                self._scheduled[recipient_id] = time.time() + wait
+                LOGGER.debug(
+                    'Flood protection: %d message(s) to %s '
+                    'wait for %.3fs.',
+                    len(queue), recipient, wait)
+                self._bot.backend.call_later(
+                    wait, self._on_deadline, recipient_id, recipient)
+                return
+
+            heapq.heappop(queue)
+            self._send(recipient_id, recipient, command, text)
+
+        self._queues.pop(recipient_id, None)
+
+    def _get_stack(
+        self,
+        recipient_id: identifiers.Identifier,
+    ) -> Dict[str, Any]:
+        return self._bot.stack.setdefault(recipient_id, {
+            'messages': [],
+            'flood_left': self._bot.settings.core.flood_burst_lines,
+        })
+
+    def _get_elapsed(self, recipient_stack: Dict[str, Any]) -> float:
+        if recipient_stack['messages']:
+            return time.time() - recipient_stack['messages'][-1][0]
+
+        # Default to a high enough value that we won't care.
+        # Five minutes should be enough not to matter anywhere below.
+        return 300
+
+    def _get_wait_time(
+        self,
+        recipient_id: identifiers.Identifier,
+        text: str,
+    ) -> float:
+        settings = self._bot.settings.core
+        recipient_stack = self._get_stack(recipient_id)
+        elapsed = self._get_elapsed(recipient_stack)
+
+        # If flood bucket is empty, refill the appropriate number of lines
+        # based on how long it's been since our last message to recipient
+        if not recipient_stack['flood_left']:
+            recipient_stack['flood_left'] = min(
+                settings.flood_burst_lines,
+                int(elapsed) * settings.flood_refill_rate)
+
+        if recipient_stack['flood_left']:
+            return 0
+
+        penalty = 0.0
+        if settings.flood_penalty_ratio > 0:
+            penalty_ratio = (
+                settings.flood_text_length * settings.flood_penalty_ratio)
+            text_length_overflow = float(
+                max(0, len(text) - settings.flood_text_length))
+            penalty = text_length_overflow / penalty_ratio
+
+        # Maximum wait time is 2 sec by default
+        wait = min(settings.flood_empty_wait + penalty, settings.flood_max_wait)
+        return max(0, wait - elapsed)
+
+    def _send(
+        self,
+        recipient_id: identifiers.Identifier,
+        recipient: str,
+        command: str,
+        text: str,
+    ) -> None:
+        recipient_stack = self._get_stack(recipient_id)
+        elapsed = self._get_elapsed(recipient_stack)
+
+        # Loop detection
+        messages = [m[1] for m in recipient_stack['messages'][-8:]]
+
+        # If what we're about to send repeated at least 5 times in the last
+        # two minutes, replace it with '...'
+        if messages.count(text) >= 5 and elapsed < 120:
+            text = '...'
+            if messages.count('...') >= 3:
+                # If we've already said '...' 3 times, discard message
+                return
+
+        if command == 'NOTICE':
+            self._bot.backend.send_notice(recipient, text)
+        else:
+            self._bot.backend.send_privmsg(recipient, text)
+        recipient_stack['flood_left'] = max(
+            0, recipient_stack['flood_left'] - 1)
+        recipient_stack['messages'].append((time.time(), safe(text)))
+        recipient_stack['messages'] = recipient_stack['messages'][-10:]
+
+
+class RateLimiter:
+    """Connection-level rate limiter, with a penalty model like ircd's.
+
+    :param lines_per_second: sustained rate of lines; ``0`` for no limit
+    :param bytes_per_second: sustained rate of bytes; ``0`` for no limit
+    :param burst_lines: how many lines can be sent at once before the rate
+                        applies
+
+    Like an IRC server does for its clients, the limiter keeps a penalty
+    clock: each line sent pushes the clock forward by its cost, in seconds::
+
+        cost = 1 / lines_per_second + len(line) / bytes_per_second
+
+    A line can be sent as long as the clock isn't ahead of the current time
+    by more than ``burst_lines / lines_per_second`` seconds; otherwise
+    :meth:`get_wait_time` tells how long to wait for it. The clock never
+    falls behind the current time, so idle time doesn't build up an
+    unlimited burst.
+
+    This class isn't thread-safe: its user must hold a lock if required.
+    """
+    def __init__(
+        self,
+        lines_per_second: float = 0,
+        bytes_per_second: float = 0,
+        burst_lines: int = 1,
+    ) -> None:
+        self.lines_per_second = max(lines_per_second, 0)
+        self.bytes_per_second = max(bytes_per_second, 0)
+        self.burst_lines = max(burst_lines, 1)
+        self._clock = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        """Tell if the limiter limits anything."""
+        return bool(self.lines_per_second or self.bytes_per_second)
+
+    @property
+    def window(self) -> float:
+        """How far ahead of the current time the penalty clock can go."""
+        if self.lines_per_second:
+            return self.burst_lines / self.lines_per_second
+        return self.burst_lines * self.get_cost(512)
+
+    def get_cost(self, size: int) -> float:
+        """Get the cost of a line of ``size`` bytes, in seconds."""
+        cost = 0.0
+        if self.lines_per_second:
+            cost += 1 / self.lines_per_second
+        if self.bytes_per_second:
+            cost += size / self.bytes_per_second
+        return cost
+
+    def get_wait_time(self, size: int, now: float) -> float:
+        """Get how long to wait before sending a line of ``size`` bytes.
+
+        :param size: the length of the line, in bytes
+        :param now: the current time (from :func:`time.monotonic`)
+        :return: the number of seconds to wait; ``0`` if the line can be
+                 sent now
+        """
+        if not self.enabled:
+            return 0
+        clock = max(self._clock, now)
+        wait = clock + self.get_cost(size) - now - self.window
+        # ignore rounding errors at the edge of the window
+        return wait if wait > 1e-6 else 0
+
+    def consume(self, size: int, now: float) -> None:
+        """Account for a line of ``size`` bytes sent ``now``.
+
+        :param size: the length of the line, in bytes
+        :param now: the current time (from :func:`time.monotonic`)
+        """
+        if self.enabled:
+            self._clock = max(self._clock, now) + self.get_cost(size)
+
+
+def batch_joins(
+    channels: Iterable[_Join],
+    max_targets: Optional[int] = None,
+    max_length: int = MAX_LINE_LENGTH,
+) -> List[Tuple[List[str], List[str]]]:
+    """Group channels into as few ``JOIN`` commands as possible.
+
+    :param channels: pairs of ``(channel, password)``; ``password`` is
+                     ``None`` for channels without one
+    :param max_targets: maximum number of channels per ``JOIN``, as
+                        advertised by the ``TARGMAX`` ISUPPORT parameter
+                        (optional)
+    :param max_length: maximum length of a ``JOIN`` line
+    :return: a list of ``(channels, passwords)``, one per ``JOIN`` command
+
+    Since the passwords of a ``JOIN`` apply to its first channels, channels
+    with a password come first in each command::
+
+        >>> batch_joins([('#a', None), ('#b', 'key'), ('#c', None)])
+        [(['#b', '#a', '#c'], ['key'])]
+
+    A channel too long to share a line is sent alone.
+    """
+    channels = list(channels)
+    batches: List[Tuple[List[str], List[str]]] = []
+    names: List[str] = []
+    passwords: List[str] = []
+    length = len('JOIN')
+
+    for name, password in sorted(channels, key=lambda item: not item[1]):
+        # each item costs its length plus a separator (comma or space)
+        cost = len(name) + 1
+        if password:
+            cost += len(password) + 1
+        is_full = max_targets is not None and len(names) >= max_targets
+        if names and (is_full or length + cost > max_length):
+            batches.append((names, passwords))
+            names, passwords = [], []
+            length = len('JOIN')
+
+        names.append(name)
+        if password:
+            passwords.append(password)
+        length += cost
+
+    if names:
+        batches.append((names, passwords))
+
+    return batches
+
+
+class JoinScheduler:
+    """Join channels by batches, paced by the ``throttle_*`` settings.
+
+    :param bot: the bot joining channels
+
+    Channels submitted are joined ``throttle_join`` at a time, every
+    ``throttle_wait`` seconds (or all at once if ``throttle_join`` is ``0``),
+    according to the :class:`~sopel.config.core_section.CoreSection` of the
+    bot's settings, and without blocking the caller: the next batch is
+    scheduled with the backend (see
+    :meth:`~sopel.irc.abstract_backends.AbstractIRCBackend.call_later`).
+
+    Each batch is sent with as few ``JOIN`` lines as possible, according to
+    the ``TARGMAX`` ISUPPORT parameter and the maximum length of a line (see
+    :func:`batch_joins`). Channels that would exceed the ``CHANLIMIT``
+    ISUPPORT parameter are not joined.
+    """
+    def __init__(self, bot: Sopel) -> None:
+        self._bot = bot
+        self._lock = threading.RLock()
+        self._pending: Dict[identifiers.Identifier, _Join] = {}
+        self._sent: Dict[identifiers.Identifier, None] = {}
+        self._scheduled = False
+
+    @property
+    def pending(self) -> int:
+        """Number of channels waiting to be joined."""
+        return len(self._pending)
+
+    def submit(self, channels: Iterable[str], delay: float = 0) -> None:
+        """Submit channels to join.
+
+        :param channels: channels to join; each one can be followed by a
+                         space and its password, like in the
+                         :attr:`~sopel.config.core_section.CoreSection.channels`
+                         setting
+        :param delay: number of seconds to wait before the next batch, if
+                      there is no batch already scheduled
+
+        Channels already waiting are ignored. This method is thread-safe.
+        """
+        with self._lock:
+            for channel in channels:
+                name, _, password = channel.strip().partition(' ')
+                if not name:
+                    continue
+                self._pending.setdefault(
+                    self._bot.make_identifier(name),
+                    (name, password.strip() or None),
+                )
+
+            if self._scheduled or not self._pending:
+                return
+
+            self._scheduled = True
+            if delay > 0:
+                self._bot.backend.call_later(delay, self._on_deadline)
+            else:
+                self._process()
+
+    def clear(self) -> None:
+        """Discard every channel waiting to be joined."""
+        with self._lock:
+            self._pending.clear()
+            self._sent.clear()
+
+    def _on_deadline(self) -> None:
+        with self._lock:
+            self._process()
+
+    def _process(self) -> None:
+        # must be called with the lock acquired
+        settings = self._bot.settings.core
+        batch_size = settings.throttle_join or len(self._pending)
+        slots = self._get_free_slots()
+        batch: List[_Join] = []
+        while self._pending and len(batch) < batch_size:
+            channel_id = next(iter(self._pending))
+            channel = self._pending.pop(channel_id)
+            prefixes = next(
+                (key for key in slots if channel_id[:1] in key), None)
+            is_new = (
+                channel_id not in self._bot.channels and
+                channel_id not in self._sent)
+            if prefixes is not None and is_new:
+                if slots[prefixes] <= 0:
+                    LOGGER.warning(
+                        'Not joining %s: too many channels (CHANLIMIT).',
+                        channel[0])
+                    continue
+                slots[prefixes] -= 1
+            self._sent[channel_id] = None
+            batch.append(channel)
+
+        max_targets = dict(self._bot.isupport.get('TARGMAX') or []).get('JOIN')
+        for names, passwords in batch_joins(batch, max_targets):
+            args = ['JOIN', ','.join(names)]
+            if passwords:
+                args.append(','.join(passwords))
+            self._bot.backend.send_command(*args)
+
+        if not self._pending:
+            self._scheduled = False
+            self._sent.clear()
+            return
+
+        wait = max(settings.throttle_wait, 1)
+        LOGGER.debug(
+            'JOIN throttle: %d channel(s) wait for %ds.',
+            len(self._pending), wait)
+        self._bot.backend.call_later(wait, self._on_deadline)
+
+    def _get_free_slots(self) -> Dict[str, int]:
+        # number of channels the bot can still join, per group of prefixes
+        try:
+            chanlimit = self._bot.isupport.CHANLIMIT
+        except AttributeError:
+            return {}
+
+        joined = set(self._bot.channels).union(self._sent)
+        return {
+            prefixes: limit - sum(
+                1 for name in joined if name[:1] in prefixes)
+            for prefixes, limit in chanlimit.items()
+            if limit is not None
+        }
+
+
+class WhoRefreshQueue:
+    """Choose which channels to refresh with ``WHO``, within a budget.
+
+    :param budget: number of ``WHO`` reply lines the bot can request per
+                   minute; ``0`` to never refresh
+    :param min_age: minimum number of seconds between two ``WHO`` requests for
+                    the same channel
+
+    Channels are kept in a heap, ordered by the time of their last ``WHO``
+    request (channels without one come first), so the stalest channel is
+    always found without scanning all of them. Each time a ``WHO`` request is
+    sent for a channel, it must be :meth:`pushed <push>` again.
+
+    The cost of a ``WHO`` request is the number of lines of its reply: one
+    per user in the channel. The budget is a token bucket, refilled
+    continuously, and that holds up to one minute of budget. A channel larger
+    than the whole budget can be refreshed once the bucket is full.
+
+    This class is thread-safe.
+    """
+    def __init__(self, budget: int, min_age: float = 120) -> None:
+        self.budget = max(budget, 0)
+        self.min_age = min_age
+        self._lock = threading.Lock()
+        self._heap: List[Tuple[datetime, int, identifiers.Identifier]] = []
+        self._counter = itertools.count()
+        self._tokens = float(self.budget)
+        self._refilled: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @property
+    def tokens(self) -> float:
+        """Number of reply lines left in the budget."""
+        return self._tokens
+
+    def push(
+        self,
+        channel_id: identifiers.Identifier,
+        last_who: Optional[datetime],
+    ) -> None:
+        """Add a channel to refresh.
+
+        :param channel_id: the channel's name
+        :param last_who: the time of the channel's last ``WHO`` request, if
+                         any (see :attr:`Channel.last_who
+                         <sopel.tools.target.Channel.last_who>`)
+
+        Entries made obsolete by a newer ``WHO`` request, or by the bot
+        leaving the channel, are discarded by :meth:`pop_due`.
+        """
+        with self._lock:
+            heapq.heappush(
+                self._heap,
+                (last_who or datetime.min, next(self._counter), channel_id))
+
+    def consume(self, channel: target.Channel, now: datetime) -> bool:
+        """Take the cost of a ``WHO`` request for ``channel`` from the budget.
+
+        :param channel: the channel to send a ``WHO`` request to
+        :param now: the current time
+        :return: ``True`` if the budget allows the request now
+
+        This is for ``WHO`` requests sent outside of :meth:`pop_due`, such as
+        when the bot joins a channel, so they share the same budget. Without
+        a budget, every request is allowed.
+        """
+        if not self.budget:
+            return True
+
+        with self._lock:
+            self._refill(now)
+            cost = self.get_cost(channel)
+            if cost > self._tokens:
+                return False
+            self._tokens -= cost
+            return True
+
+    def get_cost(self, channel: target.Channel) -> int:
+        """Get the cost of a ``WHO`` request for ``channel``.
+
+        :param channel: the channel to refresh
+        :return: the expected number of reply lines, within the budget
+        """
+        return min(max(len(channel.users), 1), self.budget)
+
+    def pop_due(
+        self,
+        channels: Mapping[identifiers.Identifier, target.Channel],
+        now: datetime,
+    ) -> List[identifiers.Identifier]:
+        """Remove and return the channels to refresh now.
+
+        :param channels: the channels the bot is in
+        :param now: the current time, comparable to
+                    :attr:`Channel.last_who <sopel.tools.target.Channel.last_who>`
+        :return: the names of the channels to send a ``WHO`` request to,
+                 stalest first
+
+        Channels are returned as long as their last ``WHO`` request is older
+        than :attr:`min_age` and the budget allows it.
+        """
+        with self._lock:
+            self._refill(now)
+            due: List[identifiers.Identifier] = []
+            while self._heap:
+                last_who, _, channel_id = self._heap[0]
+                channel = channels.get(channel_id)
+                current = channel and (channel.last_who or datetime.min)
+                if current != last_who:
+                    # obsolete entry
+                    heapq.heappop(self._heap)
+                    continue
+
+                if last_who != datetime.min:
+                    if (now - last_who).total_seconds() < self.min_age:
+                        break
+
+                cost = self.get_cost(channel)
+                if not self.budget or cost > self._tokens:
+                    break
+
+                heapq.heappop(self._heap)
+                self._tokens -= cost
+                due.append(channel_id)
+
+            return due
+
+    def _refill(self, now: datetime) -> None:
+        if self._refilled is not None:
+            elapsed = max((now - self._refilled).total_seconds(), 0)
+            self._tokens = min(
+                self._tokens + elapsed * self.budget / 60, self.budget)
+        self._refilled = now
@@ -10,10 +10,12 @@ from __future__ import annotations
 
 import collections
 from datetime import datetime
+import heapq
 import io  # don't use `codecs` for loading the DB; it will split lines on some IRC formatting
 import logging
 import os
 import re
+import threading
 import time
 
 import pytz
@@ -24,6 +26,9 @@ from sopel.tools.time import format_time, get_timezone, validate_timezone
 
 LOGGER = logging.getLogger(__name__)
 
+COMPACT_THRESHOLD = 1000
+"""Minimum number of removed reminders before the database is compacted."""
+
 
 def get_filename(bot):
     """Get the remind database's filename
@@ -82,6 +87,10 @@ def load_database(filename):
     return data
 
 
+def _format_line(unixtime, channel, nick, message):
+    return '%s\t%s\t%s\t%s\n' % (unixtime, channel, nick, message)
+
+
 def dump_database(filename, data):
     """Dump the remind database into a file
 
@@ -96,8 +105,153 @@ def dump_database(filename, data):
     with io.open(filename, 'w', encoding='utf-8') as database:
         for unixtime, reminders in data.items():
             for channel, nick, message in reminders:
-                line = '%s\t%s\t%s\t%s\n' % (unixtime, channel, nick, message)
-                database.write(line)
+                database.write(_format_line(unixtime, channel, nick, message))
+
+
+class ReminderDatabase(dict):
+    """Reminders stored by timestamp, indexed by due time
+
+    :param str filename: absolute path to the remind database file
+
+    Like the :class:`dict` returned by :func:`load_database`, keys are the
+    timestamps of the reminders, and values are lists of
+    ``(channel, nick, message)``. On top of that:
+
+    * a heap of timestamps gives the due reminders without looking at the
+      other ones (see :meth:`pop_due`)
+    * a new reminder is appended to the database file (see :meth:`add`)
+    * a removed reminder is appended to a journal file, next to the
+      database file, and ignored when the database is loaded again (see
+      :meth:`load`)
+
+    The database file is rewritten only when the journal gets larger than
+    both :data:`COMPACT_THRESHOLD` and the number of pending reminders, or
+    with :meth:`compact`.
+
+    This class is thread-safe as long as its methods are used to change it.
+
+    .. versionadded:: 8.0
+    """
+    def __init__(self, filename):
+        super().__init__()
+        self.filename = filename
+        self.journal = filename + '.journal'
+        self._lock = threading.RLock()
+        self._due = []
+        self._pending = 0
+        self._removed = 0
+
+    def load(self):
+        """Load the reminders from the database file and its journal"""
+        data = load_database(self.filename)
+        removed = collections.Counter()
+        for unixtime, reminders in load_database(self.journal).items():
+            for reminder in reminders:
+                removed[(unixtime,) + reminder] += 1
+
+        with self._lock:
+            self.clear()
+            self._due = []
+            self._pending = 0
+            for unixtime, reminders in data.items():
+                for reminder in reminders:
+                    key = (unixtime,) + reminder
+                    if removed[key]:
+                        removed[key] -= 1
+                        continue
+                    self._insert(unixtime, reminder)
+
+            if os.path.isfile(self.journal):
+                # start from a clean file
+                self.compact()
+
+    def add(self, unixtime, reminder):
+        """Add a reminder, and append it to the database file
+
+        :param int unixtime: when to remind
+        :param tuple reminder: the reminder's ``(channel, nick, message)``
+        """
+        with self._lock:
+            self._insert(unixtime, reminder)
+            self._append(self.filename, [(unixtime, reminder)])
+
+    def pop_due(self, now):
+        """Remove and return the reminders due by ``now``
+
+        :param int now: the current timestamp
+        :return: a list of due ``(channel, nick, message)``, oldest first
+        :rtype: list
+        """
+        due = []
+        with self._lock:
+            while self._due and self._due[0] <= now:
+                unixtime = heapq.heappop(self._due)
+                for reminder in self.pop(unixtime, []):
+                    due.append((unixtime, reminder))
+            self._remove(due)
+
+        return [reminder for __, reminder in due]
+
+    def remove(self, predicate):
+        """Remove the reminders matching ``predicate``
+
+        :param predicate: a function called with ``channel``, ``nick``, and
+                          ``message`` that returns ``True`` to remove the
+                          reminder
+        :return: the number of reminders removed
+        :rtype: int
+        """
+        removed = []
+        with self._lock:
+            for unixtime in list(self):
+                kept = []
+                for reminder in self[unixtime]:
+                    if predicate(*reminder):
+                        removed.append((unixtime, reminder))
+                    else:
+                        kept.append(reminder)
+                if kept:
+                    self[unixtime] = kept
+                else:
+                    # its timestamp is discarded from the heap by pop_due
+                    del self[unixtime]
+            self._remove(removed)
+
+        return len(removed)
+
+    def compact(self):
+        """Rewrite the database file with only the pending reminders"""
+        with self._lock:
+            tmpfile = self.filename + '.tmp'
+            dump_database(tmpfile, self)
+            os.replace(tmpfile, self.filename)
+            if os.path.isfile(self.journal):
+                os.remove(self.journal)
+            self._removed = 0
+
+    def _insert(self, unixtime, reminder):
+        # must be called with the lock acquired
+        if unixtime not in self:
+            self[unixtime] = []
+            heapq.heappush(self._due, unixtime)
+        self[unixtime].append(reminder)
+        self._pending += 1
+
+    def _remove(self, removed):
+        # must be called with the lock acquired
+        if not removed:
+            return
+
+        self._append(self.journal, removed)
+        self._pending -= len(removed)
+        self._removed += len(removed)
+        if self._removed > max(COMPACT_THRESHOLD, self._pending):
+            self.compact()
+
+    def _append(self, filename, reminders):
+        with io.open(filename, 'a', encoding='utf-8') as database:
+            for unixtime, (channel, nick, message) in reminders:
+                database.write(_format_line(unixtime, channel, nick, message))
 
 
 def create_reminder(bot, trigger, duration, message):
@@ -115,12 +269,7 @@ def create_reminder(bot, trigger, duration, message):
     """
     timestamp = int(time.time()) + duration
     reminder = (trigger.sender, trigger.nick, message)
-    try:
-        bot.rdb[timestamp].append(reminder)
-    except KeyError:
-        bot.rdb[timestamp] = [reminder]
-
-    dump_database(bot.rfn, bot.rdb)
+    bot.rdb.add(timestamp, reminder)
     return timestamp
 
 
@@ -146,13 +295,13 @@ def setup(bot):
             LOGGER.info("Migration finished!")
     # End migration logic
 
-    bot.rdb = load_database(bot.rfn)
+    bot.rdb = ReminderDatabase(bot.rfn)
+    bot.rdb.load()
 
 
 def shutdown(bot):
     """Dump the remind database before shutdown"""
-    dump_database(bot.rfn, bot.rdb)
-    bot.rdb = {}
+    bot.rdb.compact()
     del bot.rfn
     del bot.rdb
 
@@ -161,17 +310,11 @@ def shutdown(bot):
 def remind_monitoring(bot):
     """Check for reminder"""
     now = int(time.time())
-    unixtimes = [int(key) for key in bot.rdb]
-    oldtimes = [t for t in unixtimes if t <= now]
-    if oldtimes:
-        for oldtime in oldtimes:
-            for (channel, nick, message) in bot.rdb[oldtime]:
-                if message:
-                    bot.say(nick + ': ' + message, channel)
-                else:
-                    bot.say(nick + '!', channel)
-            del bot.rdb[oldtime]
-        dump_database(bot.rfn, bot.rdb)
+    for (channel, nick, message) in bot.rdb.pop_due(now):
+        if message:
+            bot.say(nick + ': ' + message, channel)
+        else:
+            bot.say(nick + '!', channel)
 
 
 SCALING = collections.OrderedDict([
@@ -543,18 +686,12 @@ def manage_reminders(bot, trigger):
         bot.reply(tpl.format(count=count, target=target))
 
     elif action == 'forget':
-        bot.rdb = {
-            timestamp: [
-                (channel, nick, message)
-                for channel, nick, message in reminders
-                if not (
-                    nick == owner
-                    and (target == '*' or target == channel)
-                )
-            ]
-            for timestamp, reminders in bot.rdb.items()
-        }
-        dump_database(bot.rfn, bot.rdb)
+        bot.rdb.remove(
+            lambda channel, nick, message: (
+                nick == owner
+                and (target == '*' or target == channel)
+            )
+        )
 
         if not target or target == '*':
             bot.reply('I forgot all your reminders.')
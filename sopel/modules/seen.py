@@ -9,10 +9,126 @@ https://sopel.chat
 """
 from __future__ import annotations
 
+import threading
+
 from sopel import plugin
 from sopel.tools.time import seconds_to_human
 
 
+FLUSH_INTERVAL = 30
+"""How often (in seconds) to save the activity noted by the bot."""
+SEEN_KEYS = ('seen_timestamp', 'seen_channel', 'seen_message', 'seen_action')
+
+
+class SeenCache:
+    """Write-behind cache of the last activity seen for each nick.
+
+    :param db: the bot's database
+
+    Noting a nick's activity only updates the cache; updates for the same
+    nick are coalesced until :meth:`flush` saves all of them into the
+    database, in a single transaction (see
+    :meth:`~sopel.db.SopelDB.set_many_nick_values`). Reading a nick's
+    activity looks in the cache first, then in the database.
+
+    .. versionadded:: 8.0
+    """
+    def __init__(self, db):
+        self.db = db
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}
+        self._flushing = {}
+
+    def __len__(self):
+        return len(self._pending)
+
+    def note(self, nick, timestamp, channel, message, action):
+        """Note the activity of ``nick``, to be saved on the next flush.
+
+        :param str nick: nick seen by the bot
+        :param float timestamp: when ``nick`` was seen
+        :param str channel: where ``nick`` was seen
+        :param str message: what ``nick`` said
+        :param bool action: if the message was an action (``/me``)
+        """
+        values = dict(zip(SEEN_KEYS, (
+            timestamp, str(channel), str(message), action)))
+        with self._lock:
+            self._pending[self._make_slug(nick)] = (nick, values)
+
+    def get(self, nick):
+        """Get the last activity of ``nick``.
+
+        :param str nick: nick to look for
+        :return: a ``dict`` with the ``seen_*`` values of ``nick``, or
+                 ``None`` if the bot has never seen ``nick``
+        :rtype: dict
+        """
+        slug = self._make_slug(nick)
+        with self._lock:
+            entry = self._pending.get(slug) or self._flushing.get(slug)
+        if entry is not None:
+            return dict(entry[1])
+
+        values = self.db.get_nick_values(nick, SEEN_KEYS)
+        if not values['seen_timestamp']:
+            return None
+        return values
+
+    def flush(self):
+        """Save the pending activity into the database.
+
+        :return: how many nicks were saved
+        :rtype: int
+        :raise ~sqlalchemy.exc.SQLAlchemyError: if there is a database error
+
+        If saving fails, the activity is kept in the cache for the next
+        flush, unless the nick has been seen again in the meantime.
+        """
+        with self._flush_lock:
+            with self._lock:
+                self._flushing, self._pending = self._pending, {}
+                entries = self._flushing
+
+            try:
+                if entries:
+                    self._save(entries.values())
+            except Exception:
+                with self._lock:
+                    for slug, entry in entries.items():
+                        self._pending.setdefault(slug, entry)
+                    self._flushing = {}
+                raise
+
+            with self._lock:
+                self._flushing = {}
+
+        return len(entries)
+
+    def _save(self, entries):
+        # grouped nicks share their values: the latest activity is saved last
+        self.db.set_many_nick_values({
+            nick: values
+            for nick, values in sorted(
+                entries, key=lambda entry: entry[1]['seen_timestamp'])
+        })
+
+    def _make_slug(self, nick):
+        return self.db.make_identifier(nick).lower()
+
+
+def setup(bot):
+    bot.memory['seen_cache'] = SeenCache(bot.db)
+
+
+def shutdown(bot):
+    try:
+        bot.memory['seen_cache'].flush()
+    finally:
+        del bot.memory['seen_cache']
+
+
 @plugin.command('seen')
 @plugin.output_prefix('[seen] ')
 def seen(bot, trigger):
@@ -28,14 +144,15 @@ def seen(bot, trigger):
         bot.reply("I'm right here!")
         return
 
-    saw = bot.db.get_nick_value(nick, 'seen_timestamp')
-    if not saw:
+    values = bot.memory['seen_cache'].get(nick)
+    if not values:
         bot.reply("Sorry, I haven't seen {nick} around.".format(nick=nick))
         return
 
-    channel = bot.db.get_nick_value(nick, 'seen_channel')
-    message = bot.db.get_nick_value(nick, 'seen_message')
-    action = bot.db.get_nick_value(nick, 'seen_action')
+    saw = values['seen_timestamp']
+    channel = values['seen_channel']
+    message = values['seen_message']
+    action = values['seen_action']
 
     # as of Sopel 8, trigger.time is an aware datetime
     delta = seconds_to_human(trigger.time.timestamp() - saw)
@@ -62,10 +179,17 @@ def seen(bot, trigger):
 @plugin.unblockable
 @plugin.require_chanmsg
 def note(bot, trigger):
-    nick = trigger.nick
     # as of Sopel 8, `trigger.time` is Aware, meaning we should store its value
     # for timezone safety when comparing it later
-    bot.db.set_nick_value(nick, 'seen_timestamp', trigger.time.timestamp())
-    bot.db.set_nick_value(nick, 'seen_channel', trigger.sender)
-    bot.db.set_nick_value(nick, 'seen_message', trigger)
-    bot.db.set_nick_value(nick, 'seen_action', trigger.ctcp is not None)
+    bot.memory['seen_cache'].note(
+        trigger.nick,
+        trigger.time.timestamp(),
+        trigger.sender,
+        trigger,
+        trigger.ctcp is not None,
+    )
+
+
+@plugin.interval(FLUSH_INTERVAL)
+def flush_seen(bot):
+    bot.memory['seen_cache'].flush()
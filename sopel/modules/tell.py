@@ -8,7 +8,7 @@ https://sopel.chat
 """
 from __future__ import annotations
 
-from collections import defaultdict
+from collections import Counter, defaultdict
 import io  # don't use `codecs` for loading the DB; it will split lines on some IRC formatting
 import logging
 import os
@@ -16,12 +16,198 @@ import threading
 import time
 import unicodedata
 
+from sqlalchemy import Boolean, Column, Integer, String, Text
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.sql import and_, delete, func, or_, select
+
 from sopel import formatting, plugin
 from sopel.config import types
+from sopel.db import MYSQL_TABLE_ARGS
 from sopel.tools.time import format_time, get_timezone
 
 
 LOGGER = logging.getLogger(__name__)
+WILDCARD_TOKENS = ('*', ':')
+
+BASE = declarative_base()
+
+
+class TellMessage(BASE):
+    """Tell messages table SQLAlchemy class.
+
+    .. versionadded:: 8.0
+    """
+    __tablename__ = 'tell_messages'
+    __table_args__ = MYSQL_TABLE_ARGS
+    id = Column(Integer, primary_key=True)
+    slug = Column(String(255), nullable=False, index=True)
+    wildcard = Column(Boolean, nullable=False, default=False)
+    tellee = Column(String(255), nullable=False)
+    teller = Column(String(255), nullable=False)
+    verb = Column(String(255), nullable=False)
+    timenow = Column(String(255), nullable=False)
+    message = Column(Text, nullable=False)
+
+
+class TellDatabase:
+    """Pending tell/ask messages, stored in the bot's database.
+
+    :param db: the bot's database
+
+    Messages are indexed by their tellee's slug: a lowercased nick, or the
+    prefix of a pattern when the tellee ends with a wildcard token (``*`` or
+    ``:``). The slugs of pending messages are kept in memory, so that
+    checking a nick is a set lookup, plus a prefix check against the few
+    patterns; the database is queried only when there is something to
+    deliver, and delivered messages are deleted one by one.
+
+    .. versionadded:: 8.0
+    """
+    def __init__(self, db):
+        self.db = db
+        self._lock = threading.RLock()
+        self._nicks = Counter()
+        self._patterns = Counter()
+
+    def load(self):
+        """Create the messages table if needed, and index its messages."""
+        BASE.metadata.create_all(self.db.engine)
+        with self._lock:
+            self._nicks.clear()
+            self._patterns.clear()
+            with self.db.session() as session:
+                rows = session.execute(
+                    select(
+                        TellMessage.slug,
+                        TellMessage.wildcard,
+                        func.count(TellMessage.id),
+                    )
+                    .group_by(TellMessage.slug, TellMessage.wildcard)
+                ).all()
+            for slug, wildcard, count in rows:
+                self._get_index(wildcard)[slug] += count
+
+    def __len__(self):
+        return sum(self._nicks.values()) + sum(self._patterns.values())
+
+    def add(self, tellee, teller, verb, timenow, msg):
+        """Store a message for ``tellee``.
+
+        :param str tellee: tellee name or pattern
+        :param str teller: nick of who left the message
+        :param str verb: either ``tell`` or ``ask``
+        :param str timenow: formatted time of the message
+        :param str msg: the message itself
+        """
+        self.add_many([(tellee, teller, verb, timenow, msg)])
+
+    def add_many(self, reminders):
+        """Store many messages at once.
+
+        :param reminders: an iterable of ``(tellee, teller, verb, timenow,
+                          msg)`` tuples
+        """
+        rows = []
+        indexed = []
+        for tellee, teller, verb, timenow, msg in reminders:
+            slug, wildcard = self._make_slug(tellee)
+            indexed.append((slug, wildcard))
+            rows.append(TellMessage(
+                slug=slug,
+                wildcard=wildcard,
+                tellee=str(tellee),
+                teller=str(teller),
+                verb=verb,
+                timenow=timenow,
+                message=msg,
+            ))
+
+        if not rows:
+            return
+
+        with self._lock:
+            with self.db.session() as session:
+                session.add_all(rows)
+                session.commit()
+            for slug, wildcard in indexed:
+                self._get_index(wildcard)[slug] += 1
+
+    def has_messages(self, nick):
+        """Tell if there are messages for ``nick``.
+
+        :param str nick: nick seen by the bot
+        :rtype: bool
+
+        This doesn't query the database.
+        """
+        slug = nick.lower()
+        return slug in self._nicks or any(
+            slug.startswith(prefix) for prefix in list(self._patterns))
+
+    def pop(self, nick):
+        """Remove and return the messages for ``nick``.
+
+        :param str nick: nick seen by the bot
+        :return: a list of ``(tellee, teller, verb, timenow, msg)``, sorted
+                 by tellee (in reverse order), then in the order they were
+                 left
+        :rtype: list
+        """
+        slug = nick.lower()
+        with self._lock:
+            conditions = []
+            if slug in self._nicks:
+                conditions.append(and_(
+                    TellMessage.slug == slug,
+                    TellMessage.wildcard.is_(False),
+                ))
+            prefixes = [
+                prefix for prefix in self._patterns
+                if slug.startswith(prefix)
+            ]
+            if prefixes:
+                conditions.append(and_(
+                    TellMessage.slug.in_(prefixes),
+                    TellMessage.wildcard.is_(True),
+                ))
+            if not conditions:
+                return []
+
+            with self.db.session() as session:
+                rows = session.execute(
+                    select(TellMessage)
+                    .where(or_(*conditions))
+                    .order_by(TellMessage.id)
+                ).scalars().all()
+                result = [
+                    (row.tellee, row.teller, row.verb, row.timenow, row.message)
+                    for row in rows
+                ]
+                indexed = [(row.slug, row.wildcard) for row in rows]
+                session.execute(
+                    delete(TellMessage)
+                    .where(TellMessage.id.in_([row.id for row in rows]))
+                )
+                session.commit()
+
+            for key, wildcard in indexed:
+                index = self._get_index(wildcard)
+                index[key] -= 1
+                if index[key] <= 0:
+                    del index[key]
+
+        # sort is stable: messages for the same tellee keep their order
+        result.sort(key=lambda reminder: reminder[0], reverse=True)
+        return result
+
+    def _get_index(self, wildcard):
+        return self._patterns if wildcard else self._nicks
+
+    @staticmethod
+    def _make_slug(tellee):
+        if tellee[-1] in WILDCARD_TOKENS:
+            return tellee.lower().rstrip('*:'), True
+        return tellee.lower(), False
 
 
 class TellSection(types.StaticSection):
@@ -109,21 +295,33 @@ def setup(bot):
             LOGGER.info("Migration finished!")
     # End migration logic
 
-    if not os.path.exists(bot.tell_filename):
-        with io.open(bot.tell_filename, 'w', encoding='utf-8') as fd:
-            # if we can't open/write into the file, the tell plugin can't work
-            fd.write('')
-
-    if 'tell_lock' not in bot.memory:
-        bot.memory['tell_lock'] = threading.Lock()
+    bot.memory.setdefault('tell_lock', threading.Lock())
 
-    if 'reminders' not in bot.memory:
-        with bot.memory['tell_lock']:
-            bot.memory['reminders'] = load_reminders(bot.tell_filename)
+    with bot.memory['tell_lock']:
+        if 'tell_messages' not in bot.memory:
+            tell_db = TellDatabase(bot.db)
+            tell_db.load()
+
+            # Pre-8.0 migration logic: import the reminders file
+            if os.path.isfile(bot.tell_filename):
+                LOGGER.info(
+                    "Importing tell/ask reminders from %s...",
+                    bot.tell_filename)
+                tell_db.add_many(
+                    (tellee,) + tuple(reminder)
+                    for tellee, reminders in load_reminders(
+                        bot.tell_filename).items()
+                    for reminder in reminders
+                )
+                os.remove(bot.tell_filename)
+                LOGGER.info("Import finished!")
+            # End migration logic
+
+            bot.memory['tell_messages'] = tell_db
 
 
 def shutdown(bot):
-    for key in ['tell_lock', 'reminders']:
+    for key in ['tell_lock', 'tell_messages']:
         try:
             del bot.memory[key]
         except KeyError:
@@ -197,9 +395,6 @@ def f_remind(bot, trigger):
 
     tellee = bot.make_identifier(tellee)
 
-    if not os.path.exists(bot.tell_filename):
-        return
-
     if len(tellee) > bot.isupport.get('NICKLEN', 30):
         bot.reply('That nickname is too long.')
         return
@@ -214,13 +409,7 @@ def f_remind(bot, trigger):
     if tellee not in (bot.make_identifier(teller), bot.nick, 'me'):
         tz = get_timezone(bot.db, bot.config, None, tellee)
         timenow = format_time(bot.db, bot.config, tz, tellee)
-        with bot.memory['tell_lock']:
-            if tellee not in bot.memory['reminders']:
-                bot.memory['reminders'][tellee] = [(teller, verb, timenow, msg)]
-            else:
-                bot.memory['reminders'][tellee].append((teller, verb, timenow, msg))
-            # save the reminders
-            dump_reminders(bot.tell_filename, bot.memory['reminders'])
+        bot.memory['tell_messages'].add(tellee, teller, verb, timenow, msg)
 
         response = "I'll pass that on when %s is around." % tellee
         bot.reply(response)
@@ -281,27 +470,14 @@ def nick_match_tellee(nick, tellee):
 @plugin.output_prefix('[tell] ')
 def message(bot, trigger):
     nick = trigger.nick
+    tell_db = bot.memory['tell_messages']
 
-    if not os.path.exists(bot.tell_filename):
-        # plugin can't work without its storage file
+    # fast path: most messages come from nicks without pending reminders
+    if not tell_db.has_messages(nick):
         return
 
-    # get all matching reminders
-    reminders = []
-    tellees = list(reversed(sorted(
-        tellee
-        for tellee in bot.memory['reminders']
-        if nick_match_tellee(nick, tellee)
-    )))
-
-    with bot.memory['tell_lock']:
-        # pop reminders for nick
-        reminders = list(
-            reminder
-            for tellee in tellees
-            for reminder in get_nick_reminders(
-                bot.memory['reminders'].pop(tellee, []), nick)
-        )
+    reminders = get_nick_reminders(
+        [reminder[1:] for reminder in tell_db.pop(nick)], nick)
 
     # check if there are reminders to send
     if not reminders:
@@ -323,7 +499,3 @@ def message(bot, trigger):
             bot.reply('Further messages sent privately')
             for line in reminders[max_public:]:
                 bot.say(line, nick)
-
-    # save reminders left in memory
-    with bot.memory['tell_lock']:
-        dump_reminders(bot.tell_filename, bot.memory['reminders'])
@@ -10,6 +10,7 @@
 from __future__ import annotations
 
 import functools
+import inspect
 import re
 from typing import Any, Callable, Optional, Pattern, Union
 
@@ -95,10 +96,15 @@ def unblockable(function: Any) -> Any:
     return function
 
 
-def interval(*intervals: Union[int, float]) -> Callable:
+def interval(
+    *intervals: Union[int, float],
+    misfire: Optional[str] = None,
+) -> Callable:
     """Decorate a function to be called by the bot every *n* seconds.
 
     :param int intervals: one or more duration(s), in seconds
+    :param str misfire: what to do when the function missed some runs (see
+                        below)
 
     This decorator can be used multiple times for multiple intervals, or
     multiple intervals can be given in multiple arguments. The first time the
@@ -121,6 +127,20 @@ def interval(*intervals: Union[int, float]) -> Callable:
             if "#here" in bot.channels:
                 bot.say("It has been five seconds!", "#here")
 
+    A function can miss some runs, for example when its previous call took
+    longer than its interval. By default, it is called once as soon as
+    possible, and the missed runs are forgotten. The ``misfire`` argument
+    changes that:
+
+    * ``'coalesce'`` (the default): call it once as soon as possible
+    * ``'skip'``: wait for its next scheduled time, as if nothing was missed
+    * ``'catch_up'``: call it once for each missed run, as soon as possible
+
+    .. versionchanged:: 8.0
+
+        Intervals can be less than a second. The ``misfire`` parameter has
+        been added.
+
     """
     def add_attribute(function):
         function._sopel_callable = True
@@ -129,6 +149,8 @@ def interval(*intervals: Union[int, float]) -> Callable:
         for arg in intervals:
             if arg not in function.interval:
                 function.interval.append(arg)
+        if misfire is not None:
+            function.misfire = misfire
         return function
 
     return add_attribute
@@ -1041,6 +1063,45 @@ def rate_global(
     return add_attribute
 
 
+def _guard(
+    function: Callable,
+    is_allowed: Callable[[Any, Any], bool],
+    message: Union[Callable, Optional[str]],
+    reply: bool,
+) -> Callable:
+    """Wrap ``function`` to run only if ``is_allowed(bot, trigger)``.
+
+    Otherwise, the ``message`` (if any) is said or replied. When ``function``
+    is a coroutine function, so is the wrapper, which awaits both the
+    ``function`` and the ``message`` sent by the asynchronous ``bot``.
+    """
+    def deny(bot):
+        if message and not callable(message):
+            if reply:
+                return bot.reply(message)
+            return bot.say(message)
+        return None
+
+    if inspect.iscoroutinefunction(function):
+        @functools.wraps(function)
+        async def async_guarded(bot, trigger, *args, **kwargs):
+            if is_allowed(bot, trigger):
+                return await function(bot, trigger, *args, **kwargs)
+            denied = deny(bot)
+            if inspect.isawaitable(denied):
+                await denied
+
+        return async_guarded
+
+    @functools.wraps(function)
+    def guarded(bot, trigger, *args, **kwargs):
+        if is_allowed(bot, trigger):
+            return function(bot, trigger, *args, **kwargs)
+        deny(bot)
+
+    return guarded
+
+
 def require_privmsg(
     message: Union[Callable, Optional[str]] = None,
     reply: bool = False,
@@ -1061,17 +1122,12 @@ def require_privmsg(
         Added the ``reply`` parameter.
     """
     def actual_decorator(function):
-        @functools.wraps(function)
-        def guarded(bot, trigger, *args, **kwargs):
-            if trigger.is_privmsg:
-                return function(bot, trigger, *args, **kwargs)
-            else:
-                if message and not callable(message):
-                    if reply:
-                        bot.reply(message)
-                    else:
-                        bot.say(message)
-        return guarded
+        return _guard(
+            function,
+            lambda bot, trigger: trigger.is_privmsg,
+            message,
+            reply,
+        )
 
     # Hack to allow decorator without parens
     if callable(message):
@@ -1109,17 +1165,12 @@ def require_chanmsg(
         Added the ``reply`` parameter.
     """
     def actual_decorator(function):
-        @functools.wraps(function)
-        def guarded(bot, trigger, *args, **kwargs):
-            if not trigger.is_privmsg:
-                return function(bot, trigger, *args, **kwargs)
-            else:
-                if message and not callable(message):
-                    if reply:
-                        bot.reply(message)
-                    else:
-                        bot.say(message)
-        return guarded
+        return _guard(
+            function,
+            lambda bot, trigger: not trigger.is_privmsg,
+            message,
+            reply,
+        )
 
     # Hack to allow decorator without parens
     if callable(message):
@@ -1157,17 +1208,12 @@ def require_account(
 
     """
     def actual_decorator(function):
-        @functools.wraps(function)
-        def guarded(bot, trigger, *args, **kwargs):
-            if not trigger.account:
-                if message and not callable(message):
-                    if reply:
-                        bot.reply(message)
-                    else:
-                        bot.say(message)
-            else:
-                return function(bot, trigger, *args, **kwargs)
-        return guarded
+        return _guard(
+            function,
+            lambda bot, trigger: bool(trigger.account),
+            message,
+            reply,
+        )
 
     # Hack to allow decorator without parens
     if callable(message):
@@ -1200,23 +1246,15 @@ def require_privilege(
     .. versionchanged:: 7.0
         Added the ``reply`` parameter.
     """
+    def is_allowed(bot, trigger):
+        # If this is a privmsg, ignore privilege requirements
+        if trigger.is_privmsg:
+            return True
+        channel_privs = bot.channels[trigger.sender].privileges
+        return channel_privs.get(trigger.nick, 0) >= level
+
     def actual_decorator(function):
-        @functools.wraps(function)
-        def guarded(bot, trigger, *args, **kwargs):
-            # If this is a privmsg, ignore privilege requirements
-            if trigger.is_privmsg:
-                return function(bot, trigger, *args, **kwargs)
-            channel_privs = bot.channels[trigger.sender].privileges
-            allowed = channel_privs.get(trigger.nick, 0) >= level
-            if not trigger.is_privmsg and not allowed:
-                if message and not callable(message):
-                    if reply:
-                        bot.reply(message)
-                    else:
-                        bot.say(message)
-            else:
-                return function(bot, trigger, *args, **kwargs)
-        return guarded
+        return _guard(function, is_allowed, message, reply)
     return actual_decorator
 
 
@@ -1240,17 +1278,12 @@ def require_admin(
         Added the ``reply`` parameter.
     """
     def actual_decorator(function):
-        @functools.wraps(function)
-        def guarded(bot, trigger, *args, **kwargs):
-            if not trigger.admin:
-                if message and not callable(message):
-                    if reply:
-                        bot.reply(message)
-                    else:
-                        bot.say(message)
-            else:
-                return function(bot, trigger, *args, **kwargs)
-        return guarded
+        return _guard(
+            function,
+            lambda bot, trigger: bool(trigger.admin),
+            message,
+            reply,
+        )
 
     # Hack to allow decorator without parens
     if callable(message):
@@ -1279,17 +1312,12 @@ def require_owner(
         Added the ``reply`` parameter.
     """
     def actual_decorator(function):
-        @functools.wraps(function)
-        def guarded(bot, trigger, *args, **kwargs):
-            if not trigger.owner:
-                if message and not callable(message):
-                    if reply:
-                        bot.reply(message)
-                    else:
-                        bot.say(message)
-            else:
-                return function(bot, trigger, *args, **kwargs)
-        return guarded
+        return _guard(
+            function,
+            lambda bot, trigger: bool(trigger.owner),
+            message,
+            reply,
+        )
 
     # Hack to allow decorator without parens
     if callable(message):
@@ -1321,22 +1349,15 @@ def require_bot_privilege(
 
     .. versionadded:: 7.1
     """
+    def is_allowed(bot, trigger):
+        # If this is a privmsg, ignore privilege requirements
+        return (
+            trigger.is_privmsg or
+            bot.has_channel_privilege(trigger.sender, level)
+        )
+
     def actual_decorator(function):
-        @functools.wraps(function)
-        def guarded(bot, trigger, *args, **kwargs):
-            # If this is a privmsg, ignore privilege requirements
-            if trigger.is_privmsg:
-                return function(bot, trigger, *args, **kwargs)
-
-            if not bot.has_channel_privilege(trigger.sender, level):
-                if message and not callable(message):
-                    if reply:
-                        bot.reply(message)
-                    else:
-                        bot.say(message)
-            else:
-                return function(bot, trigger, *args, **kwargs)
-        return guarded
+        return _guard(function, is_allowed, message, reply)
     return actual_decorator
 
 
@@ -16,7 +16,6 @@
 # Licensed under the Eiffel Forum License 2.
 from __future__ import annotations
 
-import itertools
 import logging
 
 from sopel import tools
@@ -30,6 +29,8 @@ class Scheduler(jobs.Scheduler):
 
     :param manager: bot instance passed to jobs as argument
     :type manager: :class:`sopel.bot.Sopel`
+    :param int max_workers: maximum number of threads running jobs at the
+                            same time
 
     Scheduler that stores plugin jobs and behaves like its
     :class:`parent class <sopel.tools.jobs.Scheduler>`.
@@ -49,13 +50,14 @@ class Scheduler(jobs.Scheduler):
         a job, plugin authors should use :func:`sopel.plugin.interval`.
 
     """
-    def __init__(self, manager):
-        super().__init__(manager)
+    def __init__(self, manager, max_workers=4):
+        super().__init__(manager, max_workers=max_workers)
         self._jobs = tools.SopelMemoryWithDefault(list)
 
     def register(self, job):
         with self._mutex:
             self._jobs[job.get_plugin_name()].append(job)
+            self._schedule(job)
         LOGGER.debug('Job registered: %s', str(job))
 
     def unregister_plugin(self, plugin_name):
@@ -72,9 +74,10 @@ class Scheduler(jobs.Scheduler):
         """
         unregistered_jobs = 0
         with self._mutex:
-            jobs_count = len(self._jobs[plugin_name])
-            del self._jobs[plugin_name]
-            unregistered_jobs = unregistered_jobs + jobs_count
+            jobs = self._jobs.pop(plugin_name, [])
+            for job in jobs:
+                self._unschedule(job)
+            unregistered_jobs = unregistered_jobs + len(jobs)
 
         LOGGER.debug(
             '[%s] Successfully unregistered %d jobs',
@@ -86,6 +89,7 @@ class Scheduler(jobs.Scheduler):
     def clear_jobs(self):
         with self._mutex:
             self._jobs = tools.SopelMemoryWithDefault(list)
+            self._unschedule_all()
 
         LOGGER.debug('Successfully unregistered all jobs')
 
@@ -95,16 +99,10 @@ class Scheduler(jobs.Scheduler):
             return
 
         with self._mutex:
+            for job in self._jobs[plugin_name]:
+                if job._handler == callable:
+                    self._unschedule(job)
             self._jobs[plugin_name] = [
                 job for job in self._jobs[plugin_name]
                 if job._handler != callable
             ]
-
-    def _get_ready_jobs(self, now):
-        with self._mutex:
-            jobs = [
-                job for job in itertools.chain(*self._jobs.values())
-                if job.is_ready_to_run(now)
-            ]
-
-        return jobs
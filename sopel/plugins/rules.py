@@ -19,6 +19,7 @@ from __future__ import annotations
 import abc
 import datetime
 import functools
+import heapq
 import inspect
 import itertools
 import logging
@@ -30,6 +31,7 @@ from typing import (
     Generator,
     Iterable,
     Optional,
+    Tuple,
     Type,
     TYPE_CHECKING,
     TypeVar,
@@ -77,6 +79,18 @@ PRIORITY_SCALES = {
 # Can be implementation-dependent
 _regex_type = type(re.compile(''))
 
+# Regex special characters: a command name with any of them is a pattern
+_REGEX_SPECIAL_CHARS = set('.^$*+?{}[]\\|()')
+
+# Flags of the patterns used to match named rules by name
+_NAME_PATTERN_FLAGS = re.IGNORECASE | re.VERBOSE
+
+# Backreferences and conditionals depend on group numbers and names
+_BACKREFERENCE = re.compile(r'\\[1-9]|\(\?P=|\(\?\(')
+
+# Maximum number of (event, CTCP) entries cached by the rules index
+_MAX_DISPATCH_ENTRIES = 512
+
 
 def _clean_rules(rules, nick, aliases):
     for pattern in rules:
@@ -154,6 +168,251 @@ def _clean_callable_examples(examples):
     )
 
 
+def _get_name_pattern(rule):
+    """Get a regex pattern for the start of lines that may trigger ``rule``.
+
+    :param rule: the rule to index
+    :type rule: :class:`AbstractRule`
+    :return: a tuple of ``(kind, pattern)``, or ``None`` if the rule can't
+             be matched by name
+
+    The pattern matches the rule's prefix (or nicknames) and its name or
+    aliases, without the rest of the line. It must be used with the
+    ``re.IGNORECASE`` and ``re.VERBOSE`` flags, as the rule's own regex.
+
+    A named rule can be matched by name only when it uses the default regex
+    and matching logic of its class. Any other rule must be tried against
+    every line.
+    """
+    if not isinstance(rule, AbstractNamedRule):
+        return None
+
+    rule_type = type(rule)
+    if rule_type.match is not Rule.match or rule_type.parse is not Rule.parse:
+        return None
+
+    names = '|'.join(
+        rule.escape_name(name) for name in (rule.name,) + rule.aliases)
+
+    if (
+        isinstance(rule, Command)
+        and rule_type.get_rule_regex is Command.get_rule_regex
+    ):
+        kind = 'command'
+        prefix = re.sub(r"(\s)", r"\\\1", rule._prefix)
+        pattern = '(?:%s\n)(?:%s\n)' % (prefix, names)
+    elif (
+        isinstance(rule, NickCommand)
+        and rule_type.get_rule_regex is NickCommand.get_rule_regex
+    ):
+        kind = 'nick_command'
+        nicks = '|'.join(
+            re.escape(nick) for nick in rule._nick_aliases + (rule._nick,))
+        pattern = '(?:%s)[:,]?\\s+(?:%s\n)' % (nicks, names)
+    elif (
+        isinstance(rule, ActionCommand)
+        and rule_type.get_rule_regex is ActionCommand.get_rule_regex
+    ):
+        kind = 'action_command'
+        pattern = '(?:%s\n)' % names
+    else:
+        return None
+
+    pattern = pattern + r'(?=\s|$)'
+    try:
+        regex = re.compile(pattern, _NAME_PATTERN_FLAGS)
+    except re.error:
+        return None
+
+    if regex.groupindex or _BACKREFERENCE.search(pattern):
+        # named groups would clash, and numbered groups would shift
+        return None
+
+    return kind, pattern
+
+
+class _CommandMatcher:
+    """Multi-pattern matcher for named rules.
+
+    :param rules: a sequence of ``(position, rule, pattern)``, in dispatch
+                  order, where ``pattern`` comes from
+                  :func:`_get_name_pattern`
+    :raise re.error: when the patterns can't be compiled together
+
+    All patterns are compiled into one regex, so a line is matched against
+    every named rule in one pass. The rules found still have to match the
+    line themselves to get their match objects.
+    """
+    def __init__(self, rules: Iterable[Tuple[int, AbstractRule, str]]) -> None:
+        items = tuple(rules)
+        self._rules = tuple((position, rule) for position, rule, _ in items)
+        lookaheads = [
+            '(?=(?:%s)(?P<_%d>))' % (pattern, index)
+            for index, (_, _, pattern) in enumerate(items)
+        ]
+        # first and last rules found tell if there is only one rule to find
+        self._first = re.compile('|'.join(lookaheads), _NAME_PATTERN_FLAGS)
+        self._last = re.compile(
+            '|'.join(reversed(lookaheads)), _NAME_PATTERN_FLAGS)
+        self._all = re.compile(
+            ''.join('(?:%s|)' % lookahead for lookahead in lookaheads),
+            _NAME_PATTERN_FLAGS)
+
+    def find(self, text: str) -> Tuple[Tuple[int, AbstractRule], ...]:
+        """Find the rules that may match ``text``.
+
+        :param text: the text of the line
+        :return: a tuple of ``(position, rule)``, in dispatch order
+        """
+        first = self._first.match(text)
+        if first is None:
+            return ()
+
+        first_index = int(first.lastgroup[1:])
+        last = self._last.match(text)
+        if int(last.lastgroup[1:]) == first_index:
+            return (self._rules[first_index],)
+
+        found = self._all.match(text).groupdict()
+        return tuple(
+            self._rules[int(name[1:])]
+            for name, value in found.items()
+            if value is not None
+        )
+
+
+class _DispatchRules:
+    """Rules that can match lines of a given event and CTCP command.
+
+    :param rules: a sequence of ``(position, rule, name_pattern)``, in
+                  dispatch order
+    :param get_matcher: a function that returns a :class:`_CommandMatcher`
+                        for a sequence of ``(position, rule, pattern)``,
+                        or ``None`` if there is no matcher for them
+
+    Named rules are found with a matcher per kind of named rule; every other
+    rule must be tried for each line.
+    """
+    def __init__(self, rules, get_matcher) -> None:
+        scan = []
+        named: Dict[str, list] = {}
+
+        for position, rule, name_pattern in rules:
+            if name_pattern is None:
+                scan.append((position, rule))
+            else:
+                kind, pattern = name_pattern
+                named.setdefault(kind, []).append((position, rule, pattern))
+
+        matchers = []
+        for items in named.values():
+            matcher = get_matcher(tuple(items))
+            if matcher is None:
+                scan.extend((position, rule) for position, rule, _ in items)
+            else:
+                matchers.append(matcher)
+
+        scan.sort(key=lambda item: item[0])
+        self._scan = tuple(scan)
+        self._scan_rules = tuple(rule for _, rule in scan)
+        self._matchers = tuple(matchers)
+
+    def get_candidates(self, text: str) -> Iterable[AbstractRule]:
+        """Get the rules that may match the ``text``, in dispatch order.
+
+        :param text: the text of the line
+        """
+        found = [
+            items
+            for items in (matcher.find(text) for matcher in self._matchers)
+            if items
+        ]
+
+        if not found:
+            return self._scan_rules
+
+        return (
+            rule
+            for _, rule in heapq.merge(self._scan, *found)
+        )
+
+
+class _RulesIndex:
+    """Index of registered rules, by event and CTCP command.
+
+    :param rules: every registered rule, in dispatch order
+
+    The index is built once from the rules registered in a :class:`Manager`,
+    and replaced whenever a rule is registered or a plugin is unregistered.
+    """
+    def __init__(self, rules: Iterable[AbstractRule]) -> None:
+        self._rules = tuple(
+            (position, rule, _get_name_pattern(rule))
+            for position, rule in enumerate(rules)
+        )
+        self._dispatch: Dict[Tuple[str, Optional[str]], _DispatchRules] = {}
+        self._matchers: Dict[tuple, Optional[_CommandMatcher]] = {}
+        self._events: Dict[str, bool] = {}
+
+    def _get_matcher(self, items) -> Optional[_CommandMatcher]:
+        # the same rules match many events & CTCP commands: compile once
+        key = tuple(position for position, _, _ in items)
+        if key not in self._matchers:
+            try:
+                self._matchers[key] = _CommandMatcher(items)
+            except re.error as error:
+                LOGGER.warning(
+                    'Unable to compile named rules together, '
+                    'they will be matched one by one: %s', error)
+                self._matchers[key] = None
+
+        return self._matchers[key]
+
+    def has_event_rules(self, event: str) -> bool:
+        """Tell if any rule can match lines of an ``event``.
+
+        :param event: the IRC event (command or numeric) of a line
+        """
+        listened = self._events.get(event)
+
+        if listened is None:
+            listened = any(
+                rule.match_event(event) for _, rule, _ in self._rules)
+            # events come from the server, but better safe than sorry
+            if len(self._events) < _MAX_DISPATCH_ENTRIES:
+                self._events[event] = listened
+
+        return listened
+
+    def get_dispatch_rules(
+        self,
+        event: str,
+        ctcp: Optional[str],
+    ) -> _DispatchRules:
+        """Get the rules that can match an ``event`` and a ``ctcp`` command.
+
+        :param event: the IRC event (command or numeric) of a line
+        :param ctcp: the CTCP command of a line, if any
+        """
+        key = (event, ctcp)
+        dispatch_rules = self._dispatch.get(key)
+
+        if dispatch_rules is None:
+            dispatch_rules = _DispatchRules(
+                (
+                    item
+                    for item in self._rules
+                    if item[1].match_event(event) and item[1].match_ctcp(ctcp)
+                ),
+                self._get_matcher,
+            )
+            # CTCP commands are user input: don't let them fill the memory
+            if len(self._dispatch) < _MAX_DISPATCH_ENTRIES:
+                self._dispatch[key] = dispatch_rules
+
+        return dispatch_rules
+
+
 class Manager:
     """Manager of plugin rules.
 
@@ -171,6 +430,13 @@ class Manager:
     Then to match the rules against a ``trigger``, see the
     :meth:`get_triggered_rules`, which returns a list of ``(rule, match)``,
     sorted by priorities (high first, medium second, and low last).
+
+    Registered rules are indexed by the events and CTCP commands they match
+    (see :meth:`AbstractRule.match_event` and
+    :meth:`AbstractRule.match_ctcp`), and commands are looked up by their
+    names and aliases (all at once, see :class:`_CommandMatcher`), so a line
+    is matched only against the rules that can possibly match it. The index
+    is rebuilt after any change to the registered rules.
     """
     def __init__(self):
         self._rules = tools.SopelMemoryWithDefault(list)
@@ -179,6 +445,7 @@ class Manager:
         self._action_commands = tools.SopelMemoryWithDefault(dict)
         self._url_callbacks = tools.SopelMemoryWithDefault(list)
         self._register_lock = threading.Lock()
+        self._index: Optional[_RulesIndex] = None
 
     def unregister_plugin(self, plugin_name):
         """Unregister all the rules from a plugin.
@@ -204,6 +471,7 @@ class Manager:
                 rules_count = len(registry[plugin_name])
                 del registry[plugin_name]
                 unregistered_rules = unregistered_rules + rules_count
+            self._index = None
 
         LOGGER.debug(
             '[%s] Successfully unregistered %d rules',
@@ -220,6 +488,7 @@ class Manager:
         """
         with self._register_lock:
             self._rules[rule.get_plugin_name()].append(rule)
+            self._index = None
         LOGGER.debug('Rule registered: %s', str(rule))
 
     def register_command(self, command):
@@ -231,6 +500,7 @@ class Manager:
         with self._register_lock:
             plugin = command.get_plugin_name()
             self._commands[plugin][command.name] = command
+            self._index = None
         LOGGER.debug('Command registered: %s', str(command))
 
     def register_nick_command(self, command):
@@ -242,6 +512,7 @@ class Manager:
         with self._register_lock:
             plugin = command.get_plugin_name()
             self._nick_commands[plugin][command.name] = command
+            self._index = None
         LOGGER.debug('Nick Command registered: %s', str(command))
 
     def register_action_command(self, command):
@@ -253,6 +524,7 @@ class Manager:
         with self._register_lock:
             plugin = command.get_plugin_name()
             self._action_commands[plugin][command.name] = command
+            self._index = None
         LOGGER.debug('Action Command registered: %s', str(command))
 
     def register_url_callback(self, url_callback):
@@ -264,6 +536,7 @@ class Manager:
         with self._register_lock:
             plugin = url_callback.get_plugin_name()
             self._url_callbacks[plugin].append(url_callback)
+            self._index = None
         LOGGER.debug('URL callback registered: %s', str(url_callback))
 
     def has_rule(self, label, plugin=None):
@@ -396,6 +669,47 @@ class Manager:
         # expose a copy of the registered generic rules
         return self._url_callbacks.items()
 
+    def _get_index(self) -> _RulesIndex:
+        index = self._index
+        if index is not None:
+            return index
+
+        with self._register_lock:
+            if self._index is None:
+                rules = itertools.chain(
+                    itertools.chain(*self._rules.values()),
+                    itertools.chain(*(
+                        rules_dict.values()
+                        for rules_dict in self._commands.values())),
+                    itertools.chain(*(
+                        rules_dict.values()
+                        for rules_dict in self._nick_commands.values())),
+                    itertools.chain(*(
+                        rules_dict.values()
+                        for rules_dict in self._action_commands.values())),
+                    itertools.chain(*self._url_callbacks.values()),
+                )
+                # sorting is stable: registration order is kept by priority
+                self._index = _RulesIndex(
+                    sorted(rules, key=lambda rule: rule.priority_scale))
+
+            return self._index
+
+    def has_event_rules(self, event: str) -> bool:
+        """Tell if any registered rule can match lines of this ``event``.
+
+        :param event: the IRC event (command or numeric) of a line
+        :return: ``True`` if at least one rule listens to ``event``,
+                 ``False`` otherwise
+
+        When this returns ``False``, :meth:`get_triggered_rules` can't return
+        anything for a line of this ``event``: the bot can skip the dispatch
+        of such lines entirely.
+
+        .. versionadded:: 8.0
+        """
+        return self._get_index().has_event_rules(event)
+
     def get_triggered_rules(self, bot, pretrigger):
         """Get triggered rules with their match objects, sorted by priorities.
 
@@ -406,38 +720,23 @@ class Manager:
         :return: a tuple of ``(rule, match)``, sorted by priorities
         :rtype: tuple
         """
-        generic_rules = self._rules.values()
-        command_rules = (
-            rules_dict.values()
-            for rules_dict in self._commands.values())
-        nick_rules = (
-            rules_dict.values()
-            for rules_dict in self._nick_commands.values())
-        action_rules = (
-            rules_dict.values()
-            for rules_dict in self._action_commands.values())
-        url_callback_rules = self._url_callbacks.values()
-
-        rules = itertools.chain(
-            itertools.chain(*generic_rules),
-            itertools.chain(*command_rules),
-            itertools.chain(*nick_rules),
-            itertools.chain(*action_rules),
-            itertools.chain(*url_callback_rules),
-        )
-        matches = (
-            (rule, match)
-            for rule in rules
-            for match in rule.match(bot, pretrigger)
-        )
-        # Returning a tuple instead of a sorted object ensures that:
+        args = pretrigger.args
+        text = args[-1] if args else ''
+        dispatch_rules = self._get_index().get_dispatch_rules(
+            pretrigger.event, pretrigger.ctcp)
+
+        # Returning a tuple instead of a generator ensures that:
         #   1. it's not a lazy object
         #   2. it's an immutable iterable
         # We can't accept lazy evaluation or yield results; it has to be a
         # static list of (rule/match), otherwise Python will raise an error
         # if any rule execution tries to alter the list of registered rules.
         # Making it immutable is the cherry on top.
-        return tuple(sorted(matches, key=lambda x: x[0].priority_scale))
+        return tuple(
+            (rule, match)
+            for rule in dispatch_rules.get_candidates(text)
+            for match in rule.match(bot, pretrigger)
+        )
 
     def check_url_callback(self, bot, url):
         """Tell if the ``url`` matches any of the registered URL callbacks.
@@ -813,6 +1112,36 @@ class AbstractRule(abc.ABC):
         This is the method called by the bot when a rule matches a ``trigger``.
         """
 
+    def is_async(self) -> bool:
+        """Tell if the rule must be executed as a coroutine.
+
+        :return: ``True`` if the rule must be executed with
+                 :meth:`execute_async`, ``False`` otherwise
+        :rtype: bool
+
+        An asynchronous rule is executed on the event loop of the bot's
+        backend instead of a thread. By default, a rule is not asynchronous.
+
+        .. versionadded:: 8.0
+        """
+        return False
+
+    async def execute_async(self, bot, trigger):
+        """Execute the triggered rule as a coroutine.
+
+        :param bot: Sopel wrapper
+        :type bot: :class:`sopel.bot.AsyncSopelWrapper`
+        :param trigger: IRC line
+        :type trigger: :class:`sopel.trigger.Trigger`
+
+        This is the method awaited by the bot when an
+        :meth:`asynchronous rule<is_async>` matches a ``trigger``.
+
+        .. versionadded:: 8.0
+        """
+        raise NotImplementedError(
+            'Rule %s is not asynchronous.' % self.get_rule_label())
+
 
 class Rule(AbstractRule):
     """Generic rule definition.
@@ -1138,6 +1467,9 @@ class Rule(AbstractRule):
     def is_threaded(self):
         return self._threaded
 
+    def is_async(self):
+        return inspect.iscoroutinefunction(self._handler)
+
     def is_unblockable(self):
         return self._unblockable
 
@@ -1208,6 +1540,25 @@ class Rule(AbstractRule):
         # return exit code
         return exit_code
 
+    async def execute_async(self, bot, trigger):
+        if not self._handler:
+            raise RuntimeError('Improperly configured rule: no handler')
+
+        user_metrics: RuleMetrics = self._metrics_nick.setdefault(
+            trigger.nick, RuleMetrics())
+        sender_metrics: RuleMetrics = self._metrics_sender.setdefault(
+            trigger.sender, RuleMetrics())
+
+        # await the handler
+        with user_metrics, sender_metrics, self._metrics_global:
+            exit_code = await self._handler(bot, trigger)
+            user_metrics.set_return_value(exit_code)
+            sender_metrics.set_return_value(exit_code)
+            self._metrics_global.set_return_value(exit_code)
+
+        # return exit code
+        return exit_code
+
 
 class AbstractNamedRule(Rule):
     """Abstract base class for named rules.
@@ -1265,7 +1616,7 @@ class AbstractNamedRule(Rule):
             name. This feature will be removed in Sopel 8.0.**
 
         """
-        if set('.^$*+?{}[]\\|()') & set(name):
+        if _REGEX_SPECIAL_CHARS & set(name):
             # the name contains a regex pattern special character
             # we assume the user knows what they are doing
             try:
@@ -1751,9 +2102,14 @@ class URLCallback(Rule):
         argspec = inspect.getfullargspec(handler)
 
         if len(argspec.args) >= match_count:
-            @functools.wraps(handler)
-            def execute_handler(bot, trigger):
-                return handler(bot, trigger, match=trigger)
+            if inspect.iscoroutinefunction(handler):
+                @functools.wraps(handler)
+                async def execute_handler(bot, trigger):
+                    return await handler(bot, trigger, match=trigger)
+            else:
+                @functools.wraps(handler)
+                def execute_handler(bot, trigger):
+                    return handler(bot, trigger, match=trigger)
 
         kwargs.update({
             'handler': execute_handler,
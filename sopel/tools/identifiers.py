@@ -35,7 +35,8 @@ which should be provided by the :class:`bot<sopel.bot.Sopel>`.
 from __future__ import annotations
 
 import string
-from typing import Callable
+from typing import Callable, MutableMapping, Optional, Tuple, Type
+import weakref
 
 Casemapping = Callable[[str], str]
 
@@ -118,8 +119,22 @@ class Identifier(str):
 
         The ``casemapping`` and ``chantypes`` parameters have been added.
 
+    .. versionchanged:: 8.0
+
+        The lowercase version of the identifier is computed once, when the
+        identifier is created, then reused by :meth:`lower`, hashing, and
+        comparisons with another identifier using the same casemapping.
+        The default :attr:`casemapping` and :attr:`chantypes` are shared by
+        every identifier instead of being stored by each of them.
+
     .. __: https://modern.ircdocs.horse/index.html#casemapping-parameter
     """
+    casemapping: Casemapping = staticmethod(rfc1459_lower)  # type: ignore
+    """Casemapping function to lower the identifier."""
+    chantypes: tuple = DEFAULT_CHANTYPES
+    """Tuple of prefixes used for channels."""
+    _lowered: Optional[str] = None
+
     def __new__(
         cls,
         identifier: str,
@@ -137,11 +152,57 @@ class Identifier(str):
         chantypes: tuple = DEFAULT_CHANTYPES,
     ) -> None:
         super().__init__()
-        self.casemapping: Casemapping = casemapping
-        """Casemapping function to lower the identifier."""
-        self.chantypes = chantypes
-        """Tuple of prefixes used for channels."""
-        self._lowered = self.casemapping(identifier)
+        # only store what differs from the shared defaults
+        if casemapping is not rfc1459_lower:
+            self.casemapping = casemapping
+        if chantypes != DEFAULT_CHANTYPES:
+            self.chantypes = chantypes
+
+        lowered = casemapping(identifier)
+        if not str.__eq__(lowered, identifier):
+            self._lowered = lowered
+
+    @classmethod
+    def interned(
+        cls,
+        identifier: str,
+        *,
+        casemapping: Casemapping = rfc1459_lower,
+        chantypes: tuple = DEFAULT_CHANTYPES,
+    ) -> 'Identifier':
+        """Get a shared identifier for ``identifier``.
+
+        :param identifier: IRC identifier
+        :param casemapping: a casemapping function (optional keyword argument)
+        :param chantypes: a tuple of channel prefixes (optional keyword
+                          argument)
+        :return: an identifier equal to ``identifier``
+
+        As long as it is used somewhere, the same object is returned for the
+        same name, ``casemapping``, and ``chantypes``: a user seen in many
+        channels, or on every line they send, is represented by one object
+        only. Such an identifier is shared, so it must not be modified.
+
+        .. versionadded:: 8.0
+        """
+        if (
+            type(identifier) is cls and
+            identifier.casemapping is casemapping and
+            identifier.chantypes == chantypes
+        ):
+            # already an identifier for the same context
+            return identifier  # type: ignore[return-value]
+
+        # the exact name is the key: case doesn't matter to identifiers
+        key = (cls, str(identifier), casemapping, chantypes)
+        try:
+            return _INTERNED[key]
+        except KeyError:
+            pass
+
+        instance = cls(identifier, casemapping=casemapping, chantypes=chantypes)
+        _INTERNED[key] = instance
+        return instance
 
     def lower(self) -> str:
         """Get the IRC-compliant lowercase version of this identifier.
@@ -158,7 +219,9 @@ class Identifier(str):
             Now uses the :attr:`casemapping` function to lower the identifier.
 
         """
-        return self.casemapping(self)
+        if self._lowered is not None:
+            return self._lowered
+        return str.__str__(self)
 
     @staticmethod
     def _lower(identifier: str):
@@ -219,33 +282,47 @@ class Identifier(str):
             self.__str__()
         )
 
+    def _key(self) -> str:
+        # the identifier itself when already lowercase: its hash is cached
+        if self._lowered is not None:
+            return self._lowered
+        return self
+
+    def _lower_other(self, other):
+        if (
+            isinstance(other, Identifier) and
+            other.casemapping is self.casemapping
+        ):
+            return other._key()
+        return self.casemapping(other)
+
     def __hash__(self):
-        return self._lowered.__hash__()
+        return str.__hash__(self._key())
 
     def __lt__(self, other):
         if isinstance(other, str):
-            other = self.casemapping(other)
-        return str.__lt__(self._lowered, other)
+            other = self._lower_other(other)
+        return str.__lt__(self._key(), other)
 
     def __le__(self, other):
         if isinstance(other, str):
-            other = self.casemapping(other)
-        return str.__le__(self._lowered, other)
+            other = self._lower_other(other)
+        return str.__le__(self._key(), other)
 
     def __gt__(self, other):
         if isinstance(other, str):
-            other = self.casemapping(other)
-        return str.__gt__(self._lowered, other)
+            other = self._lower_other(other)
+        return str.__gt__(self._key(), other)
 
     def __ge__(self, other):
         if isinstance(other, str):
-            other = self.casemapping(other)
-        return str.__ge__(self._lowered, other)
+            other = self._lower_other(other)
+        return str.__ge__(self._key(), other)
 
     def __eq__(self, other):
         if isinstance(other, str):
-            other = self.casemapping(other)
-        return str.__eq__(self._lowered, other)
+            other = self._lower_other(other)
+        return str.__eq__(self._key(), other)
 
     def __ne__(self, other):
         return not (self == other)
@@ -278,3 +355,9 @@ class Identifier(str):
 
         """
         return bool(self) and not self.startswith(self.chantypes)
+
+
+_INTERNED: MutableMapping[
+    Tuple[Type[Identifier], str, Casemapping, tuple],
+    Identifier,
+] = weakref.WeakValueDictionary()
@@ -13,25 +13,40 @@
 # Licensed under the Eiffel Forum License 2.
 from __future__ import annotations
 
+import heapq
 import inspect
+import itertools
 import logging
+import math
 import threading
 import time
 
+from sopel.tools import workers
+
 
 LOGGER = logging.getLogger(__name__)
 
+MISFIRE_COALESCE = 'coalesce'
+"""Run a job once as soon as possible, however many runs it missed."""
+MISFIRE_SKIP = 'skip'
+"""Skip the runs a job missed, and wait for its next scheduled time."""
+MISFIRE_CATCH_UP = 'catch_up'
+"""Run a job once for each run it missed, as soon as possible."""
+MISFIRE_POLICIES = (MISFIRE_COALESCE, MISFIRE_SKIP, MISFIRE_CATCH_UP)
+
 
 class Scheduler(threading.Thread):
     """Generic Job Scheduler.
 
     :param object manager: manager passed to jobs as argument
+    :param int max_workers: maximum number of threads running jobs at the
+                            same time
 
     Scheduler is a :class:`thread <threading.Thread>` that keeps track of
-    :class:`Jobs <Job>` and periodically checks which ones are ready to
-    execute. When ready, their :meth:`~Job.execute` method is called, either
-    in a separate thread or in the scheduler's thread (it depends on the
-    job's :meth:`~Job.is_threaded` method).
+    :class:`Jobs <Job>` and executes them when they are ready. Their
+    :meth:`~Job.execute` method is called, either by a pool of worker threads
+    or in the scheduler's thread (it depends on the job's
+    :meth:`~Job.is_threaded` method).
 
     It can be started as any other thread::
 
@@ -42,10 +57,15 @@ class Scheduler(threading.Thread):
     Then it runs forever until the :meth:`stop` method is called, usually when
     the bot shuts down.
 
+    Jobs are kept in a heap, ordered by their next time to run: the scheduler
+    sleeps until the earliest of them is ready, and wakes up early when a job
+    is registered or removed. An idle scheduler costs nothing, whatever the
+    number of jobs, and jobs run on time, even with sub-second intervals.
+
     .. note::
 
-        Thread safety is ensured with threading's :class:`~threading.Lock`
-        and :class:`~threading.Event` when:
+        Thread safety is ensured with threading's
+        :class:`~threading.Condition` and :class:`~threading.Event` when:
 
         * a job is :meth:`registered <register>` or
           :meth:`removed <remove_callable_job>`
@@ -62,8 +82,14 @@ class Scheduler(threading.Thread):
         for Sopel core development and advanced developers. It is subject to
         rapid changes between versions without much (or any) warning.
 
+    .. versionchanged:: 8.0
+
+        Jobs are kept in a heap instead of being checked every second, and
+        threaded jobs are executed by a bounded pool of threads. The
+        ``max_workers`` parameter has been added.
+
     """
-    def __init__(self, manager):
+    def __init__(self, manager, max_workers=4):
         threading.Thread.__init__(self)
         self.manager = manager
         """Job manager, used as argument for jobs."""
@@ -71,6 +97,11 @@ class Scheduler(threading.Thread):
         """Stopping flag. See :meth:`stop`."""
         self._jobs = []
         self._mutex = threading.Lock()
+        self._wakeup = threading.Condition(self._mutex)
+        self._queue = []
+        self._entries = {}
+        self._counter = itertools.count()
+        self._pool = workers.WorkerPool(max(max_workers, 1), name='Jobs')
 
     def register(self, job):
         """Register a Job to the current job queue.
@@ -82,6 +113,7 @@ class Scheduler(threading.Thread):
         """
         with self._mutex:
             self._jobs.append(job)
+            self._schedule(job)
         LOGGER.debug('Job registered: %s', str(job))
 
     def clear_jobs(self):
@@ -92,6 +124,7 @@ class Scheduler(threading.Thread):
         """
         with self._mutex:
             self._jobs = []
+            self._unschedule_all()
 
     def stop(self):
         """Ask the job scheduler to stop.
@@ -105,7 +138,9 @@ class Scheduler(threading.Thread):
 
         Note that this won't cancel or stop any currently running jobs.
         """
-        self.stopping.set()
+        with self._mutex:
+            self.stopping.set()
+            self._wakeup.notify_all()
 
     def remove_callable_job(self, callable):
         """Remove ``callable`` from the job queue.
@@ -117,17 +152,35 @@ class Scheduler(threading.Thread):
         currently running jobs.
         """
         with self._mutex:
+            for job in self._jobs:
+                if job._handler == callable:
+                    self._unschedule(job)
             self._jobs = [
                 job for job in self._jobs
                 if job._handler != callable
             ]
 
+    def get_next_time(self):
+        """Get when the next job will be ready.
+
+        :return: the earliest timestamp at which a job is ready, or ``None``
+                 if there is no job waiting
+        :rtype: float
+
+        .. versionadded:: 8.0
+        """
+        with self._mutex:
+            self._discard_obsolete()
+            if self._queue:
+                return self._queue[0][0]
+        return None
+
     def run(self):
         """Run forever until :meth:`stop` is called.
 
-        This method waits at most a second between each iteration. At each step
-        it retrieves the jobs that are ready for execution, and executes them.
-        See the :meth:`Job.execute` method for more information.
+        This method sleeps until the earliest job is ready (or a job is
+        registered or removed), then it executes every job ready for
+        execution. See the :meth:`Job.execute` method for more information.
 
         Internally, it loops forever until its :attr:`stopping` event is set.
 
@@ -139,17 +192,8 @@ class Scheduler(threading.Thread):
         """
         while not self.stopping.is_set():
             try:
-                now = time.time()
-
-                # Collect ready jobs by now
-                for job in self._get_ready_jobs(now):
+                for job in self._wait_ready_jobs():
                     self._run_job(job)
-
-                # Wait up to a second
-                time_spent = time.time() - now
-                wait_time = max(0, 1 - time_spent)
-                if wait_time:
-                    time.sleep(wait_time)
             except KeyboardInterrupt:
                 # Do not block on KeyboardInterrupt
                 LOGGER.debug('Job scheduler stopped by KeyboardInterrupt')
@@ -163,23 +207,81 @@ class Scheduler(threading.Thread):
                 self.manager.on_scheduler_error(self, error)
                 # Sleep a bit to guard against busy-looping and filling
                 # the log with useless error messages.
-                time.sleep(10.0)  # seconds
-
-    def _get_ready_jobs(self, now):
+                self.stopping.wait(10.0)  # seconds
+
+        self._pool.shutdown(wait=False)
+
+    def _schedule(self, job):
+        # must be called with the lock acquired
+        entry = [job.get_next_time(), next(self._counter), job]
+        self._entries[job] = entry
+        heapq.heappush(self._queue, entry)
+        if self._queue[0] is entry:
+            # earlier than what the scheduler waits for
+            self._wakeup.notify_all()
+
+    def _unschedule(self, job):
+        # must be called with the lock acquired
+        entry = self._entries.pop(job, None)
+        if entry is not None:
+            # the scheduler discards the entry when it reaches the top
+            entry[2] = None
+            self._wakeup.notify_all()
+
+    def _unschedule_all(self):
+        # must be called with the lock acquired
+        for entry in self._entries.values():
+            if entry is not None:
+                entry[2] = None
+        self._entries.clear()
+        self._queue = []
+        self._wakeup.notify_all()
+
+    def _discard_obsolete(self):
+        # must be called with the lock acquired
+        while self._queue and self._queue[0][2] is None:
+            heapq.heappop(self._queue)
+
+    def _wait_ready_jobs(self):
         with self._mutex:
-            jobs = [job for job in self._jobs if job.is_ready_to_run(now)]
+            while not self.stopping.is_set():
+                self._discard_obsolete()
+                if not self._queue:
+                    self._wakeup.wait()
+                    continue
+
+                wait_time = self._queue[0][0] - time.time()
+                if wait_time > 0:
+                    self._wakeup.wait(wait_time)
+                    continue
 
-        return jobs
+                now = time.time()
+                jobs = []
+                while self._queue and self._queue[0][0] <= now:
+                    *_, job = heapq.heappop(self._queue)
+                    if job is not None:
+                        # registered, but not waiting until it's done
+                        self._entries[job] = None
+                        jobs.append(job)
+                return jobs
+
+        return []
+
+    def _reschedule(self, job):
+        with self._mutex:
+            if job in self._entries and self._entries[job] is None:
+                self._schedule(job)
 
     def _run_job(self, job):
         if job.is_threaded():
             # make sure the job knows it's running, even though the thread
             # isn't started yet.
             job.is_running.set()
-            t = threading.Thread(
-                target=self._call, args=(job,)
-            )
-            t.start()
+            try:
+                self._pool.submit(self._call, job, name=str(job))
+            except RuntimeError:
+                # the pool is shut down: the scheduler is stopping
+                job.is_running.clear()
         else:
             self._call(job)
 
@@ -191,6 +293,8 @@ class Scheduler(threading.Thread):
         except Exception as error:  # TODO: Be specific
             LOGGER.error('Error while processing job: %s', error)
             self.manager.on_job_error(self, job, error)
+        finally:
+            self._reschedule(job)
 
 
 class Job:
@@ -204,6 +308,11 @@ class Job:
     :param handler: function to be called when the job is ready to execute
     :type handler: :term:`function`
     :param str doc: optional documentation for the job
+    :param str misfire: what to do when the job missed some runs; one of
+                        :data:`MISFIRE_POLICIES` (default to
+                        :data:`MISFIRE_COALESCE`)
+    :raise ValueError: when an interval isn't positive, or when the
+                       ``misfire`` policy is invalid
 
     Job is a simple structure that holds information about when a function
     should be called next. They are best used with a :class:`Scheduler`
@@ -240,6 +349,22 @@ class Job:
 
         # outside of the with statement, the job is not running anymore
 
+    A job misses runs when it is late, for example because its previous
+    execution took longer than its interval. Its ``misfire`` policy decides
+    what happens next:
+
+    * :data:`MISFIRE_COALESCE`: it runs once as soon as possible, then
+      every interval from there
+    * :data:`MISFIRE_SKIP`: it waits for its next scheduled time, as if it
+      had run on time
+    * :data:`MISFIRE_CATCH_UP`: it runs once for each missed run, as soon as
+      possible, then every interval as originally scheduled
+
+    .. versionchanged:: 8.0
+
+        Intervals can be less than a second. The ``misfire`` parameter has
+        been added.
+
     .. seealso::
 
         The :class:`sopel.plugins.jobs.Scheduler` class is specifically
@@ -273,6 +398,7 @@ class Job:
             'label': getattr(handler, 'rule_label', None),
             'threaded': getattr(handler, 'thread', True),
             'doc': inspect.getdoc(handler),
+            'misfire': getattr(handler, 'misfire', MISFIRE_COALESCE),
         }
 
     @classmethod
@@ -296,11 +422,18 @@ class Job:
                  label=None,
                  handler=None,
                  threaded=True,
-                 doc=None):
+                 doc=None,
+                 misfire=MISFIRE_COALESCE):
         # scheduling
         now = time.time()
         self.intervals = set(intervals)
         """Set of intervals at which to execute the job."""
+        if any(interval <= 0 for interval in self.intervals):
+            raise ValueError('Job intervals must be positive.')
+        if misfire not in MISFIRE_POLICIES:
+            raise ValueError('Invalid misfire policy: %r' % misfire)
+        self.misfire = misfire
+        """What to do when the job missed some runs."""
         self.next_times = dict(
             (interval, now + interval)
             for interval in self.intervals
@@ -427,20 +560,44 @@ class Job:
             for next_time in self.next_times.values()
         )
 
+    def get_next_time(self):
+        """Get when the job is ready to run next time.
+
+        :return: the earliest of the job's :attr:`next_times`
+        :rtype: float
+
+        .. versionadded:: 8.0
+        """
+        return min(self.next_times.values())
+
     def next(self, current_time):
         """Update :attr:`next_times`, assuming it executed at ``current_time``.
 
         :param int current_time: timestamp of the current time
         :return: a modified job object
+
+        When the job missed some runs, its :attr:`misfire` policy decides
+        when it runs next.
         """
         for interval, last_time in list(self.next_times.items()):
             if last_time >= current_time:
                 # no need to update this interval
                 continue
 
-            # if last time + interval is in the future, it's used
-            # else, try to run it asap
-            self.next_times[interval] = max(last_time + interval, current_time)
+            next_time = last_time + interval
+            if next_time >= current_time:
+                # on schedule
+                self.next_times[interval] = next_time
+            elif self.misfire == MISFIRE_CATCH_UP:
+                # in the past: it will run again asap
+                self.next_times[interval] = next_time
+            elif self.misfire == MISFIRE_SKIP:
+                # first scheduled time after the current time
+                missed = math.floor((current_time - last_time) / interval)
+                self.next_times[interval] = last_time + (missed + 1) * interval
+            else:
+                # try to run it asap
+                self.next_times[interval] = current_time
 
         return self
 
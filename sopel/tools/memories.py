@@ -18,12 +18,108 @@ if typing.TYPE_CHECKING:
     IdentifierFactory = Callable[[str], Identifier]
 
 
-class SopelMemory(dict):
+class _MemoryOperations:
+    # atomic operations shared by the memory classes; reads never take the
+    # lock: a single lookup in a dict is atomic already
+    lock: threading.Lock
+
+    def __setitem__(self, key, value):
+        """Set a key equal to a value.
+
+        The dict is locked for other writes while doing so.
+        """
+        with self.lock:
+            super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        """Remove a key.
+
+        The dict is locked for other writes while doing so.
+        """
+        with self.lock:
+            super().__delitem__(key)
+
+    def setdefault(self, key, default=None):
+        """Get the value of ``key``, setting it to ``default`` if missing.
+
+        :param key: the key to look for
+        :param default: the value to set if ``key`` is missing
+        :return: the value of ``key``
+
+        This is atomic: when two threads call this method at the same time,
+        they both get the same value.
+
+        .. versionadded:: 8.0
+        """
+        with self.lock:
+            return super().setdefault(key, default)
+
+    def pop(self, key, *default):
+        """Remove ``key`` and return its value.
+
+        :param key: the key to remove
+        :param default: the value to return if ``key`` is missing (optional)
+        :return: the value of ``key``, or ``default``
+        :raise KeyError: when ``key`` is missing and there is no ``default``
+
+        This is atomic: when two threads call this method at the same time,
+        only one of them gets the value.
+
+        .. versionadded:: 8.0
+        """
+        with self.lock:
+            return super().pop(key, *default)
+
+    def update_if(self, key, value, condition) -> bool:
+        """Set ``key`` to ``value`` if its current value meets ``condition``.
+
+        :param key: the key to update
+        :param value: the new value of ``key``
+        :param condition: a function called with the current value of ``key``
+                          (``None`` if missing) that returns ``True`` if the
+                          value must be updated
+        :return: ``True`` if ``key`` was set to ``value``
+
+        The check and the update are atomic: no other thread can write into
+        the dict in-between. For example, to keep the latest time only::
+
+            memory.update_if(
+                'last_seen', now, lambda last: last is None or last < now)
+
+        .. versionadded:: 8.0
+        """
+        with self.lock:
+            if not condition(super().get(key)):
+                return False
+            super().__setitem__(key, value)
+            return True
+
+    def snapshot(self) -> dict:
+        """Get a shallow copy of the dict, to iterate over safely.
+
+        :return: a new ``dict`` with the same keys and values
+
+        Iterating over the dict itself can fail if another thread changes it
+        at the same time; iterating over a snapshot can't. The copy is made
+        while holding the write lock, so no other thread can change the dict
+        in the middle of it.
+
+        .. versionadded:: 8.0
+        """
+        with self.lock:
+            return dict(super().items())
+
+
+class SopelMemory(_MemoryOperations, dict):
     """A simple thread-safe ``dict`` implementation.
 
-    In order to prevent exceptions when iterating over the values and changing
-    them at the same time from different threads, we use a blocking lock in
-    ``__setitem__`` and ``__contains__``.
+    Writes (setting or removing a key) are serialized by a lock, which also
+    makes compound operations such as :meth:`setdefault`, :meth:`pop`, and
+    :meth:`update_if` atomic. Reads (``key in memory``, ``memory[key]``)
+    never wait for that lock.
+
+    To iterate over the values while other threads may change them, use a
+    :meth:`snapshot`.
 
     .. versionadded:: 3.1
         As ``Willie.WillieMemory``
@@ -33,31 +129,15 @@ class SopelMemory(dict):
         Renamed from ``WillieMemory`` to ``SopelMemory``
     .. versionchanged:: 8.0
         Moved from ``tools`` to ``tools.memories``
+    .. versionchanged:: 8.0
+        Reads don't acquire the lock anymore; atomic operations
+        :meth:`setdefault`, :meth:`pop`, :meth:`update_if`, and the
+        :meth:`snapshot` method have been added.
     """
     def __init__(self, *args):
         dict.__init__(self, *args)
         self.lock = threading.Lock()
 
-    def __setitem__(self, key, value):
-        """Set a key equal to a value.
-
-        The dict is locked for other writes while doing so.
-        """
-        self.lock.acquire()
-        result = dict.__setitem__(self, key, value)
-        self.lock.release()
-        return result
-
-    def __contains__(self, key):
-        """Check if a key is in the dict.
-
-        The dict is locked for writes while doing so.
-        """
-        self.lock.acquire()
-        result = dict.__contains__(self, key)
-        self.lock.release()
-        return result
-
     # Needed to make it explicit that we don't care about the `lock` attribute
     # when comparing/hashing SopelMemory objects.
     __eq__ = dict.__eq__
@@ -65,7 +145,7 @@ class SopelMemory(dict):
     __hash__ = dict.__hash__
 
 
-class SopelMemoryWithDefault(defaultdict):
+class SopelMemoryWithDefault(_MemoryOperations, defaultdict):
     """Same as SopelMemory, but subclasses from collections.defaultdict.
 
     .. versionadded:: 4.3
@@ -74,31 +154,13 @@ class SopelMemoryWithDefault(defaultdict):
         Renamed to ``SopelMemoryWithDefault``
     .. versionchanged:: 8.0
         Moved from ``tools`` to ``tools.memories``
+    .. versionchanged:: 8.0
+        Same changes as :class:`SopelMemory`.
     """
     def __init__(self, *args):
         defaultdict.__init__(self, *args)
         self.lock = threading.Lock()
 
-    def __setitem__(self, key, value):
-        """Set a key equal to a value.
-
-        The dict is locked for other writes while doing so.
-        """
-        self.lock.acquire()
-        result = defaultdict.__setitem__(self, key, value)
-        self.lock.release()
-        return result
-
-    def __contains__(self, key):
-        """Check if a key is in the dict.
-
-        The dict is locked for writes while doing so.
-        """
-        self.lock.acquire()
-        result = defaultdict.__contains__(self, key)
-        self.lock.release()
-        return result
-
 
 class SopelIdentifierMemory(SopelMemory):
     """Special Sopel memory that stores ``Identifier`` as key.
@@ -172,3 +234,15 @@ class SopelIdentifierMemory(SopelMemory):
 
     def __setitem__(self, key: Optional[str], value):
         super().__setitem__(self._make_key(key), value)
+
+    def __delitem__(self, key: Optional[str]):
+        super().__delitem__(self._make_key(key))
+
+    def setdefault(self, key: Optional[str], default=None):
+        return super().setdefault(self._make_key(key), default)
+
+    def pop(self, key: Optional[str], *default):
+        return super().pop(self._make_key(key), *default)
+
+    def update_if(self, key: Optional[str], value, condition) -> bool:
+        return super().update_if(self._make_key(key), value, condition)
@@ -1,10 +1,23 @@
 from __future__ import annotations
 
 import functools
-from typing import Any, Callable, Dict, Optional, Set, TYPE_CHECKING, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    ItemsView,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Set,
+    TYPE_CHECKING,
+    Union,
+    ValuesView,
+)
 
 from sopel import privileges
-from sopel.tools import identifiers, memories
+from sopel.tools import identifiers
 
 if TYPE_CHECKING:
     from datetime import datetime
@@ -23,7 +36,8 @@ class User:
     :param str host: the user's hostname ("host.name" in `user@host.name`)
     """
     __slots__ = (
-        'nick', 'user', 'host', 'channels', 'account', 'away',
+        'nick', 'user', 'host', 'account', 'away',
+        '_channel_bits', '_memberships',
     )
 
     def __init__(
@@ -39,12 +53,8 @@ class User:
         """The user's local username."""
         self.host = host
         """The user's hostname."""
-        self.channels: Dict[identifiers.Identifier, 'Channel'] = {}
-        """The channels the user is in.
-
-        This maps channel name :class:`~sopel.tools.identifiers.Identifier`\\s
-        to :class:`Channel` objects.
-        """
+        self._channel_bits = 0
+        self._memberships: Optional[Memberships] = None
         self.account = None
         """The IRC services account of the user.
 
@@ -57,6 +67,21 @@ class User:
                                                        self.host))
     """The user's full hostmask."""
 
+    @property
+    def channels(self) -> MutableMapping[identifiers.Identifier, 'Channel']:
+        """The channels the user is in.
+
+        This maps channel name :class:`~sopel.tools.identifiers.Identifier`\\s
+        to :class:`Channel` objects.
+
+        .. versionchanged:: 8.0
+
+            This is now a view of the :class:`Memberships` of the user's
+            channels, instead of a ``dict`` of its own.
+
+        """
+        return _UserChannels(self)
+
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, User):
             return NotImplemented
@@ -76,22 +101,39 @@ class Channel:
     :type name: :class:`~sopel.tools.identifiers.Identifier`
     :param identifier_factory: A factory to create
                                :class:`~sopel.tools.identifiers.Identifier`\\s
+    :param memberships: the table of users shared with other channels
+                        (optional)
+
+    The users of a channel are stored in a :class:`Memberships` table that
+    should be shared by every channel of a bot; without one, the channel
+    gets a table of its own, and its users can't be added to channels using
+    another table.
+
+    .. versionchanged:: 8.0
+
+        The ``memberships`` parameter has been added.
+
     """
     __slots__ = (
         'name',
-        'users',
-        'privileges',
         'topic',
         'modes',
         'last_who',
         'join_time',
         'make_identifier',
+        '_memberships',
+        '_privileges',
+        '_bit',
+        '_user_count',
+        '_users_view',
+        '_privileges_view',
     )
 
     def __init__(
         self,
         name: identifiers.Identifier,
         identifier_factory: IdentifierFactory = identifiers.Identifier,
+        memberships: Optional[Memberships] = None,
     ) -> None:
         assert isinstance(name, identifiers.Identifier)
         self.name = name
@@ -105,29 +147,14 @@ class Channel:
         manipulating data associated to a user by its nickname.
         """
 
-        self.users: Dict[
-            identifiers.Identifier,
-            User,
-        ] = memories.SopelIdentifierMemory(
-            identifier_factory=self.make_identifier,
-        )
-        """The users in the channel.
-
-        This maps nickname :class:`~sopel.tools.identifiers.Identifier`\\s to
-        :class:`User` objects.
-        """
-        self.privileges: Dict[
-            identifiers.Identifier,
-            int,
-        ] = memories.SopelIdentifierMemory(
-            identifier_factory=self.make_identifier,
-        )
-        """The permissions of the users in the channel.
+        self._memberships = (
+            memberships if memberships is not None else Memberships())
+        self._privileges: Dict[identifiers.Identifier, int] = {}
+        self._bit: Optional[int] = None
+        self._user_count = 0
+        self._users_view = _ChannelUsers(self)
+        self._privileges_view = _ChannelPrivileges(self)
 
-        This maps nickname :class:`~sopel.tools.identifiers.Identifier`\\s to
-        bitwise integer values. This can be compared to appropriate constants
-        from :mod:`sopel.privileges`.
-        """
         self.topic = ''
         """The topic of the channel."""
 
@@ -154,6 +181,36 @@ class Channel:
         is available, otherwise the time Sopel received it.
         """
 
+    @property
+    def users(self) -> MutableMapping[identifiers.Identifier, User]:
+        """The users in the channel.
+
+        This maps nickname :class:`~sopel.tools.identifiers.Identifier`\\s to
+        :class:`User` objects.
+
+        .. versionchanged:: 8.0
+
+            This is now a view of the channel's :class:`Memberships`.
+
+        """
+        return self._users_view
+
+    @property
+    def privileges(self) -> MutableMapping[identifiers.Identifier, int]:
+        """The permissions of the users in the channel.
+
+        This maps nickname :class:`~sopel.tools.identifiers.Identifier`\\s to
+        bitwise integer values. This can be compared to appropriate constants
+        from :mod:`sopel.privileges`.
+
+        .. versionchanged:: 8.0
+
+            This is now a view of the channel's storage: removing the
+            privileges of a user also removes that user from the channel.
+
+        """
+        return self._privileges_view
+
     def clear_user(self, nick: identifiers.Identifier) -> None:
         """Remove ``nick`` from this channel.
 
@@ -161,10 +218,9 @@ class Channel:
 
         Called after a user leaves the channel via PART, KICK, QUIT, etc.
         """
-        user = self.users.pop(nick, None)
-        self.privileges.pop(nick, None)
-        if user is not None:
-            user.channels.pop(self.name, None)
+        nick = self.make_identifier(nick)
+        self._privileges.pop(nick, None)
+        self._memberships.discard(self, nick)
 
     def add_user(self, user: User, privs: int = 0) -> None:
         """Add ``user`` to this channel.
@@ -176,9 +232,8 @@ class Channel:
         Called when a new user JOINs the channel.
         """
         assert isinstance(user, User)
-        self.users[user.nick] = user
-        self.privileges[user.nick] = privs or 0
-        user.channels[self.name] = self
+        self._memberships.add(self, user)
+        self._privileges[user.nick] = privs or 0
 
     def has_privilege(self, nick: str, privilege: int) -> bool:
         """Tell if a user has a ``privilege`` level or above in this channel.
@@ -210,7 +265,7 @@ class Channel:
             on the presence of standard modes: ``+v`` (voice) and ``+o`` (op).
 
         """
-        return self.privileges.get(self.make_identifier(nick), 0) >= privilege
+        return self._privileges.get(self.make_identifier(nick), 0) >= privilege
 
     def is_oper(self, nick: str) -> bool:
         """Tell if a user has the OPER (operator) privilege level.
@@ -242,7 +297,7 @@ class Channel:
 
         """
         identifier = self.make_identifier(nick)
-        return bool(self.privileges.get(identifier, 0) & privileges.OPER)
+        return bool(self._privileges.get(identifier, 0) & privileges.OPER)
 
     def is_owner(self, nick: str) -> bool:
         """Tell if a user has the OWNER privilege level.
@@ -274,7 +329,7 @@ class Channel:
 
         """
         identifier = self.make_identifier(nick)
-        return bool(self.privileges.get(identifier, 0) & privileges.OWNER)
+        return bool(self._privileges.get(identifier, 0) & privileges.OWNER)
 
     def is_admin(self, nick: str) -> bool:
         """Tell if a user has the ADMIN privilege level.
@@ -306,7 +361,7 @@ class Channel:
 
         """
         identifier = self.make_identifier(nick)
-        return bool(self.privileges.get(identifier, 0) & privileges.ADMIN)
+        return bool(self._privileges.get(identifier, 0) & privileges.ADMIN)
 
     def is_op(self, nick: str) -> bool:
         """Tell if a user has the OP privilege level.
@@ -332,7 +387,7 @@ class Channel:
 
         """
         identifier = self.make_identifier(nick)
-        return bool(self.privileges.get(identifier, 0) & privileges.OP)
+        return bool(self._privileges.get(identifier, 0) & privileges.OP)
 
     def is_halfop(self, nick: str) -> bool:
         """Tell if a user has the HALFOP privilege level.
@@ -364,7 +419,7 @@ class Channel:
 
         """
         identifier = self.make_identifier(nick)
-        return bool(self.privileges.get(identifier, 0) & privileges.HALFOP)
+        return bool(self._privileges.get(identifier, 0) & privileges.HALFOP)
 
     def is_voiced(self, nick: str) -> bool:
         """Tell if a user has the VOICE privilege level.
@@ -391,7 +446,7 @@ class Channel:
 
         """
         identifier = self.make_identifier(nick)
-        return bool(self.privileges.get(identifier, 0) & privileges.VOICE)
+        return bool(self._privileges.get(identifier, 0) & privileges.VOICE)
 
     def rename_user(
         self,
@@ -405,11 +460,9 @@ class Channel:
 
         Called on ``NICK`` events.
         """
-        if old in self.users:
-            self.users[new] = self.users.pop(old)
-            self.users[new].nick = new
-        if old in self.privileges:
-            self.privileges[new] = self.privileges.pop(old)
+        if old in self._privileges:
+            self._privileges[new] = self._privileges.pop(old)
+        self._memberships.rename(old, new)
 
     def __eq__(self, other):
         if not isinstance(other, Channel):
@@ -420,3 +473,284 @@ class Channel:
         if not isinstance(other, Channel):
             return NotImplemented
         return self.name < other.name
+
+
+class Memberships:
+    """Table of the users of channels, shared by the channels of a bot.
+
+    Each user is stored once in the table, whatever the number of channels it
+    is in: the channels of a user are a bitset, with one bit per channel, and
+    each channel keeps the privileges of its users in a single ``dict``. The
+    bit of a channel is allocated when its first user is added, and it is
+    released (to be reused by another channel) when its last user leaves.
+
+    As a result, :attr:`Channel.users`, :attr:`Channel.privileges`, and
+    :attr:`User.channels` are views of the same data, and finding the
+    channels of a user only takes as many steps as there are channels the
+    user is in.
+
+    .. versionadded:: 8.0
+    """
+    __slots__ = ('_users', '_channels', '_free_bits')
+
+    def __init__(self) -> None:
+        self._users: Dict[identifiers.Identifier, User] = {}
+        self._channels: List[Optional[Channel]] = []
+        self._free_bits: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def get_user(self, nick: identifiers.Identifier) -> Optional[User]:
+        """Get the user named ``nick``, if it is in a channel.
+
+        :param nick: the nickname of the user
+        :return: the user, or ``None`` if not in any channel of this table
+        """
+        return self._users.get(nick)
+
+    def add(self, channel: Channel, user: User) -> None:
+        """Add ``user`` to the users of ``channel``.
+
+        :param channel: the channel to add the user to
+        :param user: the user to add
+        :raise ValueError: when the user is already in another table
+        """
+        if user._memberships is None:
+            user._memberships = self
+        elif user._memberships is not self:
+            raise ValueError(
+                'User %s is already in the channels of another table.'
+                % user.nick)
+
+        current = self._users.get(user.nick)
+        if current is not None and current is not user:
+            # a new object for the same user: it takes over the channels
+            user._channel_bits |= current._channel_bits
+            current._channel_bits = 0
+        self._users[user.nick] = user
+
+        if channel._bit is None:
+            channel._bit = self._allocate(channel)
+
+        mask = 1 << channel._bit
+        if not user._channel_bits & mask:
+            user._channel_bits |= mask
+            channel._user_count += 1
+
+    def discard(self, channel: Channel, nick: identifiers.Identifier) -> None:
+        """Remove the user named ``nick`` from the users of ``channel``.
+
+        :param channel: the channel to remove the user from
+        :param nick: the nickname of the user to remove
+
+        Nothing happens if the user isn't in the channel.
+        """
+        user = self._users.get(nick)
+        if user is None or channel._bit is None:
+            return
+
+        mask = 1 << channel._bit
+        if not user._channel_bits & mask:
+            return
+
+        user._channel_bits &= ~mask
+        if not user._channel_bits:
+            del self._users[nick]
+            user._memberships = None
+
+        channel._user_count -= 1
+        if not channel._user_count:
+            self._release(channel)
+
+    def rename(
+        self,
+        old: identifiers.Identifier,
+        new: identifiers.Identifier,
+    ) -> None:
+        """Rename the user named ``old`` as ``new``.
+
+        :param old: the user's old nickname
+        :param new: the user's new nickname
+        """
+        user = self._users.pop(old, None)
+        if user is not None:
+            user.nick = new
+            self._users[new] = user
+
+    def iter_channels(self, user: User) -> Iterator[Channel]:
+        """Iterate over the channels of ``user``."""
+        bits = user._channel_bits
+        while bits:
+            lowest = bits & -bits
+            channel = self._channels[lowest.bit_length() - 1]
+            if channel is not None:
+                yield channel
+            bits ^= lowest
+
+    def is_member(self, channel: Channel, nick: identifiers.Identifier) -> bool:
+        """Tell if the user named ``nick`` is in ``channel``."""
+        user = self._users.get(nick)
+        return (
+            user is not None and
+            channel._bit is not None and
+            bool(user._channel_bits & (1 << channel._bit))
+        )
+
+    def _allocate(self, channel: Channel) -> int:
+        if self._free_bits:
+            # reuse the lowest bits to keep the bitsets small
+            bit = min(self._free_bits)
+            self._free_bits.remove(bit)
+            self._channels[bit] = channel
+        else:
+            bit = len(self._channels)
+            self._channels.append(channel)
+        return bit
+
+    def _release(self, channel: Channel) -> None:
+        bit = channel._bit
+        if bit is None:
+            return
+        self._channels[bit] = None
+        self._free_bits.append(bit)
+        channel._bit = None
+        channel._user_count = 0
+
+
+class _ChannelPrivileges(MutableMapping):
+    # view of the privileges of a channel's users
+    __slots__ = ('_channel',)
+
+    def __init__(self, channel: Channel) -> None:
+        self._channel = channel
+
+    def __getitem__(self, nick):
+        return self._channel._privileges[self._channel.make_identifier(nick)]
+
+    def __setitem__(self, nick, privs):
+        self._channel._privileges[self._channel.make_identifier(nick)] = privs
+
+    def __delitem__(self, nick):
+        self._channel.clear_user(nick)
+
+    def __contains__(self, nick):
+        if nick is None:
+            return False
+        return self._channel.make_identifier(nick) in self._channel._privileges
+
+    def __iter__(self):
+        return iter(self._channel._privileges)
+
+    def __len__(self):
+        return len(self._channel._privileges)
+
+    def __repr__(self):
+        return repr(self._channel._privileges)
+
+
+class _ChannelUsers(MutableMapping):
+    # view of the users of a channel, from the table of memberships
+    __slots__ = ('_channel',)
+
+    def __init__(self, channel: Channel) -> None:
+        self._channel = channel
+
+    def __getitem__(self, nick):
+        channel = self._channel
+        identifier = channel.make_identifier(nick)
+        if not channel._memberships.is_member(channel, identifier):
+            raise KeyError(nick)
+        return channel._memberships.get_user(identifier)
+
+    def __setitem__(self, nick, user):
+        channel = self._channel
+        if user.nick != nick:
+            raise ValueError(
+                'Cannot add user %s as %s.' % (user.nick, nick))
+        channel._memberships.add(channel, user)
+        channel._privileges.setdefault(user.nick, 0)
+
+    def __delitem__(self, nick):
+        if nick not in self:
+            raise KeyError(nick)
+        self._channel.clear_user(nick)
+
+    def __contains__(self, nick):
+        if nick is None:
+            return False
+        channel = self._channel
+        return channel._memberships.is_member(
+            channel, channel.make_identifier(nick))
+
+    def __iter__(self):
+        channel = self._channel
+        is_member = channel._memberships.is_member
+        for nick in list(channel._privileges):
+            if is_member(channel, nick):
+                yield nick
+
+    def __len__(self):
+        return self._channel._user_count
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class _UserChannels(MutableMapping):
+    # view of the channels of a user, from the table of memberships
+    __slots__ = ('_user',)
+
+    def __init__(self, user: User) -> None:
+        self._user = user
+
+    def _channels(self) -> Iterator[Channel]:
+        memberships = self._user._memberships
+        if memberships is None:
+            return iter(())
+        return memberships.iter_channels(self._user)
+
+    def __getitem__(self, name):
+        for channel in self._channels():
+            if channel.name == name:
+                return channel
+        raise KeyError(name)
+
+    def __setitem__(self, name, channel):
+        if channel.name != name:
+            raise ValueError(
+                'Cannot add channel %s as %s.' % (channel.name, name))
+        channel.users[self._user.nick] = self._user
+
+    def __delitem__(self, name):
+        self[name].clear_user(self._user.nick)
+
+    def __iter__(self):
+        return (channel.name for channel in list(self._channels()))
+
+    def __len__(self):
+        return bin(self._user._channel_bits).count('1')
+
+    def values(self):
+        return _UserChannelsValues(self)
+
+    def items(self):
+        return _UserChannelsItems(self)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class _UserChannelsValues(ValuesView):
+    # no lookup by name for each channel
+    def __iter__(self):
+        return iter(list(self._mapping._channels()))
+
+
+class _UserChannelsItems(ItemsView):
+    # no lookup by name for each channel
+    def __iter__(self):
+        return iter([
+            (channel.name, channel)
+            for channel in self._mapping._channels()
+        ])
@@ -0,0 +1,300 @@
+"""Sopel's Worker Pool: internal tool to execute tasks in worker threads.
+
+.. important::
+
+    This is an internal tool used by Sopel to run threaded rules and should
+    not be used by plugin authors. Its usage and documentation is for Sopel
+    core development and advanced developers. It is subject to rapid changes
+    between versions without much (or any) warning.
+
+"""
+# Licensed under the Eiffel Forum License 2.
+from __future__ import annotations
+
+import collections
+from concurrent import futures
+import logging
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+
+LOGGER = logging.getLogger(__name__)
+
+POLICY_BLOCK = 'block'
+"""Wait for a free slot in the queue before submitting a new task."""
+POLICY_DROP = 'drop'
+"""Discard any new task submitted while the queue is full."""
+POLICY_QUEUE = 'queue'
+"""Keep queueing new tasks past the queue size, with a warning."""
+POLICIES = (POLICY_QUEUE, POLICY_DROP, POLICY_BLOCK)
+
+
+class Task(futures.Future):
+    """A :class:`~concurrent.futures.Future` for a task of a :class:`WorkerPool`.
+
+    :param str name: name of the task
+    :param str group: the group of the task (if any)
+
+    On top of the ``Future`` interface, a task can be joined like a
+    :class:`thread <threading.Thread>`::
+
+        task = pool.submit(func)
+        task.join()  # wait until the task is done
+
+    This keeps code that used to wait on threads, such as tests waiting for
+    :attr:`sopel.bot.Sopel.running_triggers`, working as before.
+    """
+    def __init__(self, name: str, group: Optional[str] = None) -> None:
+        super().__init__()
+        self.name = name
+        self.group = group
+
+    def __repr__(self) -> str:
+        return '<Task %s %s>' % (self.name, super().__repr__())
+
+    def is_alive(self) -> bool:
+        """Tell if the task is pending or running.
+
+        :return: ``True`` until the task is done or cancelled
+        """
+        return not self.done()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Wait until the task is done or cancelled.
+
+        :param timeout: maximum time to wait, in seconds (optional)
+
+        Unlike :meth:`~concurrent.futures.Future.result`, this never raises
+        the task's exception.
+        """
+        futures.wait([self], timeout=timeout)
+
+
+_WorkItem = Tuple[Task, Callable, tuple, Dict[str, Any]]
+
+
+class WorkerPool:
+    """Bounded pool of worker threads with a bounded queue.
+
+    :param max_workers: maximum number of worker threads
+    :param max_queue: maximum number of pending tasks; ``0`` for no limit
+    :param policy: what to do when the queue is full; one of
+                   :data:`POLICIES`
+    :param max_per_group: maximum number of running tasks per group;
+                          ``0`` for no limit
+    :param name: prefix of the worker threads' name
+
+    Worker threads are started on demand, up to ``max_workers``, and then
+    reused for every task submitted with :meth:`submit`::
+
+        pool = WorkerPool(4, max_queue=100, policy=POLICY_DROP)
+        task = pool.submit(func, arg, group='plugin_name')
+
+    A task of a group that already has ``max_per_group`` running tasks stays
+    in the queue until one of them is done, while tasks of other groups can
+    run; so a slow plugin can't take all the workers for itself.
+
+    When the queue is full, the ``policy`` decides what happens to a new
+    task:
+
+    * :data:`POLICY_QUEUE`: the task is queued anyway, with a warning
+    * :data:`POLICY_DROP`: the task is discarded, with a warning
+    * :data:`POLICY_BLOCK`: :meth:`submit` waits until there is room for it
+
+    The pool must be stopped with :meth:`shutdown` once it isn't used
+    anymore.
+    """
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue: int = 0,
+        policy: str = POLICY_QUEUE,
+        max_per_group: int = 0,
+        name: str = 'WorkerPool',
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError('max_workers must be greater than 0')
+        if policy not in POLICIES:
+            raise ValueError('Invalid backpressure policy: %r' % policy)
+
+        self.max_workers = max_workers
+        self.max_queue = max(max_queue, 0)
+        self.policy = policy
+        self.max_per_group = max(max_per_group, 0)
+        self.name = name
+
+        self._pending: Deque[_WorkItem] = collections.deque()
+        self._running: Dict[Optional[str], int] = collections.Counter()
+        self._workers: List[threading.Thread] = []
+        self._idle = 0
+        self._overflow = False
+        self._stopping = False
+        self._condition = threading.Condition()
+
+    @property
+    def queue_size(self) -> int:
+        """Number of tasks waiting for a worker."""
+        with self._condition:
+            return len(self._pending)
+
+    @property
+    def workers(self) -> int:
+        """Number of worker threads started."""
+        with self._condition:
+            return len(self._workers)
+
+    def submit(
+        self,
+        func: Callable,
+        *args: Any,
+        group: Optional[str] = None,
+        name: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Optional[Task]:
+        """Submit a task to execute ``func(*args, **kwargs)``.
+
+        :param func: the callable to execute in a worker thread
+        :param group: the group of the task, used for the concurrency cap
+        :param name: name of the task, for debugging purposes
+        :return: the task, or ``None`` if it was dropped
+        :raise RuntimeError: when the pool is shut down
+        """
+        task = Task(name or getattr(func, '__name__', repr(func)), group)
+
+        with self._condition:
+            if self._stopping:
+                raise RuntimeError('Cannot submit task after shutdown.')
+
+            if self.max_queue and len(self._pending) >= self.max_queue:
+                if self.policy == POLICY_DROP:
+                    LOGGER.warning(
+                        '%s queue is full (%d tasks), dropping task %s.',
+                        self.name, len(self._pending), task.name)
+                    return None
+                elif self.policy == POLICY_BLOCK:
+                    self._condition.wait_for(
+                        lambda: (
+                            self._stopping or
+                            len(self._pending) < self.max_queue))
+                    if self._stopping:
+                        raise RuntimeError(
+                            'Cannot submit task after shutdown.')
+                elif not self._overflow:
+                    # log once until the queue gets back under its size
+                    self._overflow = True
+                    LOGGER.warning(
+                        '%s queue is over its size (%d tasks).',
+                        self.name, self.max_queue)
+
+            self._pending.append((task, func, args, kwargs))
+            if (
+                len(self._pending) > self._idle and
+                len(self._workers) < self.max_workers
+            ):
+                self._start_worker()
+            self._condition.notify_all()
+
+        return task
+
+    def shutdown(
+        self,
+        wait: bool = True,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Stop the pool and cancel its pending tasks.
+
+        :param wait: wait for the running tasks to be done
+        :param timeout: maximum time to wait for all the workers, in seconds
+
+        Running tasks are not interrupted: each worker thread stops once its
+        current task is done.
+        """
+        with self._condition:
+            self._stopping = True
+            pending = list(self._pending)
+            self._pending.clear()
+            workers = list(self._workers)
+            self._condition.notify_all()
+
+        for task, *_ in pending:
+            task.cancel()
+
+        if wait:
+            current = threading.current_thread()
+            deadline = None
+            if timeout is not None:
+                deadline = time.monotonic() + timeout
+            for worker in workers:
+                if worker is current:
+                    continue
+                if deadline is None:
+                    worker.join()
+                else:
+                    worker.join(timeout=max(0, deadline - time.monotonic()))
+
+    def _start_worker(self) -> None:
+        # must be called with the condition's lock acquired
+        worker = threading.Thread(
+            target=self._work,
+            name='%s-%d' % (self.name, len(self._workers) + 1),
+            daemon=True,
+        )
+        self._workers.append(worker)
+        worker.start()
+
+    def _next_item(self) -> Optional[_WorkItem]:
+        # must be called with the condition's lock acquired
+        for index, item in enumerate(self._pending):
+            group = item[0].group
+            if (
+                not self.max_per_group or
+                group is None or
+                self._running[group] < self.max_per_group
+            ):
+                del self._pending[index]
+                if len(self._pending) < self.max_queue:
+                    self._overflow = False
+                return item
+        return None
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                item = self._next_item()
+                while item is None:
+                    if self._stopping:
+                        return
+                    self._idle += 1
+                    self._condition.wait()
+                    self._idle -= 1
+                    item = self._next_item()
+
+                task, func, args, kwargs = item
+                self._running[task.group] += 1
+                # room for blocked submissions, or a task for another worker
+                self._condition.notify_all()
+
+            try:
+                if task.set_running_or_notify_cancel():
+                    try:
+                        result = func(*args, **kwargs)
+                    except BaseException as exc:
+                        LOGGER.debug('Task %s failed', task.name)
+                        task.set_exception(exc)
+                    else:
+                        task.set_result(result)
+            finally:
+                with self._condition:
+                    self._running[task.group] -= 1
+                    if not self._running[task.group]:
+                        del self._running[task.group]
+                    self._condition.notify_all()
@@ -11,10 +11,13 @@ from __future__ import annotations
 
 import datetime
 import re
+import time
 from typing import (
+    Any,
     Callable,
     cast,
     Dict,
+    List,
     Match,
     Optional,
     Sequence,
@@ -37,6 +40,8 @@ __all__ = [
 
 IdentifierFactory = Callable[[str], identifiers.Identifier]
 
+_UNSET: Any = object()
+
 
 class PreTrigger:
     """A parsed raw message from the server.
@@ -130,10 +135,39 @@ class PreTrigger:
 
         The sender's local username.
 
+    .. versionchanged:: 8.0
+
+        Only the command and its arguments are parsed when the object is
+        created: the other attributes (such as :attr:`tags`, :attr:`time`,
+        :attr:`urls`, or :attr:`plain`) are computed the first time they are
+        used, so lines that no rule looks at are cheap to parse. New
+        attributes can't be set on a ``PreTrigger`` anymore.
+
     """
     component_regex = re.compile(r'([^!]*)!?([^@]*)@?(.*)')
     ctcp_regex = re.compile('\x01(\\S+) ?(.*)\x01')
 
+    __slots__ = (
+        'make_identifier',
+        'line',
+        'hostmask',
+        'event',
+        'text',
+        '_own_nick',
+        '_url_schemes',
+        '_received',
+        '_raw_tags',
+        '_args',
+        '_tags',
+        '_time',
+        '_components',
+        '_nick',
+        '_sender',
+        '_ctcp',
+        '_urls',
+        '_plain',
+    )
+
     def __init__(
         self,
         own_nick: identifiers.Identifier,
@@ -142,37 +176,18 @@ class PreTrigger:
         identifier_factory: IdentifierFactory = identifiers.Identifier,
     ):
         self.make_identifier = identifier_factory
+        self._own_nick = own_nick
+        self._url_schemes = url_schemes
+        # Client time, used when there is no valid server time
+        self._received = time.time()
+
         line = line.strip('\r\n')
         self.line: str = line
-        self.urls: Tuple[str, ...] = tuple()
-        self.plain: str = ''
-        self.ctcp: Optional[str] = None
 
-        # Break off IRCv3 message tags, if present
-        self.tags: Dict[str, Optional[str]] = {}
+        # Break off IRCv3 message tags, if present; parsed on demand
+        self._raw_tags: Optional[str] = None
         if line.startswith('@'):
-            tagstring, line = line.split(' ', 1)
-            for raw_tag in tagstring[1:].split(';'):
-                tag = raw_tag.split('=', 1)
-                if len(tag) > 1:
-                    self.tags[tag[0]] = tag[1]
-                else:
-                    self.tags[tag[0]] = None
-
-        # Client time or server time
-        self.time = datetime.datetime.utcnow().replace(
-            tzinfo=datetime.timezone.utc
-        )
-        if 'time' in self.tags:
-            # ensure "time" is a string (typecheck)
-            tag_time = self.tags['time'] or ''
-            try:
-                self.time = datetime.datetime.strptime(
-                    tag_time,
-                    "%Y-%m-%dT%H:%M:%S.%fZ",
-                ).replace(tzinfo=datetime.timezone.utc)
-            except ValueError:
-                pass  # Server isn't conforming to spec, ignore the server-time
+            self._raw_tags, line = line.split(' ', 1)
 
         # Grabs hostmask from line.
         # Example: line = ':Sopel!foo@bar PRIVMSG #sopel :foobar!'
@@ -195,55 +210,146 @@ class PreTrigger:
         #             print(args)    # ['irc.libera.chat', 'MODE', 'Sopel', '+i']
         if ' :' in line:
             argstr, self.text = line.split(' :', 1)
-            self.args = argstr.split(' ')
-            self.args.append(self.text)
+            args = argstr.split(' ')
+            args.append(self.text)
         else:
-            self.args = line.split(' ')
-            self.text = self.args[-1]
-
-        self.event = self.args[0]
-        self.args = self.args[1:]
-
-        # The regex will always match any string, even an empty one
-        components_match = cast(
-            Match, PreTrigger.component_regex.match(self.hostmask or ''))
-        nick, self.user, self.host = components_match.groups()
-        self.nick: identifiers.Identifier = self.make_identifier(nick)
-
-        # If we have arguments, the first one is the sender
-        # Unless it's a QUIT event
-        target: Optional[identifiers.Identifier] = None
-
-        if self.args and self.event != 'QUIT':
-            target = self.make_identifier(self.args[0])
-
-            # Unless we're messaging the bot directly, in which case that
-            # second arg will be our bot's name.
-            if target.lower() == own_nick.lower():
-                target = self.nick
-
-        self.sender = target
-
-        # Parse CTCP
-        if self.event == 'PRIVMSG' or self.event == 'NOTICE':
-            ctcp_match = PreTrigger.ctcp_regex.match(self.args[-1])
+            args = line.split(' ')
+            self.text = args[-1]
+
+        self.event: str = args[0]
+        self._args = args[1:]
+
+        # Everything else is parsed on first access, then cached
+        self._tags: Optional[Dict[str, Optional[str]]] = None
+        self._time: Optional[datetime.datetime] = None
+        self._components: Optional[Tuple[str, str, str]] = None
+        self._nick: Optional[identifiers.Identifier] = None
+        self._sender: Optional[identifiers.Identifier] = _UNSET
+        self._urls: Optional[Tuple[str, ...]] = None
+        self._plain: Optional[str] = None
+        # Only PRIVMSG and NOTICE can be CTCP
+        self._ctcp: Optional[str] = (
+            _UNSET if self.event in ('PRIVMSG', 'NOTICE') else None)
+
+    def _parse_ctcp(self) -> None:
+        # Remove CTCP delimiters and command from the last argument
+        self._ctcp = None
+        if self._args:
+            ctcp_match = PreTrigger.ctcp_regex.match(self._args[-1])
             if ctcp_match is not None:
                 ctcp, message = ctcp_match.groups()
-                self.ctcp = ctcp
-                self.args[-1] = message or ''
-
-            # Search URLs after CTCP parsing
-            self.urls = tuple(
-                web.search_urls(self.args[-1], schemes=url_schemes))
-
-        # Populate account from extended-join messages
-        if self.event == 'JOIN' and len(self.args) == 3:
-            # Account is the second arg `...JOIN #Sopel account :realname`
-            self.tags['account'] = self.args[1]
-
-        # get plain text message
-        if self.args:
-            self.plain = formatting.plain(self.args[-1])
+                self._ctcp = ctcp
+                self._args[-1] = message or ''
+
+    @property
+    def args(self) -> List[str]:
+        if self._ctcp is _UNSET:
+            self._parse_ctcp()
+        return self._args
+
+    @property
+    def ctcp(self) -> Optional[str]:
+        if self._ctcp is _UNSET:
+            self._parse_ctcp()
+        return self._ctcp
+
+    @property
+    def tags(self) -> Dict[str, Optional[str]]:
+        if self._tags is None:
+            tags: Dict[str, Optional[str]] = {}
+            if self._raw_tags is not None:
+                for raw_tag in self._raw_tags[1:].split(';'):
+                    tag = raw_tag.split('=', 1)
+                    if len(tag) > 1:
+                        tags[tag[0]] = tag[1]
+                    else:
+                        tags[tag[0]] = None
+
+            # Populate account from extended-join messages
+            if self.event == 'JOIN' and len(self._args) == 3:
+                # Account is the second arg `...JOIN #Sopel account :realname`
+                tags['account'] = self._args[1]
+
+            self._tags = tags
+        return self._tags
+
+    @property
+    def time(self) -> datetime.datetime:
+        if self._time is None:
+            # Server time if available and valid, or client time
+            tag_time = self.tags.get('time') if self._raw_tags else None
+            received = None
+            if tag_time is not None:
+                try:
+                    received = datetime.datetime.strptime(
+                        tag_time,
+                        "%Y-%m-%dT%H:%M:%S.%fZ",
+                    ).replace(tzinfo=datetime.timezone.utc)
+                except ValueError:
+                    pass  # Server isn't conforming to spec, ignore the server-time
+
+            self._time = received or datetime.datetime.fromtimestamp(
+                self._received, tz=datetime.timezone.utc)
+        return self._time
+
+    def _get_components(self) -> Tuple[str, str, str]:
+        if self._components is None:
+            # The regex will always match any string, even an empty one
+            components_match = cast(
+                Match, PreTrigger.component_regex.match(self.hostmask or ''))
+            self._components = cast(
+                Tuple[str, str, str], components_match.groups())
+        return self._components
+
+    @property
+    def nick(self) -> identifiers.Identifier:
+        if self._nick is None:
+            self._nick = self.make_identifier(self._get_components()[0])
+        return self._nick
+
+    @property
+    def user(self) -> str:
+        return self._get_components()[1]
+
+    @property
+    def host(self) -> str:
+        return self._get_components()[2]
+
+    @property
+    def sender(self) -> Optional[identifiers.Identifier]:
+        if self._sender is _UNSET:
+            # If we have arguments, the first one is the sender
+            # Unless it's a QUIT event
+            target: Optional[identifiers.Identifier] = None
+
+            if self._args and self.event != 'QUIT':
+                target = self.make_identifier(self._args[0])
+
+                # Unless we're messaging the bot directly, in which case that
+                # second arg will be our bot's name.
+                if target.lower() == self._own_nick.lower():
+                    target = self.nick
+
+            self._sender = target
+        return self._sender
+
+    @property
+    def urls(self) -> Tuple[str, ...]:
+        if self._urls is None:
+            urls: Tuple[str, ...] = tuple()
+            if self.event == 'PRIVMSG' or self.event == 'NOTICE':
+                # Search URLs after CTCP parsing
+                urls = tuple(web.search_urls(
+                    self.args[-1], schemes=self._url_schemes))
+            self._urls = urls
+        return self._urls
+
+    @property
+    def plain(self) -> str:
+        if self._plain is None:
+            # get plain text message
+            self._plain = formatting.plain(self.args[-1]) if self.args else ''
+        return self._plain
 
 
 class Trigger(str):
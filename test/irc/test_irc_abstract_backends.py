@@ -1,6 +1,9 @@
 """Tests for core ``sopel.irc.backends``"""
 from __future__ import annotations
 
+import asyncio
+
+import pytest
 
 from sopel.tests.mocks import MockIRCBackend
 
@@ -298,3 +301,27 @@ def test_send_notice_safe():
     expected = 'NOTICE #sopel :Helloworld!\r\n'
     assert backend.message_sent == [expected.encode('utf-8')]
     assert bot.message_sent == [expected]
+
+
+def test_run_coroutine():
+    backend = MockIRCBackend(BotCollector())
+
+    async def coro(value):
+        await asyncio.sleep(0)
+        return value * 2
+
+    future = backend.run_coroutine(coro(21))
+    assert future.done()
+    assert future.result() == 42
+
+
+def test_run_coroutine_exception():
+    backend = MockIRCBackend(BotCollector())
+
+    async def coro():
+        raise ValueError('expected')
+
+    future = backend.run_coroutine(coro())
+    assert future.done()
+    with pytest.raises(ValueError):
+        future.result()
@@ -0,0 +1,205 @@
+"""Tests for core ``sopel.irc.backends``"""
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from sopel.irc.backends import AsyncioBackend
+
+
+class BotCollector:
+    def __init__(self):
+        self.message_sent = []
+
+    def on_message_sent(self, raw):
+        self.message_sent.append(raw)
+
+
+class FakeWriter:
+    def __init__(self):
+        self.writes = []
+        self.drains = 0
+
+    def writelines(self, lines):
+        self.writes.append(list(lines))
+
+    async def drain(self):
+        self.drains += 1
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def backend():
+    return AsyncioBackend(BotCollector(), 'irc.example.com', 6697, None)
+
+
+def test_irc_send_not_running(backend):
+    with pytest.raises(RuntimeError):
+        backend.irc_send(b'PING :irc.example.com\r\n')
+
+
+def test_irc_send_coalesce(backend):
+    writer = FakeWriter()
+
+    async def run():
+        backend._loop = asyncio.get_running_loop()
+        backend._writer = writer
+
+        backend.send_command('JOIN', '#sopel')
+        backend.send_command('WHO', '#sopel')
+        backend.send_command('PRIVMSG', '#sopel', text='Hello!')
+
+        # lines are written by the loop, not by irc_send itself
+        assert writer.writes == []
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+
+    assert writer.writes == [[
+        b'JOIN #sopel\r\n',
+        b'WHO #sopel\r\n',
+        b'PRIVMSG #sopel :Hello!\r\n',
+    ]]
+    assert writer.drains == 1
+    assert backend.get_send_queue_stats() == {
+        'pending': 0,
+        'peak': 3,
+        'flushes': 1,
+        'lines': 3,
+        'bytes': 49,
+        'throttled': 0,
+        'throttled_time': 0.0,
+    }
+
+
+def test_irc_send_from_threads(backend):
+    writer = FakeWriter()
+
+    def send_lines(index):
+        for number in range(50):
+            backend.irc_send(b'PRIVMSG #%d :%d\r\n' % (index, number))
+
+    async def run():
+        backend._loop = asyncio.get_running_loop()
+        backend._writer = writer
+        threads = [
+            threading.Thread(target=send_lines, args=(index,))
+            for index in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            await asyncio.get_running_loop().run_in_executor(
+                None, thread.join)
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+
+    lines = [line for batch in writer.writes for line in batch]
+    assert len(lines) == 200
+    for index in range(4):
+        # order is kept for each thread
+        assert [
+            line for line in lines if line.startswith(b'PRIVMSG #%d ' % index)
+        ] == [b'PRIVMSG #%d :%d\r\n' % (index, n) for n in range(50)]
+
+    stats = backend.get_send_queue_stats()
+    assert stats['pending'] == 0
+    assert stats['lines'] == 200
+    assert stats['flushes'] == len(writer.writes) == writer.drains
+
+
+def test_irc_send_rate_limit():
+    backend = AsyncioBackend(
+        BotCollector(), 'irc.example.com', 6697, None,
+        send_rate_lines=100,
+        send_burst_lines=2,
+    )
+    writer = FakeWriter()
+
+    async def run():
+        backend._loop = asyncio.get_running_loop()
+        backend._writer = writer
+
+        for number in range(4):
+            backend.send_command('PRIVMSG', '#sopel', text=str(number))
+        backend.send_command('NOTICE', 'Exirel', text='Hi!')
+
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        # only the burst is written at once
+        assert writer.writes == [[
+            b'PRIVMSG #sopel :0\r\n',
+            b'PRIVMSG #sopel :1\r\n',
+        ]]
+
+        # the others follow at the limited rate, without blocking the loop
+        await asyncio.sleep(0.1)
+
+    asyncio.run(run())
+
+    lines = [line for batch in writer.writes for line in batch]
+    assert lines == [
+        b'PRIVMSG #sopel :0\r\n',
+        b'PRIVMSG #sopel :1\r\n',
+        b'PRIVMSG #sopel :2\r\n',
+        b'PRIVMSG #sopel :3\r\n',
+        b'NOTICE Exirel :Hi!\r\n',
+    ]
+    stats = backend.get_send_queue_stats()
+    assert stats['pending'] == 0
+    assert stats['lines'] == 5
+    assert stats['throttled'] == 3
+    assert stats['throttled_time'] > 0
+
+
+def test_irc_send_priority():
+    backend = AsyncioBackend(
+        BotCollector(), 'irc.example.com', 6697, None,
+        send_rate_lines=10,
+        send_burst_lines=1,
+    )
+    writer = FakeWriter()
+
+    async def run():
+        backend._loop = asyncio.get_running_loop()
+        backend._writer = writer
+
+        for number in range(3):
+            backend.send_command('PRIVMSG', '#sopel', text=str(number))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        # the backlog waits for the rate limits
+        assert writer.writes == [[b'PRIVMSG #sopel :0\r\n']]
+
+        backend.send_command('PONG', 'irc.example.com')
+        backend.send_command('QUIT', text='Bye!')
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        # but PONG doesn't
+        assert writer.writes == [
+            [b'PRIVMSG #sopel :0\r\n'],
+            [b'PONG irc.example.com\r\n'],
+        ]
+        assert backend.get_send_queue_stats()['pending'] == 3
+
+        # and it doesn't count toward the rate limits
+        await asyncio.sleep(0.35)
+
+    asyncio.run(run())
+
+    lines = [line for batch in writer.writes for line in batch]
+    assert lines == [
+        b'PRIVMSG #sopel :0\r\n',
+        b'PONG irc.example.com\r\n',
+        b'PRIVMSG #sopel :1\r\n',
+        b'PRIVMSG #sopel :2\r\n',
+        # QUIT waits for the lines queued before it
+        b'QUIT :Bye!\r\n',
+    ]
+    stats = backend.get_send_queue_stats()
+    assert stats['pending'] == 0
+    assert stats['lines'] == 5
+    assert stats['throttled'] == 3
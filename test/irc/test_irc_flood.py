@@ -0,0 +1,224 @@
+"""Tests for core ``sopel.irc.flood``"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from sopel.irc import flood
+from sopel.tools import Identifier, target
+
+
+def test_rate_limiter_disabled():
+    limiter = flood.RateLimiter()
+    assert not limiter.enabled
+
+    for _ in range(100):
+        assert limiter.get_wait_time(512, 10.0) == 0
+        limiter.consume(512, 10.0)
+
+
+def test_rate_limiter_lines():
+    limiter = flood.RateLimiter(lines_per_second=2, burst_lines=3)
+    assert limiter.enabled
+    assert limiter.window == 1.5
+
+    # burst
+    for _ in range(3):
+        assert limiter.get_wait_time(10, 10.0) == 0
+        limiter.consume(10, 10.0)
+
+    # then one line every 0.5s
+    assert limiter.get_wait_time(10, 10.0) == pytest.approx(0.5)
+    assert limiter.get_wait_time(10, 10.25) == pytest.approx(0.25)
+    assert limiter.get_wait_time(10, 10.5) == 0
+    limiter.consume(10, 10.5)
+    assert limiter.get_wait_time(10, 10.5) == pytest.approx(0.5)
+
+
+def test_rate_limiter_bytes():
+    # penalty of ircd: 2s per line, plus 1s per 120 bytes
+    limiter = flood.RateLimiter(
+        lines_per_second=0.5, bytes_per_second=120, burst_lines=5)
+    assert limiter.get_cost(0) == pytest.approx(2)
+    assert limiter.get_cost(240) == pytest.approx(4)
+
+    # long lines consume the burst faster
+    limiter.consume(240, 10.0)
+    limiter.consume(240, 10.0)
+    assert limiter.get_wait_time(0, 10.0) == 0
+    limiter.consume(240, 10.0)
+    assert limiter.get_wait_time(0, 10.0) == pytest.approx(4)
+
+
+def test_rate_limiter_idle():
+    limiter = flood.RateLimiter(lines_per_second=1, burst_lines=2)
+    limiter.consume(10, 10.0)
+    limiter.consume(10, 10.0)
+    assert limiter.get_wait_time(10, 10.0) == pytest.approx(1)
+
+    # being idle for long doesn't build up more than the burst
+    now = 1000.0
+    limiter.consume(10, now)
+    limiter.consume(10, now)
+    assert limiter.get_wait_time(10, now) == pytest.approx(1)
+
+
+def test_batch_joins():
+    channels = [('#a', None), ('#b', 'key'), ('#c', None), ('#d', 'pass')]
+    assert flood.batch_joins(channels) == [
+        (['#b', '#d', '#a', '#c'], ['key', 'pass']),
+    ]
+
+
+def test_batch_joins_empty():
+    assert flood.batch_joins([]) == []
+
+
+def test_batch_joins_max_targets():
+    channels = [('#%d' % index, None) for index in range(5)]
+    assert flood.batch_joins(channels, max_targets=2) == [
+        (['#0', '#1'], []),
+        (['#2', '#3'], []),
+        (['#4'], []),
+    ]
+
+
+def test_batch_joins_max_length():
+    channels = [('#' + 'a' * 9, None), ('#' + 'b' * 9, 'key')]
+
+    # "JOIN #bbbbbbbbb,#aaaaaaaaa key" is 30 characters long
+    assert flood.batch_joins(channels, max_length=30) == [
+        (['#bbbbbbbbb', '#aaaaaaaaa'], ['key']),
+    ]
+    assert flood.batch_joins(channels, max_length=29) == [
+        (['#bbbbbbbbb'], ['key']),
+        (['#aaaaaaaaa'], []),
+    ]
+
+
+def test_batch_joins_line_length():
+    channels = [('#channel%03d' % index, None) for index in range(100)]
+    batches = flood.batch_joins(channels)
+
+    assert len(batches) == 3
+    assert [name for names, _ in batches for name in names] == [
+        name for name, _ in channels
+    ]
+    for names, _ in batches:
+        assert len('JOIN ' + ','.join(names)) <= flood.MAX_LINE_LENGTH
+
+
+def make_channels(**sizes):
+    channels = {}
+    for name, size in sizes.items():
+        channel_id = Identifier('#' + name)
+        channel = channels[channel_id] = target.Channel(channel_id)
+        for index in range(size):
+            nick = Identifier('%s%d' % (name, index))
+            channel.add_user(target.User(nick, 'user', 'example.com'))
+    return channels
+
+
+def test_who_refresh_queue_order():
+    now = datetime(2023, 1, 1, 12, 0, 0)
+    channels = make_channels(a=1, b=1, c=1)
+    channels['#a'].last_who = now - timedelta(seconds=200)
+    channels['#b'].last_who = now - timedelta(seconds=300)
+    channels['#c'].last_who = now - timedelta(seconds=60)
+    queue = flood.WhoRefreshQueue(budget=100)
+    for channel_id, channel in channels.items():
+        queue.push(channel_id, channel.last_who)
+
+    # stalest first, and #c is too recent
+    assert queue.pop_due(channels, now) == ['#b', '#a']
+    assert queue.pop_due(channels, now) == []
+    assert queue.pop_due(channels, now + timedelta(seconds=60)) == ['#c']
+
+
+def test_who_refresh_queue_never_sent():
+    now = datetime(2023, 1, 1, 12, 0, 0)
+    channels = make_channels(a=1, b=1)
+    channels['#a'].last_who = now - timedelta(seconds=300)
+    queue = flood.WhoRefreshQueue(budget=100)
+    queue.push('#a', channels['#a'].last_who)
+    queue.push('#b', None)
+
+    assert queue.pop_due(channels, now) == ['#b', '#a']
+
+
+def test_who_refresh_queue_obsolete():
+    now = datetime(2023, 1, 1, 12, 0, 0)
+    channels = make_channels(a=1, b=1)
+    queue = flood.WhoRefreshQueue(budget=100)
+    queue.push('#a', None)
+    queue.push('#b', None)
+    queue.push('#gone', None)
+
+    # a WHO was sent in-between: the first entry is obsolete
+    channels['#a'].last_who = now - timedelta(seconds=10)
+    queue.push('#a', channels['#a'].last_who)
+
+    assert queue.pop_due(channels, now) == ['#b']
+    assert len(queue) == 1
+
+
+def test_who_refresh_queue_budget():
+    start = datetime(2023, 1, 1, 12, 0, 0)
+    channels = make_channels(big=40, small=5, other=20)
+    queue = flood.WhoRefreshQueue(budget=60)
+    for channel_id in channels:
+        queue.push(channel_id, None)
+
+    # 40 + 5 lines, then 20 more don't fit in the budget
+    assert queue.pop_due(channels, start) == ['#big', '#small']
+    assert queue.tokens == 15
+
+    # 1 line per second
+    assert queue.pop_due(channels, start + timedelta(seconds=4)) == []
+    assert queue.pop_due(channels, start + timedelta(seconds=5)) == ['#other']
+    assert queue.tokens == 0
+
+
+def test_who_refresh_queue_budget_large_channel():
+    start = datetime(2023, 1, 1, 12, 0, 0)
+    channels = make_channels(big=100, small=1)
+    queue = flood.WhoRefreshQueue(budget=60)
+    queue.push('#small', None)
+    queue.push('#big', None)
+
+    assert queue.pop_due(channels, start) == ['#small']
+    # the big channel waits for a full bucket
+    assert queue.pop_due(channels, start) == []
+    assert queue.pop_due(channels, start + timedelta(seconds=1)) == ['#big']
+
+
+def test_who_refresh_queue_no_budget():
+    channels = make_channels(a=1)
+    queue = flood.WhoRefreshQueue(budget=0)
+    queue.push('#a', None)
+
+    assert queue.pop_due(channels, datetime(2023, 1, 1)) == []
+
+
+def test_who_refresh_queue_consume():
+    start = datetime(2023, 1, 1, 12, 0, 0)
+    channels = make_channels(big=40, small=30)
+    queue = flood.WhoRefreshQueue(budget=60)
+
+    assert queue.consume(channels['#big'], start)
+    # not enough lines left, until the budget is refilled
+    assert not queue.consume(channels['#small'], start)
+    assert queue.consume(channels['#small'], start + timedelta(seconds=10))
+    assert queue.tokens == 0
+
+    # the refresh shares the same budget
+    queue.push('#big', None)
+    assert queue.pop_due(channels, start + timedelta(seconds=10)) == []
+
+
+def test_who_refresh_queue_consume_no_budget():
+    channels = make_channels(a=1)
+    queue = flood.WhoRefreshQueue(budget=0)
+
+    assert queue.consume(channels['#a'], datetime(2023, 1, 1))
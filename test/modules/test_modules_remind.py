@@ -474,3 +474,107 @@ def test_dump_database(tmpdir):
 
     weird_line = '666169010\t#sopel\tAdmin\t%s' % weird_message
     assert weird_line in lines
+
+
+def test_reminder_database_add(tmpdir):
+    tmpfile = tmpdir.join('remind.db')
+    database = remind.ReminderDatabase(tmpfile.strpath)
+    database.load()
+
+    database.add(523549810, ('#sopel', 'Admin', 'message'))
+    database.add(523549800, ('#sopel', 'Admin', 'first message'))
+    database.add(523549810, ('#sopel', 'Exirel', 'same time'))
+
+    assert database == {
+        523549800: [('#sopel', 'Admin', 'first message')],
+        523549810: [
+            ('#sopel', 'Admin', 'message'),
+            ('#sopel', 'Exirel', 'same time'),
+        ],
+    }
+    # each reminder is appended to the file
+    assert remind.load_database(tmpfile.strpath) == database
+
+
+def test_reminder_database_pop_due(tmpdir):
+    tmpfile = tmpdir.join('remind.db')
+    database = remind.ReminderDatabase(tmpfile.strpath)
+    database.add(523549830, ('#sopel', 'Admin', 'third'))
+    database.add(523549810, ('#sopel', 'Admin', 'first'))
+    database.add(523549820, ('#sopel', 'Admin', 'second'))
+
+    assert database.pop_due(523549800) == []
+    assert database.pop_due(523549820) == [
+        ('#sopel', 'Admin', 'first'),
+        ('#sopel', 'Admin', 'second'),
+    ]
+    assert database == {523549830: [('#sopel', 'Admin', 'third')]}
+
+    # removed reminders are in the journal, and ignored when loading
+    assert tmpdir.join('remind.db.journal').check()
+    loaded = remind.ReminderDatabase(tmpfile.strpath)
+    loaded.load()
+    assert loaded == database
+
+    # loading compacts the database
+    assert not tmpdir.join('remind.db.journal').check()
+    assert remind.load_database(tmpfile.strpath) == database
+
+
+def test_reminder_database_remove(tmpdir):
+    tmpfile = tmpdir.join('remind.db')
+    database = remind.ReminderDatabase(tmpfile.strpath)
+    database.add(523549810, ('#sopel', 'Admin', 'message'))
+    database.add(523549810, ('#other', 'Admin', 'other message'))
+    database.add(523549820, ('#sopel', 'Exirel', 'not mine'))
+    database.add(523549830, ('#sopel', 'Admin', 'another message'))
+
+    count = database.remove(
+        lambda channel, nick, message: channel == '#sopel' and nick == 'Admin')
+
+    assert count == 2
+    assert database == {
+        523549810: [('#other', 'Admin', 'other message')],
+        523549820: [('#sopel', 'Exirel', 'not mine')],
+    }
+    assert database.pop_due(523549830) == [
+        ('#other', 'Admin', 'other message'),
+        ('#sopel', 'Exirel', 'not mine'),
+    ]
+
+    loaded = remind.ReminderDatabase(tmpfile.strpath)
+    loaded.load()
+    assert loaded == {}
+
+
+def test_reminder_database_load_duplicates(tmpdir):
+    tmpfile = tmpdir.join('remind.db')
+    database = remind.ReminderDatabase(tmpfile.strpath)
+    database.add(523549810, ('#sopel', 'Admin', 'message'))
+    database.add(523549810, ('#sopel', 'Admin', 'message'))
+    database.remove(lambda channel, nick, message: True)
+    database.add(523549810, ('#sopel', 'Admin', 'message'))
+
+    # the journal removes only as many reminders as it holds
+    loaded = remind.ReminderDatabase(tmpfile.strpath)
+    loaded.load()
+    assert loaded == {523549810: [('#sopel', 'Admin', 'message')]}
+
+
+def test_reminder_database_compact(tmpdir, monkeypatch):
+    monkeypatch.setattr(remind, 'COMPACT_THRESHOLD', 2)
+    tmpfile = tmpdir.join('remind.db')
+    journal = tmpdir.join('remind.db.journal')
+    database = remind.ReminderDatabase(tmpfile.strpath)
+    for unixtime in range(523549810, 523549814):
+        database.add(unixtime, ('#sopel', 'Admin', 'message'))
+
+    database.pop_due(523549811)
+    assert len(journal.readlines()) == 2
+
+    # past the threshold, and more removed than pending reminders
+    database.pop_due(523549812)
+    assert not journal.check()
+    assert remind.load_database(tmpfile.strpath) == {
+        523549813: [('#sopel', 'Admin', 'message')],
+    }
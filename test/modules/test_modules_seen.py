@@ -0,0 +1,155 @@
+"""Tests for Sopel's ``seen`` plugin"""
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event
+
+from sopel.db import SopelDB
+from sopel.modules import seen
+
+
+TMP_CONFIG = """
+[core]
+owner = Admin
+nick = Sopel
+enable =
+    coretasks
+    seen
+host = chat.freenode.net
+"""
+
+
+@pytest.fixture
+def tmpconfig(configfactory):
+    return configfactory('default.ini', TMP_CONFIG)
+
+
+@pytest.fixture
+def db(tmpconfig):
+    return SopelDB(tmpconfig)
+
+
+@pytest.fixture
+def cache(db):
+    return seen.SeenCache(db)
+
+
+def test_seen_cache_note_coalesces(cache, db):
+    cache.note('Exirel', 10.0, '#channel', 'first', False)
+    cache.note('EXIREL', 20.0, '#channel', 'second', True)
+
+    assert len(cache) == 1
+    assert cache.get('exirel') == {
+        'seen_timestamp': 20.0,
+        'seen_channel': '#channel',
+        'seen_message': 'second',
+        'seen_action': True,
+    }
+    # nothing is written until the cache is flushed
+    assert db.get_nick_value('Exirel', 'seen_timestamp') is None
+
+
+def test_seen_cache_flush(cache, db):
+    db.set_nick_value('dgw', 'seen_timestamp', 1.0)
+    db.set_nick_value('dgw', 'seen_message', 'old')
+    db.set_nick_value('dgw', 'other', 'untouched')
+    cache.note('Exirel', 10.0, '#channel', 'hello', False)
+    cache.note('dgw', 20.0, '#other', 'hi', True)
+
+    assert cache.flush() == 2
+    assert len(cache) == 0
+    assert cache.flush() == 0
+
+    assert db.get_nick_value('Exirel', 'seen_timestamp') == 10.0
+    assert db.get_nick_value('Exirel', 'seen_message') == 'hello'
+    assert db.get_nick_value('Exirel', 'seen_action') is False
+    assert db.get_nick_value('dgw', 'seen_timestamp') == 20.0
+    assert db.get_nick_value('dgw', 'seen_channel') == '#other'
+    assert db.get_nick_value('dgw', 'seen_message') == 'hi'
+    assert db.get_nick_value('dgw', 'other') == 'untouched'
+
+    # once flushed, values are read from the database
+    assert cache.get('dgw') == {
+        'seen_timestamp': 20.0,
+        'seen_channel': '#other',
+        'seen_message': 'hi',
+        'seen_action': True,
+    }
+    assert cache.get('unknown') is None
+
+
+def test_seen_cache_flush_with_db_cache(configfactory):
+    tmpconfig = configfactory(
+        'default.ini', TMP_CONFIG + 'db_cache_size = 100\n')
+    db = SopelDB(tmpconfig)
+    cache = seen.SeenCache(db)
+
+    cache.note('Exirel', 10.0, '#channel', 'first', False)
+    cache.flush()
+    assert cache.get('Exirel')['seen_message'] == 'first'
+
+    # the database cache must not keep a stale value after the next flush
+    cache.note('Exirel', 20.0, '#channel', 'second', False)
+    cache.flush()
+    assert cache.get('Exirel')['seen_message'] == 'second'
+    assert db.get_nick_value('Exirel', 'seen_message') == 'second'
+
+
+def test_seen_cache_flush_single_commit(cache, db):
+    commits = []
+    event.listen(db.engine, 'commit', lambda conn: commits.append(conn))
+    nicks = ['User%d' % index for index in range(50)]
+
+    # new nicks are created in the same transaction
+    for index, nick in enumerate(nicks):
+        cache.note(nick, float(index), '#channel', 'hello', False)
+    assert cache.flush() == 50
+    assert len(commits) == 1
+
+    for index, nick in enumerate(nicks):
+        cache.note(nick, 100.0 + index, '#channel', 'again', True)
+    assert cache.flush() == 50
+    assert len(commits) == 2
+
+    assert db.get_nick_value('User42', 'seen_timestamp') == 142.0
+    assert db.get_nick_value('User42', 'seen_message') == 'again'
+
+
+def test_seen_cache_flush_grouped_nicks(cache, db):
+    db.alias_nick('Exirel', 'Exi')
+    cache.note('Exi', 20.0, '#channel', 'latest', False)
+    cache.note('Exirel', 10.0, '#channel', 'earliest', False)
+
+    cache.flush()
+
+    assert db.get_nick_value('Exirel', 'seen_message') == 'latest'
+
+
+def test_seen_cache_flush_error(cache, db, monkeypatch):
+    def fail(entries):
+        raise RuntimeError('database is gone')
+
+    cache.note('Exirel', 10.0, '#channel', 'hello', False)
+    monkeypatch.setattr(cache, '_save', fail)
+
+    with pytest.raises(RuntimeError):
+        cache.flush()
+
+    assert len(cache) == 1
+    assert cache.get('Exirel')['seen_message'] == 'hello'
+
+
+def test_seen_command(tmpconfig, botfactory, ircfactory, userfactory):
+    mockbot = botfactory.preloaded(tmpconfig, ['seen'])
+    irc = ircfactory(mockbot)
+    user = userfactory('Exirel')
+    other = userfactory('dgw')
+
+    irc.say(user, '#channel', 'hello')
+    mockbot.memory['seen_cache'].flush()
+    irc.say(other, '#channel', '.seen Exirel')
+
+    assert len(mockbot.backend.message_sent) == 1
+    assert b'I last saw Exirel in here' in mockbot.backend.message_sent[0]
+    assert mockbot.backend.message_sent[0].endswith(
+        b', saying: hello\r\n')
@@ -8,7 +8,20 @@ import os
 import pytest
 
 from sopel import formatting
+from sopel.db import SopelDB
 from sopel.modules import tell
+from sopel.tests import rawlist
+
+
+TMP_CONFIG = """
+[core]
+owner = Admin
+nick = Sopel
+enable =
+    coretasks
+    tell
+host = chat.freenode.net
+"""
 
 
 def test_load_reminders_empty(tmpdir):
@@ -330,3 +343,101 @@ def test_format_safe_lstrip_invalid_arg():
 def test_format_safe_lstrip_pairs(text, cleaned):
     """Test expected formatting-safe string sanitization."""
     assert tell._format_safe_lstrip(text) == cleaned
+
+
+@pytest.fixture
+def tmpconfig(configfactory):
+    return configfactory('default.ini', TMP_CONFIG)
+
+
+@pytest.fixture
+def tell_db(tmpconfig):
+    database = tell.TellDatabase(SopelDB(tmpconfig))
+    database.load()
+    return database
+
+
+def test_tell_database_pop_nick(tell_db):
+    tell_db.add('Exirel', 'dgw', 'tell', '1 Jan 00:00', 'hello')
+    tell_db.add('HumorBaby', 'dgw', 'ask', '1 Jan 00:00', 'how are you?')
+
+    assert len(tell_db) == 2
+    assert tell_db.has_messages('EXIREL')
+    assert not tell_db.has_messages('Exi')
+    assert tell_db.pop('EXIREL') == [
+        ('Exirel', 'dgw', 'tell', '1 Jan 00:00', 'hello'),
+    ]
+    assert not tell_db.has_messages('Exirel')
+    assert tell_db.pop('Exirel') == []
+    assert len(tell_db) == 1
+
+
+def test_tell_database_pop_patterns(tell_db):
+    tell_db.add('Exi*', 'dgw', 'tell', '1 Jan 00:00', 'pattern 1')
+    tell_db.add('Exirel', 'dgw', 'tell', '1 Jan 00:00', 'nick 1')
+    tell_db.add('exi:', 'dgw', 'tell', '1 Jan 00:00', 'pattern 2')
+    tell_db.add('Exirel', 'dgw', 'tell', '1 Jan 00:00', 'nick 2')
+    tell_db.add('Ex*', 'dgw', 'tell', '1 Jan 00:00', 'too short')
+    tell_db.add('Exirel2*', 'dgw', 'tell', '1 Jan 00:00', 'too long')
+
+    assert tell_db.has_messages('Exirel')
+    assert [reminder[4] for reminder in tell_db.pop('Exirel')] == [
+        # by tellee in reverse order, then in the order they were left
+        'pattern 2', 'nick 1', 'nick 2', 'pattern 1', 'too short',
+    ]
+    assert not tell_db.has_messages('Exirel')
+    assert tell_db.has_messages('Exirel2')
+    assert len(tell_db) == 1
+
+
+def test_tell_database_load(tmpconfig, tell_db):
+    tell_db.add('Exirel', 'dgw', 'tell', '1 Jan 00:00', 'hello')
+    tell_db.add('Exi*', 'dgw', 'tell', '1 Jan 00:00', 'hello')
+
+    loaded = tell.TellDatabase(tell_db.db)
+    loaded.load()
+
+    assert len(loaded) == 2
+    assert loaded.has_messages('Exirel')
+    assert loaded.has_messages('Exibot')
+    assert not loaded.has_messages('dgw')
+
+
+def test_setup_imports_reminders_file(tmpconfig, botfactory):
+    filename = os.path.join(
+        tmpconfig.core.homedir, tmpconfig.basename + '.tell.db')
+    tell.dump_reminders(filename, {
+        'Exirel': [('dgw', 'tell', '1 Jan 00:00', 'hello')],
+    })
+
+    mockbot = botfactory.preloaded(tmpconfig, ['tell'])
+
+    assert not os.path.exists(filename)
+    assert mockbot.memory['tell_messages'].pop('Exirel') == [
+        ('Exirel', 'dgw', 'tell', '1 Jan 00:00', 'hello'),
+    ]
+
+
+def test_tell_and_deliver(tmpconfig, botfactory, ircfactory, userfactory):
+    mockbot = botfactory.preloaded(tmpconfig, ['tell'])
+    irc = ircfactory(mockbot)
+    teller = userfactory('dgw')
+    tellee = userfactory('Exirel')
+
+    irc.say(teller, '#channel', '.tell exirel hello')
+    assert mockbot.backend.message_sent == rawlist(
+        "PRIVMSG #channel :dgw: I'll pass that on when exirel is around.",
+    )
+    mockbot.backend.clear_message_sent()
+
+    irc.say(teller, '#channel', 'something else')
+    assert not mockbot.backend.message_sent
+
+    irc.say(tellee, '#channel', 'hi')
+    assert len(mockbot.backend.message_sent) == 1
+    assert mockbot.backend.message_sent[0].endswith(
+        b'<dgw> tell Exirel hello\r\n')
+    mockbot.backend.clear_message_sent()
+
+    irc.say(tellee, '#channel', 'hi again')
+    assert not mockbot.backend.message_sent
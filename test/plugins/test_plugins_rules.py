@@ -1,6 +1,7 @@
 """Tests for the ``sopel.plugins.rules`` module."""
 from __future__ import annotations
 
+import asyncio
 import datetime
 import re
 
@@ -398,6 +399,192 @@ def test_manager_rule_trigger_on_event(mockbot):
     assert rule_events in items[0]
 
 
+def test_manager_command_aliases_and_prefixes(mockbot):
+    command = rules.Command(
+        'hello', prefix=r'\.|!', aliases=['hi', 'lo'], plugin='testplugin')
+    manager = rules.Manager()
+    manager.register_command(command)
+
+    for text in ['.hello', '!HELLO world', '.hi', '.lo there', '!Lo']:
+        line = ':Foo!foo@example.com PRIVMSG #sopel :%s' % text
+        pretrigger = trigger.PreTrigger(mockbot.nick, line)
+        items = manager.get_triggered_rules(mockbot, pretrigger)
+        assert len(items) == 1, 'Exactly one command must match %r' % text
+        assert items[0][0] == command
+
+    for text in ['hello', '.hellothere', '?hi', '.l', 'hi .hi']:
+        line = ':Foo!foo@example.com PRIVMSG #sopel :%s' % text
+        pretrigger = trigger.PreTrigger(mockbot.nick, line)
+        items = manager.get_triggered_rules(mockbot, pretrigger)
+        assert not items, 'No command must match %r' % text
+
+
+def test_manager_command_patterns(mockbot):
+    pattern_command = rules.Command(
+        'hel+o', prefix=r'\.', plugin='testplugin')
+    spaced_command = rules.Command(
+        'hello', prefix=r'hey\s', plugin='testplugin')
+    manager = rules.Manager()
+    manager.register_command(pattern_command)
+    manager.register_command(spaced_command)
+
+    line = ':Foo!foo@example.com PRIVMSG #sopel :.hellllo'
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+    items = manager.get_triggered_rules(mockbot, pretrigger)
+    assert [rule for rule, _ in items] == [pattern_command]
+
+    line = ':Foo!foo@example.com PRIVMSG #sopel :hey hello world'
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+    items = manager.get_triggered_rules(mockbot, pretrigger)
+    assert [rule for rule, _ in items] == [spaced_command]
+    assert items[0][1].group(2) == 'world'
+
+
+def test_manager_command_ambiguous_prefix(mockbot):
+    # with an optional prefix, ".a" can be "a" prefixed or ".a" unprefixed
+    long_command = rules.Command('ab', prefix=r'a?', plugin='testplugin')
+    short_command = rules.Command('b', prefix=r'a?', plugin='testplugin')
+    other_command = rules.Command('abc', prefix=r'a?', plugin='testplugin')
+    manager = rules.Manager()
+    manager.register_command(long_command)
+    manager.register_command(short_command)
+    manager.register_command(other_command)
+
+    line = ':Foo!foo@example.com PRIVMSG #sopel :ab test'
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+    items = manager.get_triggered_rules(mockbot, pretrigger)
+    assert [rule for rule, _ in items] == [long_command, short_command]
+    assert [match.group(1) for _, match in items] == ['ab', 'b']
+    assert [match.group(2) for _, match in items] == ['test', 'test']
+
+
+def test_manager_command_named_group(mockbot):
+    # a named group can't be compiled with other commands
+    named_command = rules.Command(
+        '(?P<name>hel+o)', prefix=r'\.', plugin='testplugin')
+    command = rules.Command('hello', prefix=r'\.', plugin='testplugin')
+    manager = rules.Manager()
+    manager.register_command(named_command)
+    manager.register_command(command)
+
+    line = ':Foo!foo@example.com PRIVMSG #sopel :.hello'
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+    items = manager.get_triggered_rules(mockbot, pretrigger)
+    assert [rule for rule, _ in items] == [named_command, command]
+    assert items[0][1].group('name') == 'hello'
+
+
+def test_manager_command_non_ascii(mockbot):
+    command = rules.Command('kill', prefix=r'\.', plugin='testplugin')
+    manager = rules.Manager()
+    manager.register_command(command)
+
+    # the Kelvin sign matches "k" when ignoring case
+    line = ':Foo!foo@example.com PRIVMSG #sopel :.\u212aill'
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+    items = manager.get_triggered_rules(mockbot, pretrigger)
+    assert [rule for rule, _ in items] == [command]
+
+
+def test_manager_priority_order(mockbot):
+    regex = re.compile('.*')
+    low_rule = rules.Rule(
+        [regex], plugin='testplugin', label='low', priority='low')
+    medium_command_a = rules.Command(
+        'hello', prefix=r'\.', plugin='testplugin')
+    medium_rule = rules.Rule([regex], plugin='testplugin', label='medium')
+    medium_command_b = rules.Command(
+        'hi', prefix=r'\.', aliases=['hello'], plugin='otherplugin')
+    low_command = rules.Command(
+        'hey', prefix=r'\.', aliases=['hello'], plugin='otherplugin',
+        priority='low')
+    manager = rules.Manager()
+    manager.register(low_rule)
+    manager.register_command(medium_command_a)
+    manager.register(medium_rule)
+    manager.register_command(medium_command_b)
+    manager.register_command(low_command)
+
+    line = ':Foo!foo@example.com PRIVMSG #sopel :.hello'
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+    items = manager.get_triggered_rules(mockbot, pretrigger)
+
+    assert [rule for rule, _ in items] == [
+        medium_rule, medium_command_a, medium_command_b, low_rule, low_command,
+    ]
+
+
+def test_manager_rule_trigger_on_ctcp(mockbot):
+    regex = re.compile('.*')
+    rule_default = rules.Rule([regex], plugin='testplugin', label='default')
+    rule_ctcp = rules.Rule(
+        [regex],
+        plugin='testplugin',
+        label='version',
+        ctcp=[re.compile('VERSION')])
+    action = rules.ActionCommand('hello', plugin='testplugin')
+    manager = rules.Manager()
+    manager.register(rule_default)
+    manager.register(rule_ctcp)
+    manager.register_action_command(action)
+
+    line = ':Foo!foo@example.com PRIVMSG #sopel :hello'
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+    items = manager.get_triggered_rules(mockbot, pretrigger)
+    assert [rule for rule, _ in items] == [rule_default]
+
+    line = ':Foo!foo@example.com PRIVMSG #sopel :\x01VERSION\x01'
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+    items = manager.get_triggered_rules(mockbot, pretrigger)
+    assert [rule for rule, _ in items] == [rule_default, rule_ctcp]
+
+    line = ':Foo!foo@example.com PRIVMSG #sopel :\x01ACTION hello\x01'
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+    items = manager.get_triggered_rules(mockbot, pretrigger)
+    assert [rule for rule, _ in items] == [rule_default, action]
+
+
+def test_manager_register_after_match(mockbot):
+    command = rules.Command('hello', prefix=r'\.', plugin='testplugin')
+    manager = rules.Manager()
+
+    line = ':Foo!foo@example.com PRIVMSG #sopel :.hello'
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+    assert not manager.get_triggered_rules(mockbot, pretrigger)
+
+    manager.register_command(command)
+    items = manager.get_triggered_rules(mockbot, pretrigger)
+    assert [rule for rule, _ in items] == [command]
+
+    manager.unregister_plugin('testplugin')
+    assert not manager.get_triggered_rules(mockbot, pretrigger)
+
+
+def test_manager_has_event_rules():
+    regex = re.compile('.*')
+    rule = rules.Rule([regex], plugin='testplugin', label='testrule')
+    topic = rules.Rule(
+        [regex], plugin='testplugin', label='topic', events=['TOPIC'])
+    manager = rules.Manager()
+
+    assert not manager.has_event_rules('PRIVMSG')
+    assert not manager.has_event_rules('TOPIC')
+
+    manager.register(rule)
+    assert manager.has_event_rules('PRIVMSG')
+    assert not manager.has_event_rules('TOPIC')
+    assert not manager.has_event_rules('PING')
+
+    manager.register(topic)
+    assert manager.has_event_rules('PRIVMSG')
+    assert manager.has_event_rules('TOPIC')
+    assert not manager.has_event_rules('PING')
+
+    manager.unregister_plugin('testplugin')
+    assert not manager.has_event_rules('PRIVMSG')
+    assert not manager.has_event_rules('TOPIC')
+
+
 def test_manager_has_command():
     command = rules.Command('hello', prefix=r'\.', plugin='testplugin')
     manager = rules.Manager()
@@ -888,6 +1075,36 @@ def test_rule_execute(mockbot):
     assert result == 'The return value'
 
 
+def test_rule_execute_async(mockbot):
+    regex = re.compile(r'.*')
+
+    def handler(wrapped, trigger):
+        return 'The return value'
+
+    rule = rules.Rule([regex], handler=handler)
+    assert not rule.is_async()
+
+    async def async_handler(wrapped, trigger):
+        await wrapped.say('Hi!')
+        return 'The return value'
+
+    rule = rules.Rule([regex], handler=async_handler)
+    assert rule.is_async()
+
+    line = ':Foo!foo@example.com PRIVMSG #sopel :Hello, world'
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+    matches = list(rule.match(mockbot, pretrigger))
+    match = matches[0]
+    match_trigger = trigger.Trigger(
+        mockbot.settings, pretrigger, match, account=None)
+    wrapped = bot.AsyncSopelWrapper(mockbot, match_trigger)
+    result = asyncio.run(rule.execute_async(wrapped, match_trigger))
+
+    assert mockbot.backend.message_sent == rawlist('PRIVMSG #sopel :Hi!')
+    assert result == 'The return value'
+    assert rule.is_global_rate_limited() is False
+
+
 def test_rule_from_callable(mockbot):
     # prepare callable
     @plugin.rule(r'hello', r'hi', r'hey', r'hello|hi')
@@ -2946,6 +3163,32 @@ def test_url_callback_execute(mockbot):
     assert result == 'The return value: https://example.com/test'
 
 
+def test_url_callback_from_callable_async(mockbot):
+    line = (
+        ':Foo!foo@example.com PRIVMSG #sopel :'
+        'some link https://example.com/test in your line'
+    )
+
+    @plugin.url(re.escape('https://example.com/') + r'(\w+)')
+    async def handler(wrapped, trigger, match):
+        await wrapped.say('Hi!')
+        return 'The return value: %s' % match.group(0)
+
+    loader.clean_callable(handler, mockbot.settings)
+    rule = rules.URLCallback.from_callable(mockbot.settings, handler)
+    assert rule.is_async()
+
+    pretrigger = trigger.PreTrigger(mockbot.nick, line)
+    matches = list(rule.match(mockbot, pretrigger))
+    match_trigger = trigger.Trigger(
+        mockbot.settings, pretrigger, matches[0], account=None)
+    wrapped = bot.AsyncSopelWrapper(mockbot, match_trigger)
+    result = asyncio.run(rule.execute_async(wrapped, match_trigger))
+
+    assert mockbot.backend.message_sent == rawlist('PRIVMSG #sopel :Hi!')
+    assert result == 'The return value: https://example.com/test'
+
+
 def test_url_callback_match_filter_intent(mockbot):
     test_url = 'https://example.com/test'
     line = (
@@ -1,8 +1,10 @@
 """Tests for core ``sopel.bot`` module"""
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 import re
+import threading
 import typing
 
 import pytest
@@ -647,6 +649,56 @@ def test_call_rule(mockbot):
     assert items == [1, 1]
 
 
+def test_call_rule_channel_disabled(configfactory, botfactory):
+    settings = configfactory('test.cfg', TMP_CONFIG + """
+[#Channel]
+disable_plugins = otherplugin,testplugin
+
+[#other]
+disable_commands = {'testplugin': ['testrule'], 'other': ['rule']}
+
+[#all]
+disable_plugins = *
+""")
+    mockbot = botfactory(settings)
+    items = []
+
+    def testrule(bot, trigger):
+        items.append(trigger.sender)
+
+    rule_hello = rules.Rule(
+        [re.compile(r'hello')],
+        plugin='testplugin',
+        label='testrule',
+        handler=testrule)
+
+    line = ':Test!test@example.com PRIVMSG %s :hello'
+    for channel in ['#channel', '#other', '#all', '#enabled', 'Test']:
+        pretrigger = trigger.PreTrigger(mockbot.nick, line % channel)
+        match = list(rule_hello.match(mockbot, pretrigger))[0]
+        rule_trigger = trigger.Trigger(
+            mockbot.settings, pretrigger, match, account=None)
+        wrapper = bot.SopelWrapper(mockbot, rule_trigger)
+        mockbot.call_rule(rule_hello, wrapper, rule_trigger)
+
+    assert items == ['#enabled', 'Test']
+
+    # changing the settings updates the restrictions
+    mockbot.settings['#other'].disable_commands = "{'other': ['rule']}"
+    mockbot.settings['#all'].disable_plugins = 'otherplugin'
+
+    items.clear()
+    for channel in ['#channel', '#other', '#all']:
+        pretrigger = trigger.PreTrigger(mockbot.nick, line % channel)
+        match = list(rule_hello.match(mockbot, pretrigger))[0]
+        rule_trigger = trigger.Trigger(
+            mockbot.settings, pretrigger, match, account=None)
+        wrapper = bot.SopelWrapper(mockbot, rule_trigger)
+        mockbot.call_rule(rule_hello, wrapper, rule_trigger)
+
+    assert items == ['#other', '#all']
+
+
 def test_call_rule_rate_limited_user(mockbot):
     items = []
 
@@ -967,6 +1019,277 @@ def test_call_rule_rate_limited_global_with_message(mockbot):
     assert items == [1], 'There must not be any new item'
 
 
+# -----------------------------------------------------------------------------
+# Dispatch
+
+def test_dispatch_threaded_rule(mockbot):
+    release = threading.Event()
+    items = []
+
+    def testrule(bot, trigger):
+        release.wait(5)
+        items.append(threading.current_thread().name)
+        bot.say('hi')
+
+    mockbot._rules_manager.register(rules.Rule(
+        [re.compile(r'hello')],
+        plugin='testplugin',
+        label='testrule',
+        handler=testrule))
+
+    line = ':Test!test@example.com PRIVMSG #channel :hello'
+    mockbot.dispatch(trigger.PreTrigger(mockbot.nick, line))
+
+    running = mockbot.running_triggers
+    assert len(running) == 1
+    assert running[0].name == 'testplugin-testrule'
+    assert running[0].is_alive()
+
+    release.set()
+    running[0].join()
+
+    assert not mockbot.running_triggers
+    assert items == ['Dispatch-1']
+    assert mockbot.backend.message_sent == rawlist('PRIVMSG #channel :hi')
+
+
+def test_dispatch_no_event_rules(mockbot, monkeypatch):
+    def get_triggered_rules(bot, pretrigger):
+        raise AssertionError('No rule listens to %s' % pretrigger.event)
+
+    mockbot._rules_manager.register(rules.Rule(
+        [re.compile(r'hello')],
+        plugin='testplugin',
+        label='testrule',
+        handler=lambda bot, trigger: None))
+    monkeypatch.setattr(
+        mockbot._rules_manager, 'get_triggered_rules', get_triggered_rules)
+
+    mockbot.dispatch(trigger.PreTrigger(mockbot.nick, 'PING :irc.example.com'))
+    mockbot.dispatch(trigger.PreTrigger(
+        mockbot.nick, ':irc.example.com 372 TestBot :- Welcome!'))
+
+    # but there is a rule for PRIVMSG
+    with pytest.raises(AssertionError):
+        mockbot.dispatch(trigger.PreTrigger(
+            mockbot.nick, ':Test!test@example.com PRIVMSG #channel :hello'))
+
+
+def test_dispatch_reply_collector(mockbot, caplog):
+    collected = []
+
+    def collector(bot, pretrigger):
+        collected.append(pretrigger.args[-1])
+        if pretrigger.args[-1] == 'error':
+            raise ValueError('Oops')
+
+    mockbot.register_reply_collector('353', collector)
+    mockbot.dispatch(trigger.PreTrigger(
+        mockbot.nick, ':irc.example.com 353 TestBot = #sopel :Alice Bob'))
+    mockbot.dispatch(trigger.PreTrigger(
+        mockbot.nick, ':irc.example.com 353 TestBot = #sopel :error'))
+    mockbot.dispatch(trigger.PreTrigger(
+        mockbot.nick, ':irc.example.com 366 TestBot #sopel :End of NAMES'))
+
+    assert collected == ['Alice Bob', 'error']
+    assert 'Error in 353 reply collector' in caplog.text
+
+    mockbot.unregister_reply_collector('353')
+    mockbot.dispatch(trigger.PreTrigger(
+        mockbot.nick, ':irc.example.com 353 TestBot = #sopel :Carol'))
+
+    assert collected == ['Alice Bob', 'error']
+
+
+def test_dispatch_async_rule(mockbot):
+    items = []
+
+    async def testrule(bot, trigger):
+        await asyncio.sleep(0)
+        await bot.say('hi')
+        await bot.reply('hello')
+        items.append(threading.current_thread().name)
+
+    mockbot._rules_manager.register(rules.Rule(
+        [re.compile(r'hello')],
+        plugin='testplugin',
+        label='testrule',
+        handler=testrule))
+
+    line = ':Test!test@example.com PRIVMSG #channel :hello'
+    mockbot.dispatch(trigger.PreTrigger(mockbot.nick, line))
+
+    # no thread for asynchronous rules
+    assert not mockbot.running_triggers
+    assert items == [threading.current_thread().name]
+    assert mockbot.backend.message_sent == rawlist(
+        'PRIVMSG #channel :hi',
+        'PRIVMSG #channel :Test: hello',
+    )
+
+
+def test_dispatch_async_rule_error(mockbot):
+    async def testrule(bot, trigger):
+        raise ValueError('expected')
+
+    mockbot._rules_manager.register(rules.Rule(
+        [re.compile(r'hello')],
+        plugin='testplugin',
+        label='testrule',
+        handler=testrule))
+
+    line = ':Test!test@example.com PRIVMSG #channel :hello'
+    mockbot.dispatch(trigger.PreTrigger(mockbot.nick, line))
+
+    assert len(mockbot.backend.message_sent) == 1
+    assert mockbot.backend.message_sent[0].startswith(
+        b'PRIVMSG #channel :Unexpected error (expected) from Test')
+
+
+def test_dispatch_async_rule_rate_limited(mockbot):
+    items = []
+
+    async def testrule(bot, trigger):
+        items.append(1)
+
+    mockbot._rules_manager.register(rules.Rule(
+        [re.compile(r'hello')],
+        plugin='testplugin',
+        label='testrule',
+        handler=testrule,
+        user_rate_limit=100,
+        user_rate_message='Rate limited'))
+
+    line = ':Test!test@example.com PRIVMSG #channel :hello'
+    mockbot.dispatch(trigger.PreTrigger(mockbot.nick, line))
+    mockbot.dispatch(trigger.PreTrigger(mockbot.nick, line))
+
+    assert items == [1]
+    assert mockbot.backend.message_sent == rawlist(
+        'NOTICE Test :Rate limited',
+    )
+
+
+CHANNEL_LINE = ':Test!test@example.com PRIVMSG #channel :hello'
+PRIVATE_LINE = ':Test!test@example.com PRIVMSG TestBot :hello'
+ASYNC_GUARDS = (
+    # decorator, its arguments, allowed line, denied line
+    (plugin.require_privmsg, (), PRIVATE_LINE, CHANNEL_LINE),
+    (plugin.require_chanmsg, (), CHANNEL_LINE, PRIVATE_LINE),
+    (
+        plugin.require_account,
+        (),
+        '@account=Test ' + CHANNEL_LINE,
+        CHANNEL_LINE,
+    ),
+    (
+        plugin.require_admin,
+        (),
+        CHANNEL_LINE.replace('Test!', 'testnick!'),
+        CHANNEL_LINE,
+    ),
+    (
+        plugin.require_owner,
+        (),
+        CHANNEL_LINE.replace('Test!', 'testnick!'),
+        CHANNEL_LINE,
+    ),
+    (
+        plugin.require_privilege,
+        (plugin.OP,),
+        CHANNEL_LINE.replace('Test!', 'Operator!'),
+        CHANNEL_LINE,
+    ),
+    (
+        plugin.require_bot_privilege,
+        (plugin.OP,),
+        CHANNEL_LINE.replace('#channel', '#opchannel'),
+        CHANNEL_LINE,
+    ),
+)
+
+
+@pytest.mark.parametrize('reply', [False, True])
+@pytest.mark.parametrize('decorator, args, allowed, denied', ASYNC_GUARDS)
+def test_dispatch_async_rule_guarded(
+    mockbot, decorator, args, allowed, denied, reply,
+):
+    items = []
+
+    async def testrule(bot, trigger):
+        await asyncio.sleep(0)
+        items.append(trigger.nick)
+
+    handler = decorator(*args, 'denied', reply=reply)(testrule)
+    assert asyncio.iscoroutinefunction(handler)
+
+    for name in ['#channel', '#opchannel']:
+        channel = mockbot.channels[Identifier(name)] = target.Channel(
+            Identifier(name))
+        for nick, privileges in [('Test', 0), ('Operator', plugin.OP)]:
+            channel.add_user(
+                target.User(Identifier(nick), 'user', 'example.com'),
+                privileges)
+    mockbot.channels[Identifier('#opchannel')].add_user(
+        target.User(mockbot.nick, 'bot', 'example.com'), plugin.OP)
+
+    mockbot._rules_manager.register(rules.Rule(
+        [re.compile(r'hello')],
+        plugin='testplugin',
+        label='testrule',
+        handler=handler))
+
+    mockbot.dispatch(trigger.PreTrigger(mockbot.nick, allowed))
+    assert len(items) == 1, 'The handler must be awaited'
+    assert not mockbot.backend.message_sent
+
+    mockbot.dispatch(trigger.PreTrigger(mockbot.nick, denied))
+    assert len(items) == 1, 'The handler must not run'
+    assert len(mockbot.backend.message_sent) == 1
+    assert mockbot.backend.message_sent[0].endswith(b'denied\r\n')
+
+
+def test_dispatch_backpressure_drop(configfactory, botfactory):
+    settings = configfactory('test.cfg', TMP_CONFIG + """
+dispatch_workers = 1
+dispatch_queue_size = 1
+dispatch_backpressure = drop
+""")
+    mockbot = botfactory(settings)
+    started = threading.Event()
+    release = threading.Event()
+    items = []
+
+    def testrule(bot, trigger):
+        started.set()
+        release.wait(5)
+        items.append(trigger.group(0))
+
+    mockbot._rules_manager.register(rules.Rule(
+        [re.compile(r'hello \d')],
+        plugin='testplugin',
+        label='testrule',
+        handler=testrule))
+
+    line = ':Test!test@example.com PRIVMSG #channel :hello %d'
+    try:
+        mockbot.dispatch(trigger.PreTrigger(mockbot.nick, line % 1))
+        assert started.wait(5)
+        mockbot.dispatch(trigger.PreTrigger(mockbot.nick, line % 2))
+        mockbot.dispatch(trigger.PreTrigger(mockbot.nick, line % 3))
+
+        # the third one is dropped: one running, one queued
+        running = mockbot.running_triggers
+        assert len(running) == 2
+    finally:
+        release.set()
+
+    for task in running:
+        task.join()
+
+    assert items == ['hello 1', 'hello 2']
+
+
 # -----------------------------------------------------------------------------
 # Channel privileges
 
@@ -396,3 +396,27 @@ def test_get_defined_sections(multi_fakeconfig):
     assert 'spam' in items
     assert 'somesection' not in items, (
         'somesection was not defined and should not appear as such')
+
+
+def test_revision(multi_fakeconfig):
+    revision = multi_fakeconfig.revision
+
+    # reading values doesn't change the revision
+    assert multi_fakeconfig.spam.eggs
+    assert multi_fakeconfig.somesection.is_defined == 'no'
+    assert multi_fakeconfig.revision == revision
+
+    multi_fakeconfig.spam.eggs = ['one', 'two']
+    assert multi_fakeconfig.revision > revision
+
+    revision = multi_fakeconfig.revision
+    multi_fakeconfig.somesection.is_defined = 'yes'
+    assert multi_fakeconfig.revision > revision
+
+    revision = multi_fakeconfig.revision
+    multi_fakeconfig.add_section('newsection')
+    assert multi_fakeconfig.revision > revision
+
+    revision = multi_fakeconfig.revision
+    multi_fakeconfig.save()
+    assert multi_fakeconfig.revision > revision
@@ -1,13 +1,13 @@
 """coretasks.py tests"""
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import logging
 
 import pytest
 
 from sopel import coretasks
-from sopel.irc import isupport
+from sopel.irc import flood, isupport
 from sopel.module import ADMIN, HALFOP, OP, OWNER, VOICE
 from sopel.tests import rawlist
 from sopel.tools import Identifier
@@ -574,3 +574,369 @@ def test_handle_rpl_namreply_with_malformed_uhnames(mockbot, caplog):
 
     assert len(caplog.messages) == 1
     assert 'RPL_NAMREPLY item without a hostmask' in caplog.messages[0]
+
+
+def test_track_nicks_and_quit(mockbot, ircfactory):
+    irc = ircfactory(mockbot)
+    irc.channel_joined('#test', ['@Alice', 'Bob'])
+    irc.channel_joined('#other', ['Alice'])
+    irc.channel_joined('#third', ['Bob'])
+
+    alice = mockbot.users['Alice']
+    assert sorted(alice.channels) == ['#other', '#test']
+    assert mockbot.channels['#test'].users['Alice'] is alice
+    assert mockbot.channels['#other'].users['Alice'] is alice
+
+    mockbot.on_message(':Alice!alice@example.com NICK :Alicia')
+
+    assert 'Alice' not in mockbot.users
+    assert mockbot.users['Alicia'] is alice
+    assert alice.nick == 'Alicia'
+    assert mockbot.channels['#test'].users['Alicia'] is alice
+    assert mockbot.channels['#test'].privileges['Alicia'] == OP
+    assert mockbot.channels['#other'].privileges['Alicia'] == 0
+    assert 'Alice' not in mockbot.channels['#test'].privileges
+
+    mockbot.on_message(':Alicia!alice@example.com QUIT :bye')
+
+    assert 'Alicia' not in mockbot.users
+    assert not alice.channels
+    for channel in mockbot.channels.values():
+        assert 'Alicia' not in channel.users
+        assert 'Alicia' not in channel.privileges
+
+    # other users are left alone
+    bob = mockbot.users['Bob']
+    assert sorted(bob.channels) == ['#test', '#third']
+
+
+def test_bot_part_clears_users(mockbot, ircfactory):
+    irc = ircfactory(mockbot)
+    irc.channel_joined('#test', ['Alice', 'Bob'])
+    irc.channel_joined('#other', ['Bob'])
+
+    mockbot.on_message(':TestBot!bot@example.com PART #test')
+
+    assert '#test' not in mockbot.channels
+    assert 'Alice' not in mockbot.users
+    assert list(mockbot.users['Bob'].channels) == ['#other']
+
+
+@pytest.fixture
+def join_bot(mockbot, monkeypatch):
+    deferred = []
+
+    def call_later(delay, callback, *args):
+        deferred.append((delay, callback, args))
+
+    monkeypatch.setattr(mockbot.backend, 'call_later', call_later)
+    mockbot.deferred_calls = deferred
+    return mockbot
+
+
+def join_threads(bot):
+    for thread in bot.running_triggers:
+        thread.join()
+
+
+def run_deferred(bot):
+    delay, callback, args = bot.deferred_calls.pop(0)
+    callback(*args)
+    return delay
+
+
+def test_join_channels_batched(join_bot):
+    join_bot.settings.core.channels = ['#a', '#b key', '#c']
+    join_bot.on_message(':irc.example.com 376 TestBot :End of MOTD')
+
+    assert join_bot.backend.message_sent == rawlist('JOIN #b,#a,#c key')
+    assert not join_bot.deferred_calls
+    assert not join_bot.join_scheduler.pending
+
+
+def test_join_channels_targmax(join_bot):
+    join_bot._isupport = isupport.ISupport(targmax=(('JOIN', 2),))
+    join_bot.settings.core.channels = ['#a', '#b', '#c']
+    join_bot.on_message(':irc.example.com 376 TestBot :End of MOTD')
+
+    assert join_bot.backend.message_sent == rawlist('JOIN #a,#b', 'JOIN #c')
+
+
+def test_join_channels_chanlimit(join_bot, caplog):
+    join_bot._isupport = isupport.ISupport(chanlimit=(('#', 2), ('&', None)))
+    join_bot.settings.core.channels = ['#a', '&b', '#c', '#d']
+    join_bot.on_message(':irc.example.com 376 TestBot :End of MOTD')
+
+    assert join_bot.backend.message_sent == rawlist('JOIN #a,&b,#c')
+    assert 'Not joining #d' in caplog.text
+
+
+def test_join_channels_throttled(join_bot):
+    join_bot.settings.core.throttle_join = 2
+    join_bot.settings.core.throttle_wait = 5
+    join_bot.settings.core.channels = ['#a', '#b', '#c', '#d', '#e']
+    join_bot.on_message(':irc.example.com 376 TestBot :End of MOTD')
+
+    # first batch is sent right away, the next ones later
+    assert join_bot.backend.message_sent == rawlist('JOIN #a,#b')
+    assert join_bot.join_scheduler.pending == 3
+
+    # WHO requests wait until every channel has been joined
+    join_bot.on_message(':TestBot!bot@example.com JOIN #a')
+    coretasks._join_event_processing(join_bot)
+    assert join_bot.backend.message_sent == rawlist('JOIN #a,#b')
+
+    assert run_deferred(join_bot) == 5
+    assert join_bot.backend.message_sent == rawlist(
+        'JOIN #a,#b',
+        'JOIN #c,#d',
+    )
+    assert run_deferred(join_bot) == 5
+    assert join_bot.backend.message_sent == rawlist(
+        'JOIN #a,#b',
+        'JOIN #c,#d',
+        'JOIN #e',
+    )
+    assert not join_bot.deferred_calls
+    assert not join_bot.join_scheduler.pending
+
+    coretasks._join_event_processing(join_bot)
+    assert join_bot.backend.message_sent[3:] == rawlist('MODE #a', 'WHO #a')
+
+
+def test_retry_join(join_bot):
+    join_bot.on_message(
+        ':irc.example.com 477 TestBot #sopel :Cannot join channel (+R)')
+    join_threads(join_bot)
+
+    # first retry is immediate
+    assert join_bot.backend.message_sent == rawlist('JOIN #sopel')
+    assert not join_bot.deferred_calls
+
+    join_bot.on_message(
+        ':irc.example.com 477 TestBot #sopel :Cannot join channel (+R)')
+    join_threads(join_bot)
+
+    # next ones wait for 6s, without blocking
+    assert join_bot.backend.message_sent == rawlist('JOIN #sopel')
+    assert run_deferred(join_bot) == 6
+    assert join_bot.backend.message_sent == rawlist(
+        'JOIN #sopel',
+        'JOIN #sopel',
+    )
+
+
+def test_join_send_who_budget(mockbot):
+    mockbot.memory['who_refresh'] = flood.WhoRefreshQueue(2)
+    for name in ['#a', '#b', '#c', '#d', '#e']:
+        mockbot.on_message(':TestBot!bot@example.com JOIN %s' % name)
+    mockbot.on_message(':TestBot!bot@example.com PART #c')
+
+    # nothing is sent right away, even without throttle_join
+    assert mockbot.backend.message_sent == []
+
+    # the budget of reply lines paces the WHO requests
+    coretasks._join_event_processing(mockbot)
+    assert mockbot.backend.message_sent == rawlist(
+        'MODE #a', 'WHO #a', 'MODE #b', 'WHO #b')
+    coretasks._join_event_processing(mockbot)
+    assert len(mockbot.backend.message_sent) == 4
+
+    # a minute later, the budget is refilled
+    mockbot.memory['who_refresh']._refilled -= timedelta(seconds=60)
+    coretasks._join_event_processing(mockbot)
+    assert mockbot.backend.message_sent[4:] == rawlist(
+        'MODE #d', 'WHO #d', 'MODE #e', 'WHO #e')
+    assert not mockbot.memory['join_events_queue']
+
+
+def test_join_send_who_no_budget(mockbot):
+    mockbot.memory['who_refresh'] = flood.WhoRefreshQueue(0)
+    mockbot.on_message(':TestBot!bot@example.com JOIN #a')
+    mockbot.on_message(':TestBot!bot@example.com JOIN #b')
+
+    # one at a time
+    coretasks._join_event_processing(mockbot)
+    assert mockbot.backend.message_sent == rawlist('MODE #a', 'WHO #a')
+    coretasks._join_event_processing(mockbot)
+    assert mockbot.backend.message_sent[2:] == rawlist('MODE #b', 'WHO #b')
+
+
+def test_periodic_send_who(mockbot):
+    mockbot.on_message(':TestBot!bot@example.com JOIN #a')
+    mockbot.on_message(':TestBot!bot@example.com JOIN #b')
+    coretasks._join_event_processing(mockbot)
+    assert mockbot.backend.message_sent == rawlist(
+        'MODE #a', 'WHO #a', 'MODE #b', 'WHO #b')
+    mockbot.backend.clear_message_sent()
+
+    # channels were refreshed when joined
+    coretasks._periodic_send_who(mockbot)
+    assert mockbot.backend.message_sent == []
+
+    # 5 minutes later
+    for channel in mockbot.channels.values():
+        channel.last_who -= timedelta(seconds=300)
+        mockbot.memory['who_refresh'].push(channel.name, channel.last_who)
+
+    coretasks._periodic_send_who(mockbot)
+    assert mockbot.backend.message_sent == rawlist('WHO #a', 'WHO #b')
+
+
+def test_periodic_send_who_away_notify(mockbot, ircfactory):
+    irc = ircfactory(mockbot)
+    irc.channel_joined('#a', ['Alice'])
+    mockbot.backend.clear_message_sent()
+    mockbot.enabled_capabilities.add('away-notify')
+    mockbot.channels['#a'].last_who = None
+    mockbot.memory['who_refresh'].push('#a', None)
+
+    coretasks._periodic_send_who(mockbot)
+    assert mockbot.backend.message_sent == []
+
+
+def test_handle_names_bulk(mockbot):
+    mockbot._isupport = isupport.ISupport(
+        prefix=(('q', '~'), ('o', '@'), ('v', '+')))
+    mockbot.on_message(
+        ':irc.example.com 353 TestBot = #sopel :TestBot @Alice ~@Bob')
+    mockbot.on_message(':irc.example.com 353 TestBot = #sopel :+Carol Dave')
+
+    # nothing is recorded until the end of the list
+    assert '#sopel' not in mockbot.channels
+
+    mockbot.on_message(':irc.example.com 366 TestBot #sopel :End of /NAMES')
+
+    channel = mockbot.channels['#sopel']
+    assert sorted(channel.users) == ['Alice', 'Bob', 'Carol', 'Dave', 'TestBot']
+    assert channel.privileges['Alice'] == OP
+    assert channel.privileges['Bob'] == OWNER | OP
+    assert channel.privileges['Carol'] == VOICE
+    assert channel.privileges['Dave'] == 0
+    assert not mockbot.memory['names_replies']
+
+
+def test_handle_names_interleaved(mockbot):
+    mockbot.on_message(':irc.example.com 353 TestBot = #a :TestBot @Alice')
+    mockbot.on_message(':irc.example.com 353 TestBot = #b :TestBot Bob')
+    mockbot.on_message(':irc.example.com 366 TestBot #a :End of /NAMES')
+
+    # only the list that ended is recorded
+    assert sorted(mockbot.channels['#a'].users) == ['Alice', 'TestBot']
+    assert '#b' not in mockbot.channels
+    assert list(mockbot.memory['names_replies']) == ['#b']
+
+    mockbot.on_message(':irc.example.com 353 TestBot = #b :+Carol')
+    mockbot.on_message(':irc.example.com 366 TestBot #B :End of /NAMES')
+
+    assert sorted(mockbot.channels['#b'].users) == ['Bob', 'Carol', 'TestBot']
+    assert mockbot.channels['#b'].privileges['Carol'] == VOICE
+    assert not mockbot.memory['names_replies']
+
+
+def test_handle_names_other_channel_type(mockbot):
+    mockbot.on_message(':irc.example.com 353 TestBot = &local :TestBot %Alice')
+    mockbot.on_message(':irc.example.com 366 TestBot &local :End of /NAMES')
+
+    assert mockbot.channels['&local'].privileges['Alice'] == HALFOP
+
+
+def test_recv_who_bulk(mockbot):
+    mockbot.on_message(
+        ':irc.example.com 352 TestBot #sopel alice example.com '
+        'irc.example.com Alice H@ :0 Alice')
+    mockbot.on_message(
+        ':irc.example.com 352 TestBot #sopel bob example.org '
+        'irc.example.com Bob G+ :0 Bob')
+
+    # nothing is recorded until the end of the list
+    assert 'Alice' not in mockbot.users
+
+    mockbot.on_message(':irc.example.com 315 TestBot #sopel :End of WHO')
+
+    alice = mockbot.users['Alice']
+    bob = mockbot.users['Bob']
+    assert (alice.user, alice.host, alice.away) == (
+        'alice', 'example.com', False)
+    assert (bob.user, bob.host, bob.away) == ('bob', 'example.org', True)
+    assert mockbot.channels['#sopel'].privileges['Alice'] == OP
+    assert mockbot.channels['#sopel'].privileges['Bob'] == VOICE
+    assert not mockbot.memory['who_replies']
+
+
+def test_recv_who_interleaved(mockbot):
+    mockbot.on_message(
+        ':irc.example.com 352 TestBot #a alice example.com '
+        'irc.example.com Alice H@ :0 Alice')
+    mockbot.on_message(
+        ':irc.example.com 352 TestBot #b bob example.org '
+        'irc.example.com Bob H :0 Bob')
+    # a WHO list for something else than a channel doesn't end the others
+    mockbot.on_message(':irc.example.com 315 TestBot Carol :End of WHO')
+    assert 'Alice' not in mockbot.users
+
+    mockbot.on_message(':irc.example.com 315 TestBot #a :End of WHO')
+
+    assert mockbot.channels['#a'].privileges['Alice'] == OP
+    assert 'Bob' not in mockbot.users
+    assert list(mockbot.memory['who_replies']) == ['#b']
+
+    mockbot.on_message(':irc.example.com 315 TestBot #b :End of WHO')
+
+    assert mockbot.users['Bob'].host == 'example.org'
+    assert not mockbot.memory['who_replies']
+
+
+def test_who_names_replies_collected(mockbot, monkeypatch):
+    def get_triggered_rules(bot, pretrigger):
+        raise AssertionError('Rule dispatch for %s' % pretrigger.event)
+
+    monkeypatch.setattr(
+        mockbot._rules_manager, 'get_triggered_rules', get_triggered_rules)
+
+    mockbot.on_message(
+        ':irc.example.com 353 TestBot = #sopel :Alice @Bob')
+    mockbot.on_message(
+        ':irc.example.com 352 TestBot #sopel alice example.com '
+        'irc.example.com Alice H@ :0 Alice')
+
+    assert list(mockbot.memory['names_replies']) == ['#sopel']
+    assert list(mockbot.memory['who_replies']) == ['#sopel']
+
+
+def test_recv_who_nick(mockbot):
+    mockbot.on_message(
+        ':irc.example.com 352 TestBot * ~u host irc.example.com '
+        'Alice G :0 Alice')
+
+    # no channel list to wait for
+    assert not mockbot.memory['who_replies']
+    alice = mockbot.users['Alice']
+    assert (alice.user, alice.host, alice.away) == ('~u', 'host', True)
+    assert not alice.channels
+
+    mockbot.on_message(':irc.example.com 315 TestBot Alice :End of WHO')
+
+    assert not mockbot.memory['who_replies']
+    assert '*' not in mockbot.channels
+
+
+def test_recv_whox_bulk(mockbot):
+    mockbot._isupport = isupport.ISupport(whox=True)
+    mockbot.on_message(
+        ':irc.example.com 354 TestBot 999 #sopel alice example.com '
+        'Alice H@ alice')
+    mockbot.on_message(
+        ':irc.example.com 354 TestBot 999 #sopel bob example.org '
+        'Bob H 0')
+    # not queried by coretasks
+    mockbot.on_message(
+        ':irc.example.com 354 TestBot 123 #sopel carol example.org '
+        'Carol H 0')
+    mockbot.on_message(':irc.example.com 315 TestBot #sopel :End of WHO')
+
+    assert mockbot.users['Alice'].account == 'alice'
+    assert mockbot.users['Bob'].account is None
+    assert 'Carol' not in mockbot.users
+    assert mockbot.channels['#sopel'].privileges['Alice'] == OP
+    assert mockbot.channels['#sopel'].privileges['Bob'] == 0
@@ -6,13 +6,18 @@ practice would probably be not to do that."""
 from __future__ import annotations
 
 import json
+import threading
+import time
 
 import pytest
+from sqlalchemy import event
 from sqlalchemy.engine import make_url
 from sqlalchemy.sql import func, select, text
 
 from sopel.db import (
     ChannelValues,
+    DBCache,
+    DBWriteQueue,
     NickIDs,
     Nicknames,
     NickValues,
@@ -26,12 +31,22 @@ TMP_CONFIG = """
 [core]
 owner = Pepperpots
 db_filename = {db_filename}
+db_cache_size = {db_cache_size}
+db_async_writes = {db_async_writes}
 """
 
 
-@pytest.fixture
-def tmpconfig(configfactory, tmpdir):
-    content = TMP_CONFIG.format(db_filename=tmpdir.join('test.sqlite'))
+@pytest.fixture(params=[
+    (0, False),
+    (100, False),
+    (100, True),
+], ids=['no-cache', 'cache', 'cache-async'])
+def tmpconfig(configfactory, tmpdir, request):
+    content = TMP_CONFIG.format(
+        db_filename=tmpdir.join('test.sqlite'),
+        db_cache_size=request.param[0],
+        db_async_writes=request.param[1],
+    )
     return configfactory('default.cfg', content)
 
 
@@ -42,6 +57,407 @@ def db(tmpconfig):
     return db
 
 
+@pytest.fixture
+def cached_db(configfactory, tmpdir):
+    content = TMP_CONFIG.format(
+        db_filename=tmpdir.join('cached.sqlite'),
+        db_cache_size=100,
+        db_async_writes=False,
+    )
+    return SopelDB(configfactory('cached.cfg', content))
+
+
+def flush_writes(db: SopelDB):
+    if db.write_queue is not None:
+        assert db.write_queue.flush(timeout=10)
+
+
+# Test engine options
+
+def get_pragma(db: SopelDB, name: str):
+    with db.engine.connect() as connection:
+        return connection.exec_driver_sql('PRAGMA %s' % name).scalar()
+
+
+def test_sqlite_pragmas_default(db: SopelDB):
+    assert get_pragma(db, 'journal_mode') == 'wal'
+    assert get_pragma(db, 'synchronous') == 1  # NORMAL
+    assert get_pragma(db, 'busy_timeout') == 5000
+    assert get_pragma(db, 'mmap_size') == 0
+
+
+def test_sqlite_pragmas(configfactory, tmpdir):
+    content = TMP_CONFIG.format(
+        db_filename=tmpdir.join('pragmas.sqlite'),
+        db_cache_size=0,
+        db_async_writes=False,
+    ) + (
+        'db_sqlite_journal_mode = delete\n'
+        'db_sqlite_synchronous = full\n'
+        'db_sqlite_busy_timeout = 1000\n'
+        'db_sqlite_mmap_size = 1048576\n'
+    )
+    db = SopelDB(configfactory('pragmas.cfg', content))
+
+    assert get_pragma(db, 'journal_mode') == 'delete'
+    assert get_pragma(db, 'synchronous') == 2  # FULL
+    assert get_pragma(db, 'busy_timeout') == 1000
+    assert get_pragma(db, 'mmap_size') == 1048576
+
+
+# Test cache
+
+def test_cache_get_set():
+    cache = DBCache(max_size=10, ttl=60)
+
+    assert cache.get(('plugin', 'test', 'key')) == (False, None)
+    cache.set(('plugin', 'test', 'key'), '"value"', cache.version)
+    cache.set(('plugin', 'test', 'none'), None, cache.version)
+
+    assert cache.get(('plugin', 'test', 'key')) == (True, '"value"')
+    assert cache.get(('plugin', 'test', 'none')) == (True, None)
+    assert cache.hits == 2
+    assert cache.misses == 1
+    assert cache.hit_rate == 2 / 3
+
+
+def test_cache_lru():
+    cache = DBCache(max_size=2, ttl=60)
+    cache.set(('a',), 1, cache.version)
+    cache.set(('b',), 2, cache.version)
+    cache.get(('a',))
+    cache.set(('c',), 3, cache.version)
+
+    assert len(cache) == 2
+    assert cache.get(('a',)) == (True, 1)
+    assert cache.get(('b',)) == (False, None)
+    assert cache.get(('c',)) == (True, 3)
+
+
+def test_cache_ttl(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr('sopel.db.time.monotonic', lambda: now)
+    cache = DBCache(max_size=10, ttl=60)
+    cache.set(('a',), 1, cache.version)
+
+    now = 1059.0
+    assert cache.get(('a',)) == (True, 1)
+    now = 1060.0
+    assert cache.get(('a',)) == (False, None)
+    assert len(cache) == 0
+
+
+def test_cache_set_after_invalidation():
+    cache = DBCache(max_size=10, ttl=60)
+    version = cache.version
+    # a concurrent write invalidates a key while a value is being read
+    cache.invalidate(('a',))
+    cache.set(('a',), 'stale', version)
+
+    assert cache.get(('a',)) == (False, None)
+
+
+def test_cache_invalidate_if():
+    cache = DBCache(max_size=10, ttl=60)
+    cache.set(('channel', '#a', 'key'), 1, cache.version)
+    cache.set(('channel', '#b', 'key'), 2, cache.version)
+    cache.invalidate_if(lambda key, value: key[1] == '#a')
+
+    assert cache.get(('channel', '#a', 'key')) == (False, None)
+    assert cache.get(('channel', '#b', 'key')) == (True, 2)
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_cached_db_disabled(db: SopelDB, tmpconfig):
+    if tmpconfig.core.db_cache_size:
+        assert isinstance(db.cache, DBCache)
+    else:
+        assert db.cache is None
+
+
+def test_cached_db_reads(cached_db: SopelDB):
+    cached_db.set_plugin_value('plugin', 'key', 'value')
+    cached_db.set_nick_value('Exirel', 'key', 'value')
+    cached_db.set_channel_value('#sopel', 'key', 'value')
+
+    misses = None
+    for _ in range(2):
+        assert cached_db.get_plugin_value('plugin', 'key') == 'value'
+        assert cached_db.get_nick_value('EXIREL', 'key') == 'value'
+        assert cached_db.get_channel_value('#SOPEL', 'key') == 'value'
+        assert cached_db.get_nick_value('unknown', 'key', 'default') == 'default'
+
+        if misses is None:
+            misses = cached_db.cache.misses
+
+    # everything was found in the cache the second time
+    assert cached_db.cache.misses == misses
+
+
+def test_cached_db_invalidation(cached_db: SopelDB):
+    cached_db.set_nick_value('Exirel', 'key', 'old')
+    cached_db.set_channel_value('#sopel', 'key', 'old')
+    cached_db.set_plugin_value('plugin', 'key', 'old')
+    assert cached_db.get_nick_value('Exirel', 'key') == 'old'
+    assert cached_db.get_channel_value('#sopel', 'key') == 'old'
+    assert cached_db.get_plugin_value('plugin', 'key') == 'old'
+
+    cached_db.set_nick_value('Exirel', 'key', 'new')
+    cached_db.set_channel_value('#sopel', 'key', 'new')
+    cached_db.set_plugin_value('plugin', 'key', 'new')
+    assert cached_db.get_nick_value('Exirel', 'key') == 'new'
+    assert cached_db.get_channel_value('#sopel', 'key') == 'new'
+    assert cached_db.get_plugin_value('plugin', 'key') == 'new'
+
+    cached_db.delete_nick_value('Exirel', 'key')
+    cached_db.delete_channel_value('#sopel', 'key')
+    cached_db.delete_plugin_value('plugin', 'key')
+    assert cached_db.get_nick_value('Exirel', 'key') is None
+    assert cached_db.get_channel_value('#sopel', 'key') is None
+    assert cached_db.get_plugin_value('plugin', 'key') is None
+
+
+def test_cached_db_forget(cached_db: SopelDB):
+    cached_db.set_nick_value('Exirel', 'key', 'value')
+    cached_db.set_channel_value('#sopel', 'key', 'value')
+    cached_db.set_plugin_value('plugin', 'key', 'value')
+    assert cached_db.get_nick_value('Exirel', 'key') == 'value'
+    assert cached_db.get_channel_value('#sopel', 'key') == 'value'
+    assert cached_db.get_plugin_value('plugin', 'key') == 'value'
+
+    cached_db.forget_nick_group('Exirel')
+    cached_db.forget_channel('#sopel')
+    cached_db.forget_plugin('plugin')
+
+    assert cached_db.get_nick_value('Exirel', 'key') is None
+    assert cached_db.get_channel_value('#sopel', 'key') is None
+    assert cached_db.get_plugin_value('plugin', 'key') is None
+    with pytest.raises(ValueError):
+        cached_db.get_nick_id('Exirel')
+
+
+def test_cached_db_aliases(cached_db: SopelDB):
+    cached_db.set_nick_value('Exirel', 'key', 'value')
+    assert cached_db.get_nick_value('Exi', 'key') is None
+
+    cached_db.alias_nick('Exirel', 'Exi')
+    assert cached_db.get_nick_value('Exi', 'key') == 'value'
+
+    cached_db.unalias_nick('Exi')
+    assert cached_db.get_nick_value('Exi', 'key') is None
+
+    cached_db.set_nick_value('dgw', 'other', 'dgw value')
+    assert cached_db.get_nick_value('dgw', 'other') == 'dgw value'
+    cached_db.merge_nick_groups('Exirel', 'dgw')
+    assert cached_db.get_nick_id('dgw') == cached_db.get_nick_id('Exirel')
+    assert cached_db.get_nick_value('dgw', 'key') == 'value'
+    assert cached_db.get_nick_value('dgw', 'other') == 'dgw value'
+
+
+# Test write queue
+
+@pytest.fixture
+def async_db(configfactory, tmpdir):
+    content = TMP_CONFIG.format(
+        db_filename=tmpdir.join('async.sqlite'),
+        db_cache_size=0,
+        db_async_writes=True,
+    )
+    db = SopelDB(configfactory('async.cfg', content))
+    yield db
+    db.write_queue.stop(timeout=10)
+
+
+@pytest.fixture
+def paused_db(async_db, monkeypatch):
+    """Database whose writer waits for ``async_db.resume`` to be set."""
+    write_batch = async_db._write_batch
+    async_db.resume = threading.Event()
+    async_db.written = []
+
+    def paused_write_batch(batch):
+        async_db.resume.wait(10)
+        async_db.written.append(batch)
+        write_batch(batch)
+
+    monkeypatch.setattr(async_db, '_write_batch', paused_write_batch)
+    return async_db
+
+
+def test_write_queue_enabled(db: SopelDB, tmpconfig):
+    if tmpconfig.core.db_async_writes:
+        assert isinstance(db.write_queue, DBWriteQueue)
+    else:
+        assert db.write_queue is None
+
+
+def test_write_queue_read_your_writes(paused_db: SopelDB):
+    paused_db.set_nick_value('Exirel', 'key', 'value')
+    paused_db.set_channel_value('#Sopel', 'key', ['a', 'b'])
+    paused_db.set_plugin_values('plugin', {'key': 1, 'other': 2})
+    paused_db.delete_plugin_value('plugin', 'other')
+
+    # nothing is written yet
+    with paused_db.session() as session:
+        assert session.scalar(
+            select(func.count()).select_from(PluginValues)) == 0
+
+    assert paused_db.get_nick_value('EXIREL', 'key') == 'value'
+    assert paused_db.get_channel_value('#sopel', 'key') == ['a', 'b']
+    assert paused_db.get_plugin_value('plugin', 'key') == 1
+    assert paused_db.get_plugin_value('plugin', 'other', 'gone') == 'gone'
+    assert paused_db.get_plugin_values('plugin', ['key', 'other']) == {
+        'key': 1,
+        'other': None,
+    }
+
+    paused_db.resume.set()
+    assert paused_db.write_queue.flush(timeout=10)
+    assert len(paused_db.write_queue) == 0
+
+    assert paused_db._fetch_nick_value(
+        paused_db.get_nick_id('Exirel'), 'key') == '"value"'
+    assert paused_db._fetch_values(
+        ChannelValues, 'channel', '#sopel', ['key']) == {'key': '["a", "b"]'}
+    assert paused_db._fetch_values(
+        PluginValues, 'plugin', 'plugin', ['key', 'other']) == {'key': '1'}
+
+
+def test_write_queue_nick_no_io(paused_db: SopelDB):
+    statements = []
+    event.listen(
+        paused_db.engine, 'before_cursor_execute',
+        lambda conn, cursor, statement, *args: statements.append(
+            threading.current_thread()))
+
+    # without the cache, nick IDs are fetched by the writer only
+    paused_db.set_nick_value('NewNick', 'key', 'value')
+    paused_db.set_nick_values('Exirel', {'a': 1, 'b': 2})
+    paused_db.set_many_nick_values({'dgw': {'a': 3}})
+    paused_db.delete_nick_value('Unknown', 'key')
+    paused_db.delete_nick_value('Exirel', 'b')
+    assert statements == []
+
+    assert paused_db.get_nick_value('newnick', 'key') == 'value'
+    assert paused_db.get_nick_values('EXIREL', ['a', 'b']) == {
+        'a': 1,
+        'b': None,
+    }
+
+    paused_db.resume.set()
+    assert paused_db.write_queue.flush(timeout=10)
+    assert len(paused_db.written) <= 2
+
+    assert paused_db.get_nick_value('NewNick', 'key') == 'value'
+    assert paused_db._fetch_values(
+        NickValues, 'nick_id', paused_db.get_nick_id('Exirel'), ['a', 'b'],
+    ) == {'a': '1'}
+    assert paused_db.get_nick_value('dgw', 'a') == 3
+    # deleting a value doesn't create the nick
+    with pytest.raises(ValueError):
+        paused_db.get_nick_id('Unknown')
+
+
+def test_write_queue_nick_alias(async_db: SopelDB):
+    async_db.set_nick_value('Exirel', 'key', 'old')
+    async_db.alias_nick('Exirel', 'Exi')
+    async_db.set_nick_value('Exi', 'key', 'new')
+    assert async_db.write_queue.flush(timeout=10)
+
+    assert async_db.get_nick_value('Exirel', 'key') == 'new'
+    with async_db.session() as session:
+        assert session.scalar(
+            select(func.count()).select_from(NickValues)) == 1
+
+
+def test_write_queue_batches(paused_db: SopelDB):
+    # the first value is taken by the writer, which waits
+    paused_db.set_plugin_value('plugin', 'first', 0)
+    for index in range(10):
+        paused_db.set_plugin_value('plugin', 'key', index)
+        paused_db.set_plugin_value('plugin', 'key%d' % index, index)
+
+    paused_db.resume.set()
+    assert paused_db.write_queue.flush(timeout=10)
+
+    # the latest value of each key was written, in at most two batches
+    assert len(paused_db.written) <= 2
+    assert sum(len(batch) for batch in paused_db.written) <= 12
+    assert paused_db.get_plugin_value('plugin', 'key') == 9
+    assert paused_db.get_plugin_values(
+        'plugin', ['key%d' % index for index in range(10)]
+    ) == {'key%d' % index: index for index in range(10)}
+
+
+def test_write_queue_value_put_while_writing(paused_db: SopelDB):
+    paused_db.set_plugin_value('plugin', 'key', 'old')
+    # wait for the writer to take the value
+    for _ in range(100):
+        if paused_db.write_queue._writing:
+            break
+        time.sleep(0.01)
+    paused_db.set_plugin_value('plugin', 'key', 'new')
+
+    paused_db.resume.set()
+    assert paused_db.write_queue.flush(timeout=10)
+
+    assert paused_db.get_plugin_value('plugin', 'key') == 'new'
+    assert paused_db._fetch_plugin_value('plugin', 'key') == '"new"'
+
+
+def test_write_queue_error(async_db: SopelDB, monkeypatch, caplog):
+    def fail(batch):
+        raise RuntimeError('database is gone')
+
+    monkeypatch.setattr(async_db, '_write_batch', fail)
+    async_db.set_plugin_value('plugin', 'key', 'value')
+
+    assert async_db.write_queue.flush(timeout=10)
+    assert async_db.get_plugin_value('plugin', 'key') is None
+    assert 'Unable to write 1 database values.' in caplog.text
+
+
+def test_write_queue_stop(async_db: SopelDB):
+    async_db.set_plugin_value('plugin', 'key', 'value')
+    async_db.write_queue.stop(timeout=10)
+
+    assert async_db.write_queue._thread is None
+    assert async_db._fetch_plugin_value('plugin', 'key') == '"value"'
+
+    # the writer starts again if needed
+    async_db.set_plugin_value('plugin', 'key', 'new')
+    assert async_db.write_queue.flush(timeout=10)
+    assert async_db._fetch_plugin_value('plugin', 'key') == '"new"'
+
+
+def test_write_queue_forget(paused_db: SopelDB):
+    paused_db.set_plugin_value('plugin', 'key', 'value')
+    paused_db.set_channel_value('#sopel', 'key', 'value')
+    paused_db.resume.set()
+
+    paused_db.forget_plugin('plugin')
+    paused_db.forget_channel('#sopel')
+
+    assert paused_db.get_plugin_value('plugin', 'key') is None
+    assert paused_db.get_channel_value('#sopel', 'key') is None
+
+
+def test_write_queue_channel_migration(async_db: SopelDB):
+    with async_db.session() as session:
+        session.add(ChannelValues(
+            channel='#[sopel]', key='old', value='"value"'))
+        session.commit()
+
+    async_db.set_channel_value('#[Sopel]', 'new', 'value')
+    assert async_db.write_queue.flush(timeout=10)
+
+    assert async_db._fetch_values(
+        ChannelValues, 'channel', '#{sopel}', ['old', 'new']
+    ) == {'old': '"value"', 'new': '"value"'}
+
+
 # Test execute
 
 def test_execute(db: SopelDB):
@@ -441,6 +857,7 @@ def test_get_channel_slug_with_migration(db: SopelDB):
 def test_set_channel_value(db: SopelDB):
     # set new value
     db.set_channel_value('#channel', 'testkey', 'channel-value')
+    flush_writes(db)
 
     with db.session() as session:
         result = session.query(ChannelValues.value) \
@@ -451,6 +868,7 @@ def test_set_channel_value(db: SopelDB):
 
     # update pre-existing value
     db.set_channel_value('#channel', 'testkey', 'new_channel-value')
+    flush_writes(db)
 
     with db.session() as session:
         result = session.query(ChannelValues.value) \
@@ -504,6 +922,8 @@ def test_forget_channel(db: SopelDB):
 def test_set_plugin_value(db: SopelDB):
     # set new value
     db.set_plugin_value('plugname', 'qwer', 'zxcv')
+    flush_writes(db)
+
     with db.session() as session:
         result = session.query(PluginValues.value) \
                         .filter(PluginValues.plugin == 'plugname') \
@@ -513,6 +933,7 @@ def test_set_plugin_value(db: SopelDB):
 
     # update pre-existing value
     db.set_plugin_value('plugname', 'qwer', 'new_zxcv')
+    flush_writes(db)
 
     with db.session() as session:
         result = session.query(PluginValues.value) \
@@ -573,6 +994,181 @@ def test_forget_plugin_none(db: SopelDB):
     assert db.get_plugin_value('plugin', 'asdf') is None
 
 
+# Test upsert
+
+def count_statements(db: SopelDB, func, *args):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        func(*args)
+        flush_writes(db)
+    finally:
+        event.remove(
+            db.engine, 'before_cursor_execute', before_cursor_execute)
+    return statements
+
+
+def test_native_upsert_sqlite(db: SopelDB):
+    assert db.native_upsert
+
+
+@pytest.mark.parametrize('native_upsert', [True, False])
+def test_set_values_upsert(db: SopelDB, native_upsert):
+    db.native_upsert = native_upsert
+
+    for value in ['first', 'second']:
+        db.set_nick_value('Exirel', 'key', value)
+        db.set_channel_value('#sopel', 'key', value)
+        db.set_plugin_value('plugin', 'key', value)
+        db.set_plugin_values('plugin', {'key': value, 'other': value})
+
+    assert db.get_nick_value('Exirel', 'key') == 'second'
+    assert db.get_channel_value('#sopel', 'key') == 'second'
+    assert db.get_plugin_values('plugin', ['key', 'other']) == {
+        'key': 'second',
+        'other': 'second',
+    }
+
+    flush_writes(db)
+    with db.session() as session:
+        for model in [NickValues, ChannelValues, PluginValues]:
+            count = session.scalar(select(func.count()).select_from(model))
+            assert count == (2 if model is PluginValues else 1)
+
+
+def test_set_plugin_value_statements(db: SopelDB):
+    """Compare the statements of the native and the portable upserts."""
+    db.set_plugin_value('plugin', 'key', 'value')
+
+    statements = count_statements(
+        db, db.set_plugin_value, 'plugin', 'key', 'native')
+    assert len(statements) == 1
+    assert statements[0].startswith('INSERT')
+    assert 'ON CONFLICT' in statements[0]
+
+    db.native_upsert = False
+    statements = count_statements(
+        db, db.set_plugin_value, 'plugin', 'key', 'portable')
+    assert [statement.split()[0] for statement in statements] == [
+        'SELECT', 'UPDATE',
+    ]
+    assert db.get_plugin_value('plugin', 'key') == 'portable'
+
+
+# Test bulk values
+
+def test_set_get_nick_values(db: SopelDB):
+    db.set_nick_value('Exirel', 'existing', 'old')
+    db.set_nick_values('Exirel', {
+        'existing': 'new',
+        'number': 42,
+        'list': ['a', 'b'],
+    })
+
+    assert db.get_nick_value('EXIREL', 'existing') == 'new'
+    assert db.get_nick_values('EXIREL', ['existing', 'number', 'list', 'nope']) == {
+        'existing': 'new',
+        'number': 42,
+        'list': ['a', 'b'],
+        'nope': None,
+    }
+    assert db.get_nick_values('unknown', ['existing']) == {'existing': None}
+
+    flush_writes(db)
+    with db.session() as session:
+        count = session.scalar(
+            select(func.count()).select_from(NickValues)
+            .where(NickValues.key == 'existing')
+        )
+    assert count == 1
+
+
+def test_get_nick_values_alias(db: SopelDB):
+    db.set_nick_values('Exirel', {'a': 1, 'b': 2})
+    db.alias_nick('Exirel', 'Exi')
+
+    assert db.get_nick_values('Exi', ['a', 'b']) == {'a': 1, 'b': 2}
+
+
+def test_set_many_nick_values(db: SopelDB):
+    db.set_nick_value('Exirel', 'existing', 'old')
+    db.alias_nick('Exirel', 'Exi')
+    # looking up an unknown nick must not hide it once it is created
+    assert db.get_nick_value('NewNick', 'key') is None
+
+    commits = []
+    event.listen(db.engine, 'commit', lambda conn: commits.append(conn))
+    db.set_many_nick_values({
+        'Exirel': {'existing': 'new', 'other': 1},
+        'Exi': {'other': 2},
+        'NewNick': {'key': 'value'},
+        'Empty': {},
+    })
+    flush_writes(db)
+
+    assert db.get_nick_values('EXIREL', ['existing', 'other']) == {
+        'existing': 'new',
+        'other': 2,
+    }
+    assert db.get_nick_value('newnick', 'key') == 'value'
+    if db.write_queue is None:
+        # nick IDs and values are written in a single transaction
+        assert len(commits) == 1
+    with pytest.raises(ValueError):
+        db.get_nick_id('Empty')
+
+
+def test_set_many_nick_values_migration(db: SopelDB):
+    nick = 'Embolalia{}'
+    old_slug = Identifier._lower_swapped(nick)
+    with db.session() as session:
+        session.add(NickIDs(nick_id=42))
+        session.add(Nicknames(nick_id=42, slug=old_slug, canonical=nick))
+        session.commit()
+
+    db.set_many_nick_values({nick: {'key': 'value'}})
+    flush_writes(db)
+
+    assert db.get_nick_id(nick) == 42
+    assert db.get_nick_value(nick, 'key') == 'value'
+
+
+def test_set_get_channel_values(db: SopelDB):
+    db.set_channel_value('#sopel', 'existing', 'old')
+    db.set_channel_values('#Sopel', {'existing': 'new', 'other': True})
+
+    assert db.get_channel_value('#sopel', 'existing') == 'new'
+    assert db.get_channel_values('#SOPEL', ['existing', 'other', 'nope']) == {
+        'existing': 'new',
+        'other': True,
+        'nope': None,
+    }
+
+
+def test_set_get_plugin_values(db: SopelDB):
+    db.set_plugin_value('plugin', 'existing', 'old')
+    db.set_plugin_values('Plugin', {'existing': 'new', 'other': {'a': 1}})
+
+    assert db.get_plugin_value('plugin', 'existing') == 'new'
+    assert db.get_plugin_values('PLUGIN', ['existing', 'other', 'nope']) == {
+        'existing': 'new',
+        'other': {'a': 1},
+        'nope': None,
+    }
+
+
+def test_set_values_empty(db: SopelDB):
+    db.set_nick_values('Exirel', {})
+    db.set_channel_values('#sopel', {})
+    db.set_plugin_values('plugin', {})
+
+    assert db.get_plugin_values('plugin', []) == {}
+
+
 # Test nick & channel
 
 def test_get_nick_or_channel_value(db: SopelDB):
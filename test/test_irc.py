@@ -3,8 +3,9 @@ from __future__ import annotations
 
 import pytest
 
+from sopel.irc import flood
 from sopel.tests import rawlist
-from sopel.tools import Identifier
+from sopel.tools import Identifier, identifiers
 from sopel.tools.target import User
 
 
@@ -45,6 +46,27 @@ def test_safe_text_length(bot):
     assert bot.safe_text_length('#channel') == 470
 
 
+def test_make_identifier(bot):
+    nick = bot.make_identifier('Exirel')
+    assert nick == 'exirel'
+    assert nick.casemapping is identifiers.rfc1459_lower
+
+    # identifiers in use are shared
+    assert bot.make_identifier('Exirel') is nick
+    assert bot.make_identifier(nick) is nick
+
+
+def test_make_identifier_isupport(bot):
+    nick = bot.make_identifier('Exi[rel]')
+    bot._isupport = bot._isupport.apply(casemapping='ascii', chantypes=('#',))
+
+    ascii_nick = bot.make_identifier('Exi[rel]')
+    assert ascii_nick is not nick
+    assert ascii_nick.casemapping is identifiers.ascii_lower
+    assert ascii_nick.lower() == 'exi[rel]'
+    assert bot.make_identifier('&channel').is_nick()
+
+
 def test_on_connect(bot):
     bot.on_connect()
 
@@ -412,3 +434,167 @@ def test_say_no_repeat_protection(bot):
         'PRIVMSG #sopel :...',
         'PRIVMSG #sopel :...',
     )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def flood_bot(bot, monkeypatch):
+    bot.settings.core.flood_burst_lines = 1
+    bot.settings.core.flood_refill_rate = 1
+    bot.settings.core.flood_empty_wait = 0.7
+    bot.settings.core.flood_penalty_ratio = 0
+
+    clock = FakeClock()
+    monkeypatch.setattr(flood, 'time', clock)
+
+    calls = []
+
+    def call_later(delay, callback, *args):
+        calls.append((clock.now + delay, callback, args))
+
+    monkeypatch.setattr(bot.backend, 'call_later', call_later)
+    bot.clock = clock
+    bot.deferred_calls = calls
+    return bot
+
+
+def run_deferred(bot):
+    while bot.deferred_calls:
+        deadline, callback, args = bot.deferred_calls.pop(0)
+        bot.clock.now = max(bot.clock.now, deadline)
+        callback(*args)
+
+
+def test_say_flood_queue(flood_bot):
+    flood_bot.say('first', '#sopel')
+    flood_bot.say('second', '#sopel')
+
+    # the second message waits, without blocking
+    assert flood_bot.backend.message_sent == rawlist('PRIVMSG #sopel :first')
+    assert flood_bot.flood_scheduler.get_queue_lengths() == {
+        Identifier('#sopel'): 1,
+    }
+    assert flood_bot.flood_scheduler.get_deadlines() == {
+        Identifier('#sopel'): pytest.approx(1000.7),
+    }
+    assert len(flood_bot.deferred_calls) == 1
+
+    # other recipients are not delayed
+    flood_bot.say('hello', '#other')
+    assert flood_bot.backend.message_sent == rawlist(
+        'PRIVMSG #sopel :first',
+        'PRIVMSG #other :hello',
+    )
+
+    run_deferred(flood_bot)
+
+    assert flood_bot.backend.message_sent == rawlist(
+        'PRIVMSG #sopel :first',
+        'PRIVMSG #other :hello',
+        'PRIVMSG #sopel :second',
+    )
+    assert flood_bot.flood_scheduler.get_queue_lengths() == {}
+    assert flood_bot.flood_scheduler.get_deadlines() == {}
+
+
+def test_say_flood_queue_order(flood_bot):
+    flood_bot.say('first', '#sopel')
+    flood_bot.say('second', '#sopel')
+    flood_bot.say('third', '#sopel')
+
+    # only one deadline for the recipient
+    assert len(flood_bot.deferred_calls) == 1
+    assert flood_bot.flood_scheduler.get_queue_lengths() == {
+        Identifier('#sopel'): 2,
+    }
+
+    run_deferred(flood_bot)
+
+    assert flood_bot.backend.message_sent == rawlist(
+        'PRIVMSG #sopel :first',
+        'PRIVMSG #sopel :second',
+        'PRIVMSG #sopel :third',
+    )
+
+
+def test_say_flood_queue_priority(flood_bot):
+    flood_bot.say('first', '#sopel')
+    flood_bot.say('announce 1', '#sopel', priority=flood.PRIORITY_LOW)
+    flood_bot.say('announce 2', '#sopel', priority=flood.PRIORITY_LOW)
+    flood_bot.say('normal', '#sopel')
+    flood_bot.say('reply', '#sopel', priority=flood.PRIORITY_HIGH)
+
+    run_deferred(flood_bot)
+
+    assert flood_bot.backend.message_sent == rawlist(
+        'PRIVMSG #sopel :first',
+        'PRIVMSG #sopel :reply',
+        'PRIVMSG #sopel :normal',
+        'PRIVMSG #sopel :announce 1',
+        'PRIVMSG #sopel :announce 2',
+    )
+
+
+def test_notice_reply_flood_queue_priority(flood_bot):
+    flood_bot.say('first', '#sopel')
+    flood_bot.say('announce', '#sopel', priority=flood.PRIORITY_LOW)
+    flood_bot.notice('notice', '#sopel')
+    flood_bot.say('normal', '#sopel')
+    flood_bot.reply('thanks', '#sopel', 'dgw', notice=True)
+    flood_bot.reply('you too', '#sopel', 'dgw')
+
+    # notices wait for the flood protection too
+    assert flood_bot.backend.message_sent == rawlist('PRIVMSG #sopel :first')
+
+    run_deferred(flood_bot)
+
+    # replies jump ahead, and notices keep their place
+    assert flood_bot.backend.message_sent == rawlist(
+        'PRIVMSG #sopel :first',
+        'NOTICE #sopel :dgw: thanks',
+        'PRIVMSG #sopel :dgw: you too',
+        'NOTICE #sopel :notice',
+        'PRIVMSG #sopel :normal',
+        'PRIVMSG #sopel :announce',
+    )
+
+
+def test_say_flood_refill(flood_bot):
+    flood_bot.settings.core.flood_burst_lines = 2
+    flood_bot.say('first', '#sopel')
+    flood_bot.say('second', '#sopel')
+    assert len(flood_bot.backend.message_sent) == 2
+
+    # enough time to refill the bucket
+    flood_bot.clock.now += 10
+    flood_bot.say('third', '#sopel')
+    flood_bot.say('fourth', '#sopel')
+
+    assert not flood_bot.deferred_calls
+    assert flood_bot.backend.message_sent == rawlist(
+        'PRIVMSG #sopel :first',
+        'PRIVMSG #sopel :second',
+        'PRIVMSG #sopel :third',
+        'PRIVMSG #sopel :fourth',
+    )
+
+
+def test_say_flood_blocking_backend(bot):
+    # without an event loop, the backend waits before sending
+    bot.settings.core.flood_burst_lines = 1
+    bot.settings.core.flood_empty_wait = 0.01
+    bot.say('first', '#sopel')
+    bot.say('second', '#sopel')
+
+    assert bot.backend.message_sent == rawlist(
+        'PRIVMSG #sopel :first',
+        'PRIVMSG #sopel :second',
+    )
+    assert bot.flood_scheduler.get_queue_lengths() == {}
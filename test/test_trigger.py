@@ -195,6 +195,43 @@ def test_ctcp_action_pretrigger(nick):
     assert pretrigger.sender == '#Sopel'
 
 
+def test_ctcp_action_pretrigger_lazy(nick):
+    line = (
+        ':Foo!foo@example.com PRIVMSG #Sopel '
+        ':\x01ACTION reads https://example.com\x01'
+    )
+    # CTCP is parsed before URLs and plain text, even if accessed last
+    pretrigger = PreTrigger(nick, line)
+    assert pretrigger.urls == ('https://example.com',)
+    assert pretrigger.plain == 'reads https://example.com'
+    assert pretrigger.args == ['#Sopel', 'reads https://example.com']
+    assert pretrigger.ctcp == 'ACTION'
+
+    pretrigger = PreTrigger(nick, line)
+    assert pretrigger.args == ['#Sopel', 'reads https://example.com']
+    assert pretrigger.ctcp == 'ACTION'
+    assert pretrigger.args == ['#Sopel', 'reads https://example.com']
+
+
+def test_pretrigger_client_time(nick):
+    before = datetime.datetime.now(datetime.timezone.utc)
+    pretrigger = PreTrigger(nick, ':Foo!foo@example.com QUIT :*.net *.split')
+    after = datetime.datetime.now(datetime.timezone.utc)
+
+    # allow for rounding errors of float timestamps
+    margin = datetime.timedelta(milliseconds=1)
+    assert before - margin <= pretrigger.time <= after + margin
+    assert pretrigger.time.tzinfo == datetime.timezone.utc
+    assert pretrigger.time is pretrigger.time, 'Time must be cached'
+
+
+def test_pretrigger_slots(nick):
+    pretrigger = PreTrigger(nick, 'PING :irc.example.com')
+
+    with pytest.raises(AttributeError):
+        pretrigger.unknown = 'value'
+
+
 def test_ctcp_action_trigger(nick, configfactory):
     line = ':Foo!bar@example.com PRIVMSG #Sopel :\x01ACTION Hello, world\x01'
     pretrigger = PreTrigger(nick, line)
@@ -191,3 +191,62 @@ def test_identifier_is_nick_channel(name, chantypes):
 def test_identifier_is_nick_empty():
     assert not identifiers.Identifier('').is_nick()
     assert not identifiers.Identifier('', chantypes=('',)).is_nick()
+
+
+def test_identifier_shared_defaults():
+    identifier = identifiers.Identifier('exirel')
+    assert identifier.casemapping is identifiers.rfc1459_lower
+    assert identifier.chantypes == identifiers.DEFAULT_CHANTYPES
+    # nothing stored for a lowercase name with the default context
+    assert vars(identifier) == {}
+    assert identifier.lower() == 'exirel'
+    assert type(identifier.lower()) is str
+
+
+def test_identifier_compare_other_casemapping():
+    rfc1459 = identifiers.Identifier('Exi[rel]')
+    ascii = identifiers.Identifier(
+        'exi{rel}', casemapping=identifiers.ascii_lower)
+
+    # each identifier uses its own casemapping for the other one
+    assert rfc1459 == ascii
+    assert ascii != rfc1459
+
+
+def test_identifier_interned():
+    identifier = identifiers.Identifier.interned('Exirel')
+    assert isinstance(identifier, identifiers.Identifier)
+    assert identifiers.Identifier.interned('Exirel') is identifier
+    assert identifiers.Identifier.interned(identifier) is identifier
+
+    # the exact name matters
+    other = identifiers.Identifier.interned('exirel')
+    assert other == identifier
+    assert other is not identifier
+    assert str(other) == 'exirel'
+
+    # the context matters
+    ascii = identifiers.Identifier.interned(
+        'Exirel', casemapping=identifiers.ascii_lower)
+    assert ascii is not identifier
+    assert ascii.casemapping is identifiers.ascii_lower
+
+    chantypes = identifiers.Identifier.interned('&Exirel', chantypes=('#',))
+    assert chantypes.is_nick()
+    assert not identifiers.Identifier.interned('&Exirel').is_nick()
+
+
+def test_identifier_interned_weak():
+    identifier = identifiers.Identifier.interned('Unique-Nick-7')
+    ident = id(identifier)
+    key = (
+        identifiers.Identifier,
+        'Unique-Nick-7',
+        identifiers.rfc1459_lower,
+        identifiers.DEFAULT_CHANTYPES,
+    )
+    assert key in identifiers._INTERNED
+
+    del identifier
+    assert key not in identifiers._INTERNED, (
+        'Unused identifiers must not be kept (id: %d)' % ident)
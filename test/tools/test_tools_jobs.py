@@ -1,6 +1,7 @@
 """Tests for Job Scheduler"""
 from __future__ import annotations
 
+import threading
 import time
 
 import pytest
@@ -256,3 +257,165 @@ def test_job_with_exception():
     # even though an exception was raised!
     assert not job.is_running.is_set()
     assert job.next_times[5] == last_time + 5
+
+
+def test_job_invalid_interval():
+    with pytest.raises(ValueError):
+        jobs.Job([0])
+
+
+def test_job_invalid_misfire():
+    with pytest.raises(ValueError):
+        jobs.Job([5], misfire='never')
+
+
+def test_job_get_next_time():
+    job = jobs.Job([5, 30])
+    job.next_times[5] = 100
+    job.next_times[30] = 50
+
+    assert job.get_next_time() == 50
+
+
+def test_job_next_misfire_skip():
+    timestamp = 523549800
+    job = jobs.Job([5], misfire=jobs.MISFIRE_SKIP)
+    job.next_times[5] = timestamp
+
+    # 3 runs were missed: wait for the next scheduled time
+    job.next(timestamp + 17)
+    assert job.next_times == {5: timestamp + 20}
+
+    # on schedule
+    job.next(timestamp + 20.5)
+    assert job.next_times == {5: timestamp + 25}
+
+
+def test_job_next_misfire_catch_up():
+    timestamp = 523549800
+    job = jobs.Job([5], misfire=jobs.MISFIRE_CATCH_UP)
+    job.next_times[5] = timestamp
+
+    # 3 runs were missed: run them one after the other
+    job.next(timestamp + 17)
+    assert job.next_times == {5: timestamp + 5}
+    job.next(timestamp + 17)
+    assert job.next_times == {5: timestamp + 10}
+    job.next(timestamp + 17)
+    assert job.next_times == {5: timestamp + 15}
+    job.next(timestamp + 17)
+    assert job.next_times == {5: timestamp + 20}
+
+
+def test_job_from_callable_misfire(mockconfig):
+    @plugin.interval(5, misfire='skip')
+    def handler(manager):
+        return 'tested'
+
+    loader.clean_callable(handler, mockconfig)
+    job = jobs.Job.from_callable(mockconfig, handler)
+
+    assert job.misfire == jobs.MISFIRE_SKIP
+
+
+class MockManager:
+    def __init__(self):
+        self.errors = []
+
+    def on_job_error(self, scheduler, job, error):
+        self.errors.append(error)
+
+    def on_scheduler_error(self, scheduler, error):
+        self.errors.append(error)
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = jobs.Scheduler(MockManager())
+    scheduler.start()
+    yield scheduler
+    scheduler.stop()
+    scheduler.join(timeout=5)
+
+
+def test_jobscheduler_sub_second(scheduler):
+    calls = []
+    done = threading.Event()
+
+    def handler(manager):
+        calls.append(time.time())
+        if len(calls) >= 3:
+            done.set()
+
+    job = jobs.Job([0.05], handler=handler, threaded=False)
+    scheduler.register(job)
+
+    assert done.wait(timeout=2), 'Sub-second job must run on time'
+    scheduler.remove_callable_job(handler)
+    assert not scheduler.manager.errors
+
+
+def test_jobscheduler_wakeup_on_register(scheduler):
+    # the scheduler waits for a job far in the future
+    scheduler.register(jobs.Job([3600], handler=lambda manager: None))
+    time.sleep(0.05)
+
+    done = threading.Event()
+    scheduler.register(
+        jobs.Job([0.05], handler=lambda manager: done.set(), threaded=False))
+
+    assert done.wait(timeout=2), 'Scheduler must wake up for a new job'
+
+
+def test_jobscheduler_remove_callable_job(scheduler):
+    calls = []
+
+    def handler(manager):
+        calls.append(manager)
+
+    scheduler.register(jobs.Job([0.05], handler=handler, threaded=False))
+    scheduler.remove_callable_job(handler)
+
+    time.sleep(0.2)
+    assert not calls
+    assert scheduler.get_next_time() is None
+
+
+def test_jobscheduler_threaded_pool():
+    scheduler = jobs.Scheduler(MockManager(), max_workers=2)
+    running = []
+    lock = threading.Lock()
+    release = threading.Event()
+
+    def handler(manager):
+        with lock:
+            running.append(threading.current_thread().name)
+        release.wait(timeout=2)
+
+    for _ in range(5):
+        scheduler.register(jobs.Job([0.01], handler=handler))
+
+    scheduler.start()
+    try:
+        time.sleep(0.2)
+        # only 2 jobs can run at the same time
+        with lock:
+            assert len(running) == 2
+        release.set()
+    finally:
+        scheduler.stop()
+        scheduler.join(timeout=5)
+
+    assert all(name.startswith('Jobs-') for name in running)
+
+
+def test_jobscheduler_get_next_time():
+    scheduler = jobs.Scheduler(MockManager())
+    assert scheduler.get_next_time() is None
+
+    job = jobs.Job([5])
+    scheduler.register(job)
+    assert scheduler.get_next_time() == job.get_next_time()
+
+    scheduler.clear_jobs()
+    assert scheduler.get_next_time() is None
@@ -1,6 +1,10 @@
 """Tests for Sopel Memory data-structures"""
 from __future__ import annotations
 
+import threading
+
+import pytest
+
 from sopel.tools import identifiers, memories
 
 
@@ -58,3 +62,157 @@ def test_sopel_identifier_memory_channel_str():
     assert memory[channel] == test_value
     assert memory['#adminchannel'] == test_value
     assert memory['#AdminChannel'] == test_value
+
+
+def test_sopel_memory_setdefault():
+    memory = memories.SopelMemory()
+
+    result = memory.setdefault('key', [])
+    result.append('value')
+
+    assert memory.setdefault('key', []) is result
+    assert memory['key'] == ['value']
+
+
+def test_sopel_memory_pop():
+    memory = memories.SopelMemory({'key': 'value'})
+
+    assert memory.pop('key') == 'value'
+    assert 'key' not in memory
+    assert memory.pop('key', None) is None
+
+    with pytest.raises(KeyError):
+        memory.pop('key')
+
+
+def test_sopel_memory_update_if():
+    memory = memories.SopelMemory()
+
+    def is_newer(current):
+        return current is None or current < 5
+
+    assert memory.update_if('key', 5, is_newer)
+    assert memory['key'] == 5
+    assert not memory.update_if('key', 3, lambda current: current < 3)
+    assert memory['key'] == 5
+
+
+def test_sopel_memory_delitem():
+    memory = memories.SopelMemory({'key': 'value'})
+    del memory['key']
+    assert 'key' not in memory
+
+
+def test_sopel_memory_snapshot():
+    memory = memories.SopelMemory({'a': 1, 'b': 2})
+    snapshot = memory.snapshot()
+
+    assert type(snapshot) is dict
+    assert snapshot == {'a': 1, 'b': 2}
+
+    # iterate over the snapshot while changing the memory
+    for key in snapshot:
+        del memory[key]
+
+    assert not memory
+    assert snapshot == {'a': 1, 'b': 2}
+
+
+def test_sopel_memory_snapshot_waits_for_writes():
+    memory = memories.SopelMemory({'a': 1})
+    snapshots = []
+    thread = threading.Thread(
+        target=lambda: snapshots.append(memory.snapshot()))
+
+    with memory.lock:
+        thread.start()
+        thread.join(0.1)
+        # the copy can't be made while another thread is writing
+        assert thread.is_alive()
+        assert not snapshots
+        dict.__setitem__(memory, 'b', 2)
+
+    thread.join()
+    assert snapshots == [{'a': 1, 'b': 2}]
+
+
+def test_sopel_memory_snapshot_concurrent_writes():
+    memory = memories.SopelMemory()
+    done = threading.Event()
+    errors = []
+
+    def writer():
+        for index in range(5000):
+            memory[index] = index
+            if index % 2:
+                del memory[index - 1]
+        done.set()
+
+    def reader():
+        try:
+            while not done.is_set():
+                memory.snapshot()
+        except RuntimeError as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(memory.snapshot()) == 2500
+
+
+def test_sopel_memory_setdefault_threads():
+    memory = memories.SopelMemory()
+    barrier = threading.Barrier(8)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(memory.setdefault('key', object()))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 8
+    assert all(result is memory['key'] for result in results)
+
+
+def test_sopel_memory_contains_does_not_lock():
+    memory = memories.SopelMemory({'key': 'value'})
+
+    with memory.lock:
+        # would deadlock if reading acquired the lock
+        assert 'key' in memory
+        assert memory['key'] == 'value'
+
+
+def test_sopel_memory_with_default_operations():
+    memory = memories.SopelMemoryWithDefault(list)
+
+    memory['a'].append(1)
+    assert memory.setdefault('a', []) == [1]
+    assert memory.update_if('b', [2], lambda current: current is None)
+    assert memory.pop('b') == [2]
+    assert memory.snapshot() == {'a': [1]}
+
+
+def test_sopel_identifier_memory_operations():
+    memory = memories.SopelIdentifierMemory()
+
+    memory.setdefault('Exirel', []).append('king')
+    assert memory.setdefault('exirel', []) == ['king']
+    assert memory.update_if('EXIREL', ['queen'], lambda current: True)
+    assert memory['exirel'] == ['queen']
+    assert memory.pop('ExiRel') == ['queen']
+    assert 'exirel' not in memory
+
+    memory['Exirel'] = 'king'
+    del memory['EXIREL']
+    assert 'exirel' not in memory
@@ -1,6 +1,8 @@
 """Tests for targets: Channel & User"""
 from __future__ import annotations
 
+import pytest
+
 from sopel import plugin
 from sopel.tools import Identifier, target
 
@@ -211,3 +213,146 @@ def test_channel_is_priv_level_oper_user():
     assert not channel.is_op(user.nick)
     assert not channel.is_halfop(user.nick)
     assert not channel.is_voiced(user.nick)
+
+
+def test_memberships_shared():
+    memberships = target.Memberships()
+    chan1 = target.Channel(Identifier('#chan1'), memberships=memberships)
+    chan2 = target.Channel(Identifier('#chan2'), memberships=memberships)
+    user = target.User(Identifier('TestUser'), 'example', 'example.com')
+
+    chan1.add_user(user, plugin.OP)
+    chan2.add_user(user)
+
+    assert len(memberships) == 1
+    assert memberships.get_user(user.nick) is user
+    assert sorted(user.channels) == [chan1.name, chan2.name]
+    assert user.channels[chan1.name] is chan1
+    assert len(user.channels) == 2
+    assert chan1.privileges[user.nick] == plugin.OP
+    assert chan2.privileges[user.nick] == 0
+
+    chan1.clear_user(user.nick)
+    assert list(user.channels) == [chan2.name]
+    assert user.nick not in chan1.users
+    assert user.nick not in chan1.privileges
+    assert chan2.users[user.nick] is user
+
+    chan2.clear_user(user.nick)
+    assert not user.channels
+    assert len(memberships) == 0
+
+
+def test_memberships_str_keys():
+    channel = target.Channel(Identifier('#chan'))
+    user = target.User(Identifier('TestUser'), 'example', 'example.com')
+    channel.add_user(user, plugin.VOICE)
+
+    assert 'testuser' in channel.users
+    assert channel.users['TESTUSER'] is user
+    assert channel.privileges['testuser'] == plugin.VOICE
+    assert '#CHAN' in user.channels
+    assert None not in channel.users
+    assert None not in channel.privileges
+
+
+def test_memberships_bits_reused():
+    memberships = target.Memberships()
+    user = target.User(Identifier('TestUser'), 'example', 'example.com')
+    chan1 = target.Channel(Identifier('#chan1'), memberships=memberships)
+    chan1.add_user(user)
+    chan1.clear_user(user.nick)
+
+    # the bit of the empty channel is given to the next one
+    chan2 = target.Channel(Identifier('#chan2'), memberships=memberships)
+    chan2.add_user(user)
+    assert list(user.channels) == [chan2.name]
+    assert user.nick not in chan1.users
+
+
+def test_memberships_other_table():
+    user = target.User(Identifier('TestUser'), 'example', 'example.com')
+    chan1 = target.Channel(Identifier('#chan1'))
+    chan2 = target.Channel(Identifier('#chan2'))
+    chan1.add_user(user)
+
+    with pytest.raises(ValueError):
+        chan2.add_user(user)
+
+    # once out of its channels, the user can go anywhere
+    chan1.clear_user(user.nick)
+    chan2.add_user(user)
+    assert list(user.channels) == [chan2.name]
+
+
+def test_channel_users_view():
+    memberships = target.Memberships()
+    channel = target.Channel(Identifier('#chan'), memberships=memberships)
+    user = target.User(Identifier('TestUser'), 'example', 'example.com')
+    other = target.User(Identifier('Other'), 'example', 'example.com')
+
+    channel.users[user.nick] = user
+    user.channels[channel.name] = channel  # already there: no-op
+    other.channels[channel.name] = channel
+
+    assert len(channel.users) == 2
+    assert sorted(channel.users) == [other.nick, user.nick]
+    assert channel.privileges[user.nick] == 0
+
+    # privileges don't make a user
+    channel.privileges['Ghost'] = plugin.OP
+    assert 'Ghost' not in channel.users
+    assert sorted(channel.users) == [other.nick, user.nick]
+
+    del channel.users[user.nick]
+    assert user.nick not in channel.privileges
+    assert not user.channels
+
+    del channel.privileges[other.nick]
+    assert other.nick not in channel.users
+    assert not other.channels
+
+    with pytest.raises(KeyError):
+        del channel.users[user.nick]
+
+
+def test_user_channels_view_delitem():
+    memberships = target.Memberships()
+    chan1 = target.Channel(Identifier('#chan1'), memberships=memberships)
+    chan2 = target.Channel(Identifier('#chan2'), memberships=memberships)
+    user = target.User(Identifier('TestUser'), 'example', 'example.com')
+    chan1.add_user(user, plugin.OP)
+    chan2.add_user(user, plugin.VOICE)
+
+    del user.channels[chan1.name]
+    assert list(user.channels) == [chan2.name]
+    assert user.nick not in chan1.users
+    # the user's privileges go with the membership
+    assert user.nick not in chan1.privileges
+    assert not chan1.is_op(user.nick)
+    assert chan2.privileges[user.nick] == plugin.VOICE
+
+    with pytest.raises(KeyError):
+        del user.channels[chan1.name]
+
+
+def test_channel_rename_user():
+    memberships = target.Memberships()
+    chan1 = target.Channel(Identifier('#chan1'), memberships=memberships)
+    chan2 = target.Channel(Identifier('#chan2'), memberships=memberships)
+    user = target.User(Identifier('TestUser'), 'example', 'example.com')
+    chan1.add_user(user, plugin.OP)
+    chan2.add_user(user, plugin.VOICE)
+
+    old, new = user.nick, Identifier('NewNick')
+    for channel in list(user.channels.values()):
+        channel.rename_user(old, new)
+
+    assert user.nick == new
+    assert memberships.get_user(new) is user
+    assert chan1.users[new] is user
+    assert chan1.privileges[new] == plugin.OP
+    assert chan2.users[new] is user
+    assert chan2.privileges[new] == plugin.VOICE
+    assert 'TestUser' not in chan1.users
+    assert 'TestUser' not in chan2.privileges
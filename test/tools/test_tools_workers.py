@@ -0,0 +1,205 @@
+"""Tests for the Worker Pool"""
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from sopel.tools import workers
+
+
+def test_pool_invalid_arguments():
+    with pytest.raises(ValueError):
+        workers.WorkerPool(0)
+
+    with pytest.raises(ValueError):
+        workers.WorkerPool(2, policy='unknown')
+
+
+def test_pool_submit():
+    pool = workers.WorkerPool(2, name='TestPool')
+    try:
+        task = pool.submit(sum, [1, 2, 3], name='sum-task')
+        task.join()
+
+        assert isinstance(task, workers.Task)
+        assert task.name == 'sum-task'
+        assert not task.is_alive()
+        assert task.result() == 6
+    finally:
+        pool.shutdown()
+
+
+def test_pool_submit_exception():
+    def fail():
+        raise ValueError('expected')
+
+    pool = workers.WorkerPool(1)
+    try:
+        task = pool.submit(fail)
+        task.join()  # join doesn't raise
+
+        assert not task.is_alive()
+        assert isinstance(task.exception(), ValueError)
+    finally:
+        pool.shutdown()
+
+
+def test_pool_reuse_workers():
+    pool = workers.WorkerPool(1)
+    try:
+        tasks = [pool.submit(threading.get_ident) for _ in range(20)]
+        for task in tasks:
+            task.join()
+
+        assert pool.workers == 1
+        assert len(set(task.result() for task in tasks)) == 1
+    finally:
+        pool.shutdown()
+
+
+def test_pool_max_workers():
+    release = threading.Event()
+    pool = workers.WorkerPool(2)
+    try:
+        tasks = [pool.submit(release.wait, 5) for _ in range(4)]
+
+        assert pool.workers == 2
+        assert all(task.is_alive() for task in tasks)
+
+        release.set()
+        for task in tasks:
+            task.join()
+        assert not any(task.is_alive() for task in tasks)
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_pool_max_per_group():
+    release = threading.Event()
+    started = threading.Event()
+    pool = workers.WorkerPool(3, max_per_group=1)
+    try:
+        slow = pool.submit(release.wait, 5, group='slow')
+        waiting = pool.submit(release.wait, 5, group='slow')
+        other = pool.submit(started.set, group='other')
+
+        # the other group runs while the slow group is capped
+        other.join(timeout=5)
+        assert not other.is_alive()
+        assert started.is_set()
+        assert slow.is_alive()
+        assert not waiting.running()
+        assert pool.queue_size == 1
+
+        release.set()
+        waiting.join(timeout=5)
+        assert not waiting.is_alive()
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_pool_policy_drop():
+    release = threading.Event()
+    started = threading.Event()
+    pool = workers.WorkerPool(1, max_queue=1, policy=workers.POLICY_DROP)
+    try:
+        running = pool.submit(lambda: started.set() or release.wait(5))
+        assert started.wait(5)
+        queued = pool.submit(release.wait, 5)
+        dropped = pool.submit(release.wait, 5)
+
+        assert running is not None
+        assert queued is not None
+        assert dropped is None
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_pool_policy_queue():
+    release = threading.Event()
+    started = threading.Event()
+    pool = workers.WorkerPool(1, max_queue=1, policy=workers.POLICY_QUEUE)
+    try:
+        # make sure the worker took the first task from the queue
+        pool.submit(lambda: started.set() or release.wait(5))
+        assert started.wait(5)
+
+        tasks = [pool.submit(release.wait, 5) for _ in range(3)]
+
+        assert all(task is not None for task in tasks)
+        assert pool.queue_size == 3
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_pool_policy_block():
+    release = threading.Event()
+    started = threading.Event()
+    pool = workers.WorkerPool(1, max_queue=1, policy=workers.POLICY_BLOCK)
+    try:
+        pool.submit(lambda: started.set() or release.wait(5))
+        assert started.wait(5)
+        pool.submit(release.wait, 5)
+
+        submitted = []
+        submitter = threading.Thread(
+            target=lambda: submitted.append(pool.submit(int)))
+        submitter.start()
+        submitter.join(timeout=0.2)
+
+        # blocked while the queue is full
+        assert submitter.is_alive()
+        assert not submitted
+
+        release.set()
+        submitter.join(timeout=5)
+        assert not submitter.is_alive()
+        assert submitted[0] is not None
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_pool_shutdown():
+    release = threading.Event()
+    started = threading.Event()
+    pool = workers.WorkerPool(1)
+
+    running = pool.submit(lambda: started.set() or release.wait(5))
+    assert started.wait(5)
+    pending = pool.submit(int)
+
+    pool.shutdown(wait=False)
+    release.set()
+    running.join(timeout=5)
+
+    assert running.done()
+    assert not running.cancelled()
+    assert pending.cancelled()
+    assert not pending.is_alive()
+
+    with pytest.raises(RuntimeError):
+        pool.submit(int)
+
+
+def test_pool_shutdown_timeout():
+    release = threading.Event()
+    pool = workers.WorkerPool(4)
+    try:
+        for _ in range(4):
+            pool.submit(release.wait, 5)
+
+        start = time.monotonic()
+        pool.shutdown(timeout=0.2)
+        elapsed = time.monotonic() - start
+
+        # the timeout is for all the workers, not for each of them
+        assert elapsed < 0.6
+    finally:
+        release.set()